@@ -22,6 +22,7 @@ from friend_circle_lite.outputs.legacy_api import (
     merge_errors_from_json_url,
     merge_link_data_from_json_url,
 )
+from friend_circle_lite.outputs.shard_merge import merge_shard_outputs
 from friend_circle_lite.storage.diagnostics import SQLiteDebugDumper
 from friend_circle_lite.utils.json import write_json
 
@@ -57,18 +58,27 @@ class FriendCircleLiteApplication:
             return
 
         logging.info("[爬虫入口] 爬虫已启用")
-        logging.info(
-            f"[爬虫入口] 正在从 {spider_settings.json_url} 获取友链原始数据，每站最多 {spider_settings.article_count} 篇文章"
-        )
-
-        crawl_result = fetch_and_process_data(
-            json_url=spider_settings.json_url,
-            specific_RSS=self.config.specific_rss,
-            count=spider_settings.article_count,
-            cache_file=self.config.runtime_paths.cache_file,
-            link_check_config=self.config.link_check,
-            proxy_settings=self.config.proxy_settings,
-        )
+        merge_sources = self.config.shard_settings.merge_sources
+        if merge_sources:
+            logging.info(f"[爬虫入口] 分片合并模式，正在合并 {len(merge_sources)} 个分片的输出")
+            crawl_result = merge_shard_outputs(
+                merge_sources, allow_partial=self.config.shard_settings.allow_partial_merge
+            )
+        else:
+            logging.info(
+                f"[爬虫入口] 正在从 {spider_settings.json_url} 获取友链原始数据，每站最多 {spider_settings.article_count} 篇文章"
+            )
+            crawl_result = fetch_and_process_data(
+                json_url=spider_settings.json_url,
+                specific_RSS=self.config.specific_rss,
+                count=spider_settings.article_count,
+                cache_file=self.config.runtime_paths.cache_file,
+                link_check_config=self.config.link_check,
+                proxy_settings=self.config.proxy_settings,
+                spider_settings=spider_settings,
+                request_settings=self.config.request_settings,
+                shard_settings=self.config.shard_settings,
+            )
         if crawl_result is None:
             logging.error("[爬虫入口] 抓取流程失败，未生成任何输出文件")
             return
@@ -49,11 +49,30 @@ class MergeSettings:
     merge_link_check_data: bool = True
 
 
+@dataclass(slots=True)
+class ShardSettings:
+    """Options for splitting the friend list across several runners."""
+
+    # 当前分片序号（从 0 开始）与分片总数；总数为 1 时不分片。
+    index: int = 0
+    count: int = 1
+    # 非空时进入合并模式：不抓取，只合并这些分片输出目录或地址下的 all.json、link.json、errors.json。
+    merge_sources: list[str] = field(default_factory=list)
+    # 是否允许跳过输出缺失的分片，只合并其余分片；默认任一分片缺失即放弃合并。
+    allow_partial_merge: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+
+
 @dataclass(slots=True)
 class ProxySettings:
     """Proxy configuration for both link checking and RSS crawling."""
 
     proxy_url: str = ""
+    # 大于 0 时启用对冲请求：首选线路超过该秒数没有结果，就同时请求另一条线路。
+    hedge_delay: float = 0.0
 
 
 @dataclass(slots=True)
@@ -63,6 +82,50 @@ class SpiderSettings:
     enable: bool = True
     json_url: str = ""
     article_count: int = 5
+    max_workers: int = 10
+    # 对同一主机的并发上限，超出的任务排队等待且不占用线程；0 表示不限制。
+    per_host_limit: int = 4
+    # 流式解析订阅源，只读取文章元数据并在收集到足够文章后提前停止；格式异常时回退到 feedparser。
+    # 流式结果不含 summary 与 content，邮件推送等功能需要它们，因此默认关闭。
+    stream_parse: bool = False
+    # 解析进程数，0 表示在抓取线程内解析；大于 0 时 RSS 解析在独立进程中执行，不受 GIL 限制。
+    parse_workers: int = 0
+    # 按站点发文频率安排抓取间隔，未到期的站点复用上次抓取的文章；间隔限制在上下限之间（小时）。
+    adaptive_schedule: bool = True
+    min_interval_hours: float = 2.0
+    max_interval_hours: float = 48.0
+    # 每个站点的抓取结果完成后立即写入缓存；在该时间窗口内重跑时直接复用已完成的结果（分钟，0 表示不复用）。
+    resume_window_minutes: int = 60
+    # 单次运行的预算：从运行开始计算的时长（分钟）与最多发起抓取的站点数，0 表示不限制。
+    # 站点按发文活跃度、上次抓取是否成功与延迟排序，预算用尽后未开始的站点推迟到下次运行。
+    run_budget_minutes: float = 0.0
+    max_crawl_requests: int = 0
+
+
+@dataclass(slots=True)
+class RequestSettings:
+    """Per-host request tuning derived from recorded latency history."""
+
+    # 按主机历史延迟的 p95 乘以倍数作为超时，并限制在上下限之间；样本不足时使用默认超时。
+    adaptive_timeout: bool = True
+    timeout_multiplier: float = 3.0
+    min_timeout: float = 3.0
+    max_connect_timeout: float = 10.0
+    max_timeout: float = 15.0
+    latency_samples: int = 20
+    min_samples: int = 3
+    # 共享 Session 的连接池：缓存的主机连接池数量、单主机保留连接数与单主机并发请求上限。
+    pool_connections: int = 100
+    pool_maxsize: int = 16
+    max_connections_per_host: int = 8
+    # 单次响应体的最大下载字节数，超出部分不再读取；0 表示不限制并关闭流式下载。
+    max_response_bytes: int = 5 * 1024 * 1024
+    # 连接被重置、429 与 502~504 等临时错误的重试：单条线路的最大重试次数、指数退避基数与单次等待上限（秒），
+    # 以及整次运行共享的重试次数预算。Retry-After 超过等待上限时不再重试。max_retries 为 0 表示不重试。
+    max_retries: int = 1
+    retry_backoff: float = 0.5
+    max_retry_delay: float = 5.0
+    retry_budget: int = 50
 
 
 @dataclass(slots=True)
@@ -72,11 +135,21 @@ class LinkCheckConfig:
     # 兼容旧配置字段。当前抓取流程依赖可达性检测，因此运行时会始终视为启用。
     enable: bool = True
     max_age_hours: int = 24
+    # 缓存有效期按友链地址与检测时间在 [max_age_hours * (1 - recheck_jitter), max_age_hours] 内错开；
+    # 每次运行最多复检的过期友链数，0 表示不限制，超出的推迟到后续运行。
+    recheck_jitter: float = 0.5
+    max_rechecks_per_run: int = 0
     timeout: int = 15
     max_workers: int = 10
     status_api_url: str = "https://v2.xxapi.cn/api/status?url={url}"
     enable_backlink_check: bool = False
     author_url: str = ""
+    # 主页检测只取响应头：依次尝试 HEAD、Range 请求与完整 GET，并按主机记住可用的方式。
+    homepage_probe: bool = True
+    # 状态 API 的每秒请求数（0 表示不限速）、同时在途请求数与单次超时（秒）。
+    status_api_rate: float = 2.0
+    status_api_concurrency: int = 4
+    status_api_timeout: int = 30
 
 
 @dataclass(slots=True)
@@ -141,6 +214,8 @@ class ApplicationConfig:
     smtp: SmtpConfig
     specific_rss: list[dict]
     runtime_paths: RuntimePaths = field(default_factory=RuntimePaths)
+    request_settings: RequestSettings = field(default_factory=RequestSettings)
+    shard_settings: ShardSettings = field(default_factory=ShardSettings)
     future_article_tolerance_days: int = 2
     debug: bool = False
 
@@ -156,6 +231,18 @@ class ApplicationConfig:
         website_info_raw = rss_subscribe_raw.get("website_info", {})
         smtp_raw = data.get("smtp", {})
         runtime_raw = data.get("runtime_paths", {})
+        request_raw = data.get("request_settings", {}) or {}
+        shard_raw = data.get("shard_settings", {}) or {}
+        shard_count = max(1, int(os.getenv("FCL_SHARD_COUNT") or shard_raw.get("count", 1) or 1))
+        shard_index = int(os.getenv("FCL_SHARD_INDEX") or shard_raw.get("index", 0) or 0)
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_settings.index 必须在 0 到 {shard_count - 1} 之间，当前为 {shard_index}")
+        shard_sources = os.getenv("FCL_SHARD_SOURCES")
+        merge_sources = shard_sources.split(",") if shard_sources else list(shard_raw.get("merge_sources", []) or [])
+        spider_max_workers = int(spider_raw.get("max_workers", 10))
+        if str(spider_raw.get("engine", "")).strip().lower() == "asyncio":
+            # 兼容旧配置：asyncio 引擎已移除，它的并发数原本即线程数，改用同样数量的线程。
+            spider_max_workers = int(spider_raw.get("max_concurrency", 100))
         debug_from_env = _env_flag("FCL_DEBUG")
         debug_enabled = debug_from_env if debug_from_env is not None else _as_bool(data.get("debug"), False)
 
@@ -164,9 +251,20 @@ class ApplicationConfig:
                 enable=bool(spider_raw.get("enable", True)),
                 json_url=str(spider_raw.get("json_url", "")).strip(),
                 article_count=int(spider_raw.get("article_count", 5)),
+                max_workers=spider_max_workers,
+                per_host_limit=max(0, int(spider_raw.get("per_host_limit", 4))),
+                stream_parse=_as_bool(spider_raw.get("stream_parse"), False),
+                parse_workers=max(0, int(spider_raw.get("parse_workers", 0) or 0)),
+                adaptive_schedule=_as_bool(spider_raw.get("adaptive_schedule"), True),
+                min_interval_hours=max(0.0, float(spider_raw.get("min_interval_hours", 2.0))),
+                max_interval_hours=max(0.0, float(spider_raw.get("max_interval_hours", 48.0))),
+                resume_window_minutes=max(0, int(spider_raw.get("resume_window_minutes", 60) or 0)),
+                run_budget_minutes=max(0.0, float(spider_raw.get("run_budget_minutes", 0) or 0)),
+                max_crawl_requests=max(0, int(spider_raw.get("max_crawl_requests", 0) or 0)),
             ),
             proxy_settings=ProxySettings(
                 proxy_url=os.getenv("PROXY_URL") or str(proxy_raw.get("proxy_url", "")).strip(),
+                hedge_delay=max(0.0, float(proxy_raw.get("hedge_delay", 0) or 0)),
             ),
             merge_settings=MergeSettings(
                 enable=bool(merge_raw.get("enable", False)),
@@ -177,11 +275,17 @@ class ApplicationConfig:
             link_check=LinkCheckConfig(
                 enable=True,
                 max_age_hours=int(link_check_raw.get("max_age_hours", 24)),
+                recheck_jitter=min(1.0, max(0.0, float(link_check_raw.get("recheck_jitter", 0.5)))),
+                max_rechecks_per_run=max(0, int(link_check_raw.get("max_rechecks_per_run", 0) or 0)),
                 timeout=int(link_check_raw.get("timeout", 15)),
                 max_workers=int(link_check_raw.get("max_workers", 10)),
                 status_api_url=str(link_check_raw.get("status_api_url", "https://v2.xxapi.cn/api/status?url={url}")).strip(),
                 enable_backlink_check=bool(link_check_raw.get("enable_backlink_check", False)),
                 author_url=str(link_check_raw.get("author_url", "")).strip(),
+                homepage_probe=_as_bool(link_check_raw.get("homepage_probe"), True),
+                status_api_rate=max(0.0, float(link_check_raw.get("status_api_rate", 2.0))),
+                status_api_concurrency=max(1, int(link_check_raw.get("status_api_concurrency", 4))),
+                status_api_timeout=max(1, int(link_check_raw.get("status_api_timeout", 30))),
             ),
             email_push=EmailPushConfig(
                 enable=bool(email_push_raw.get("enable", False)),
@@ -212,6 +316,29 @@ class ApplicationConfig:
                 errors_json_file=str(runtime_raw.get("errors_json_file", DEFAULT_ERRORS_JSON)).strip() or DEFAULT_ERRORS_JSON,
                 link_json_file=str(runtime_raw.get("link_json_file", DEFAULT_LINK_JSON)).strip() or DEFAULT_LINK_JSON,
             ),
+            request_settings=RequestSettings(
+                adaptive_timeout=_as_bool(request_raw.get("adaptive_timeout"), True),
+                timeout_multiplier=float(request_raw.get("timeout_multiplier", 3.0)),
+                min_timeout=float(request_raw.get("min_timeout", 3.0)),
+                max_connect_timeout=float(request_raw.get("max_connect_timeout", 10.0)),
+                max_timeout=float(request_raw.get("max_timeout", 15.0)),
+                latency_samples=max(1, int(request_raw.get("latency_samples", 20))),
+                min_samples=max(1, int(request_raw.get("min_samples", 3))),
+                pool_connections=max(1, int(request_raw.get("pool_connections", 100))),
+                pool_maxsize=max(1, int(request_raw.get("pool_maxsize", 16))),
+                max_connections_per_host=max(1, int(request_raw.get("max_connections_per_host", 8))),
+                max_response_bytes=max(0, int(request_raw.get("max_response_bytes", 5 * 1024 * 1024))),
+                max_retries=max(0, int(request_raw.get("max_retries", 1))),
+                retry_backoff=max(0.0, float(request_raw.get("retry_backoff", 0.5))),
+                max_retry_delay=max(0.0, float(request_raw.get("max_retry_delay", 5.0))),
+                retry_budget=max(0, int(request_raw.get("retry_budget", 50))),
+            ),
+            shard_settings=ShardSettings(
+                index=shard_index,
+                count=shard_count,
+                merge_sources=[str(source).strip().rstrip("/") for source in merge_sources if str(source).strip()],
+                allow_partial_merge=bool(shard_raw.get("allow_partial_merge", False)),
+            ),
             debug=debug_enabled,
         )
 
@@ -23,21 +23,80 @@ def print_startup_config(config) -> None:
     if config.spider_settings.enable:
         logging.info(f"  - 数据源: {config.spider_settings.json_url} ")
         logging.info(f"  - 每站文章数: {config.spider_settings.article_count}")
+        logging.info(f"  - 抓取线程数: {config.spider_settings.max_workers}")
+        logging.info(f"  - 单主机并发: {config.spider_settings.per_host_limit or '不限制'}")
+        logging.info(f"  - 流式解析: {'已启用' if config.spider_settings.stream_parse else '已禁用'}")
+        if config.spider_settings.parse_workers > 0:
+            logging.info(f"  - 解析进程数: {config.spider_settings.parse_workers}")
+        logging.info(f"  - 按发文频率调度: {'已启用' if config.spider_settings.adaptive_schedule else '已禁用'}")
+        if config.spider_settings.adaptive_schedule:
+            logging.info(
+                f"  - 抓取间隔: {config.spider_settings.min_interval_hours}~{config.spider_settings.max_interval_hours} 小时"
+            )
+        if config.spider_settings.resume_window_minutes > 0:
+            logging.info(f"  - 断点续抓: 复用 {config.spider_settings.resume_window_minutes} 分钟内已完成的站点")
+        else:
+            logging.info("  - 断点续抓: 已禁用")
+        budget_parts = []
+        if config.spider_settings.run_budget_minutes > 0:
+            budget_parts.append(f"{config.spider_settings.run_budget_minutes} 分钟")
+        if config.spider_settings.max_crawl_requests > 0:
+            budget_parts.append(f"最多抓取 {config.spider_settings.max_crawl_requests} 个站点")
+        logging.info(f"  - 运行预算: {'，'.join(budget_parts) if budget_parts else '不限制'}")
+
+    logging.info("分片配置:")
+    if config.shard_settings.merge_sources:
+        logging.info(f"  - 合并模式: 合并 {len(config.shard_settings.merge_sources)} 个分片的输出，本次不抓取")
+        logging.info(f"  - 部分合并: {'允许跳过缺失分片' if config.shard_settings.allow_partial_merge else '任一分片缺失即放弃'}")
+    elif config.shard_settings.enabled:
+        logging.info(f"  - 当前分片: {config.shard_settings.index + 1}/{config.shard_settings.count}")
+    else:
+        logging.info("  - 分片状态: 未分片")
 
     logging.info("代理配置:")
     if config.proxy_settings.proxy_url:
         logging.info("  - 代理状态: 已配置（日志不显示具体地址）")
         logging.info("  - 建议: 使用仓库环境变量 PROXY_URL 覆盖，避免代理地址出现在配置文件中")
         logging.info("  - 用途: 友链检测 + RSS 抓取")
+        if config.proxy_settings.hedge_delay > 0:
+            logging.info(f"  - 对冲请求: {config.proxy_settings.hedge_delay} 秒后并发另一条线路")
     else:
         logging.info("  - 代理状态: 未配置")
 
+    logging.info("请求超时配置:")
+    logging.info(f"  - 自适应超时: {'已启用' if config.request_settings.adaptive_timeout else '已禁用'}")
+    if config.request_settings.adaptive_timeout:
+        logging.info(
+            f"  - 超时范围: {config.request_settings.min_timeout}~{config.request_settings.max_timeout} 秒，"
+            f"p95 × {config.request_settings.timeout_multiplier}"
+        )
+    max_response_bytes = config.request_settings.max_response_bytes
+    logging.info(f"  - 响应体上限: {f'{max_response_bytes / 1024 / 1024:.1f} MB' if max_response_bytes else '不限制'}")
+    if config.request_settings.max_retries > 0 and config.request_settings.retry_budget > 0:
+        logging.info(
+            f"  - 临时错误重试: 每条线路最多 {config.request_settings.max_retries} 次，"
+            f"单次等待不超过 {config.request_settings.max_retry_delay} 秒，本次运行共 {config.request_settings.retry_budget} 次"
+        )
+    else:
+        logging.info("  - 临时错误重试: 已禁用")
+
     logging.info("友链检测配置:")
     logging.info("  - 启用状态: 始终启用（友圈抓取依赖此检测结果）")
     logging.info(f"  - 缓存时间: {config.link_check.max_age_hours} 小时")
+    if config.link_check.recheck_jitter > 0:
+        logging.info(f"  - 缓存错开: 按友链地址与检测时间提前至多 {config.link_check.recheck_jitter:.0%} 过期")
+    if config.link_check.max_rechecks_per_run:
+        logging.info(f"  - 单次复检上限: {config.link_check.max_rechecks_per_run} 个")
     logging.info(f"  - 超时时间: {config.link_check.timeout} 秒")
     logging.info(f"  - 并发数: {config.link_check.max_workers}")
     logging.info(f"  - 状态 API: {config.link_check.status_api_url} ")
+    if config.link_check.status_api_url:
+        rate = config.link_check.status_api_rate
+        logging.info(
+            f"  - 状态 API 限速: {f'每秒 {rate} 次' if rate > 0 else '不限速'}，"
+            f"并发 {config.link_check.status_api_concurrency}，超时 {config.link_check.status_api_timeout} 秒"
+        )
+    logging.info(f"  - 主页轻量探测: {'已启用' if config.link_check.homepage_probe else '已禁用'}")
     logging.info(f"  - 反链检测: {'已启用' if config.link_check.enable_backlink_check else '已禁用'}")
     if config.link_check.enable_backlink_check:
         logging.info(f"  - 站点域名: {config.link_check.author_url} ")
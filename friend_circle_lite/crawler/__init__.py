@@ -2,3 +2,4 @@
 
 from friend_circle_lite.crawler.feed_service import FeedDiscoveryService, FeedParserService, LatestArticleTracker
 from friend_circle_lite.crawler.service import FeedResolver, FriendCircleCrawlService, SingleSiteCrawler
+from friend_circle_lite.crawler.engine import ThreadCrawlEngine
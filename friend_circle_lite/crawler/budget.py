@@ -0,0 +1,67 @@
+"""单次运行的抓取预算与站点优先级。
+
+定时任务通常有运行时长上限，站点数量较多或个别站点响应缓慢时，全部抓取可能超出上限而被强制终止。
+`RunBudget` 记录从运行开始计算的时长预算与可发起抓取的站点数，`crawl_priority` 决定站点的抓取顺序：
+
+- 最近 `FRESH_POST_DAYS` 天内有发文的站点优先；
+- 其次是上次抓取成功的站点；
+- 同类站点中延迟低、最近发文时间近的优先。
+
+预算用尽后尚未开始的站点不再发起请求，由调用方推迟到下次运行。
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+from friend_circle_lite.domain.models import LinkCheckRecord
+
+
+FRESH_POST_DAYS = 30
+
+
+class RunBudget:
+    """线程安全的运行时长与抓取次数预算；取值为 0 表示不限制。"""
+
+    def __init__(self, seconds: float = 0, max_requests: int = 0):
+        self.deadline = time.monotonic() + seconds if seconds > 0 else None
+        self.max_requests = max(0, max_requests)
+        self.used_requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.deadline is not None or self.max_requests > 0
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def exhausted(self) -> bool:
+        return self.expired() or (self.max_requests > 0 and self.used_requests >= self.max_requests)
+
+    def remaining(self) -> float | None:
+        """距离截止时间的秒数；没有时长预算或已经到期时返回 None。"""
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def try_acquire(self) -> bool:
+        """预算允许时登记一次抓取并返回 True，否则返回 False。"""
+        with self._lock:
+            if self.exhausted():
+                return False
+            self.used_requests += 1
+            return True
+
+
+def crawl_priority(record: LinkCheckRecord | None) -> tuple:
+    """返回站点的抓取优先级，值越小越先抓取。"""
+    if record is None:
+        return (True, True, math.inf, math.inf)
+    days = record.last_post_days_ago if record.last_post_days_ago is not None else math.inf
+    succeeded = bool(record.last_post_published) and not record.rss_unavailable_since
+    latency = record.best_latency if record.best_latency >= 0 else math.inf
+    return (days > FRESH_POST_DAYS, not succeeded, latency, days)
@@ -0,0 +1,88 @@
+"""站点任务并发调度引擎。
+
+抓取与友链检测中，每个站点任务都是一组阻塞的 requests 调用，因此由固定大小的线程池执行。
+设置了按主机并发上限时，超出上限的任务在引擎内排队，同一主机的任务完成后再提交到线程池，
+排队期间不占用线程；同时在途的请求数由线程数决定。
+
+`submit` 返回 `concurrent.futures.Future`，调用方可以统一使用 `as_completed` 收集结果。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import urlsplit
+
+
+def host_key(url: str) -> str:
+    """返回用于按主机限流的键。"""
+    return urlsplit(url or "").netloc.lower()
+
+
+class ThreadCrawlEngine:
+    """固定大小线程池引擎，`per_host_limit` 大于 0 时按主机限流。"""
+
+    def __init__(self, max_workers: int = 10, per_host_limit: int = 0):
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(0, per_host_limit)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._host_condition = threading.Condition()
+        self._host_running: dict[str, int] = {}
+        self._host_waiting: dict[str, deque[tuple[Future, Callable, tuple]]] = {}
+
+    @property
+    def capacity(self) -> int:
+        """同时执行的任务数上限。"""
+        return self.max_workers
+
+    def submit(self, func: Callable, *args, host: str = "") -> Future:
+        if not self.per_host_limit or not host:
+            return self._executor.submit(func, *args)
+        future: Future = Future()
+        with self._host_condition:
+            if self._host_running.get(host, 0) >= self.per_host_limit:
+                self._host_waiting.setdefault(host, deque()).append((future, func, args))
+                return future
+            self._host_running[host] = self._host_running.get(host, 0) + 1
+        self._executor.submit(self._run_host_task, host, future, func, args)
+        return future
+
+    def _run_host_task(self, host: str, future: Future, func: Callable, args: tuple) -> None:
+        try:
+            # 排队期间被取消的任务直接跳过。
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+        finally:
+            self._start_next_host_task(host)
+
+    def _start_next_host_task(self, host: str) -> None:
+        """同一主机的任务结束后，把该主机排队中的下一个任务提交到线程池。"""
+        with self._host_condition:
+            waiting = self._host_waiting.get(host)
+            if not waiting:
+                self._host_waiting.pop(host, None)
+                self._host_running[host] -= 1
+                if not self._host_running[host]:
+                    del self._host_running[host]
+                return
+            self._executor.submit(self._run_host_task, host, *waiting.popleft())
+            if not waiting:
+                del self._host_waiting[host]
+                self._host_condition.notify_all()
+
+    def close(self) -> None:
+        # 排队中的任务由线程池中的任务提交，线程池关闭前需要等它们全部进入线程池。
+        with self._host_condition:
+            self._host_condition.wait_for(lambda: not self._host_waiting)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ThreadCrawlEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -2,25 +2,83 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
 from datetime import datetime
+from html.parser import HTMLParser
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Callable, TypeVar
+from urllib.parse import urljoin, urlparse
 
 import feedparser
 import requests
 
-from friend_circle_lite import HEADERS_XML, timeout
+from friend_circle_lite import HEADERS_JSON, HEADERS_XML, timeout
 from friend_circle_lite.config.models import ProxySettings
-from friend_circle_lite.crawler.http_client import WebFetchClient
-from friend_circle_lite.domain.models import Article, FeedEndpoint, Website, normalize_latency
-from friend_circle_lite.utils.time import format_published_time
-from friend_circle_lite.utils.url import replace_non_domain
+from friend_circle_lite.crawler.feed_stream import parse_feed_stream, select_newest_articles
+from friend_circle_lite.crawler.http_client import AdaptiveTimeoutPolicy, RetryPolicy, RouteMemory, WebFetchClient
+from friend_circle_lite.crawler.instrumentation import STAGE_DISCOVER, STAGE_PARSE, RunInstrumentation
+from friend_circle_lite.domain.models import (
+    Article,
+    FeedDiscoveryResult,
+    FeedEndpoint,
+    FeedParseResult,
+    FeedState,
+    RequestTiming,
+    Website,
+    normalize_latency,
+)
+from friend_circle_lite.storage.sqlite_store import FeedProbeStore, FeedStateStore
+from friend_circle_lite.utils.time import format_published_time, format_struct_time, has_ambiguous_zone
+from friend_circle_lite.utils.url import normalize_feed_url, replace_non_domain
+
+
+T = TypeVar("T")
+
+
+class _AlternateFeedLinkParser(HTMLParser):
+    """Collect `<link rel="alternate">` feed declarations from a page head."""
+
+    FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/rdf+xml")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+        self.finished = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "body":
+            self.finished = True
+            return
+        if tag != "link":
+            return
+        values = {key.lower(): (value or "").strip() for key, value in attrs}
+        rel = values.get("rel", "").lower().split()
+        if "alternate" in rel and values.get("type", "").lower() in self.FEED_TYPES and values.get("href"):
+            self.hrefs.append(values["href"])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self.finished = True
 
 
 class FeedDiscoveryService:
-    """Discover an RSS or Atom endpoint for a website."""
+    """Discover an RSS or Atom endpoint for a website.
+
+    Discovery first reads the homepage for `<link rel="alternate">` feed
+    declarations, then probes the common paths below concurrently and keeps
+    the highest-priority valid match, so the chosen feed does not depend on
+    which path answers first. Probes of all sites share one bounded thread
+    pool. Paths that answered 404/410 are remembered per site so they are not
+    probed again until the miss expires.
+    """
 
     POSSIBLE_FEEDS = [
         ("rss1", "/feed"),        # WordPress / 最常见
@@ -35,129 +93,477 @@ class FeedDiscoveryService:
         ("rss10", "/rss.php"),    # 老 PHP 程序
         ("rss11", "/feed.php"),   # 同上
     ]
+    MISS_STATUS_CODES = (404, 410)
+    HOMEPAGE_SCAN_CHARS = 64 * 1024
+    # 判断是否为订阅源只需要响应开头部分，启用下载上限时探测请求只读取这么多字节。
+    FEED_SNIFF_BYTES = 4 * 1024
 
-    def __init__(self, session: requests.Session, proxy_settings: ProxySettings | None = None):
+    def __init__(
+        self,
+        session: requests.Session,
+        proxy_settings: ProxySettings | None = None,
+        probe_store: FeedProbeStore | None = None,
+        max_probe_workers: int = 4,
+        timeout_policy: AdaptiveTimeoutPolicy | None = None,
+        route_memory: RouteMemory | None = None,
+        instrumentation: RunInstrumentation | None = None,
+        max_response_bytes: int = 0,
+        retry_policy: RetryPolicy | None = None,
+        hedge_executor: ThreadPoolExecutor | None = None,
+    ):
         self.session = session
-        self.fetcher = WebFetchClient(session, proxy_settings)
+        self.fetcher = WebFetchClient(
+            session, proxy_settings, timeout_policy, route_memory, max_response_bytes, retry_policy, hedge_executor
+        )
+        self.probe_store = probe_store
+        # 所有站点的路径探测共用的线程数上限；线程池首次探测时创建，由 close 关闭。
+        self.max_probe_workers = max(1, max_probe_workers)
+        self._probe_lock = threading.Lock()
+        self._probe_pool: ThreadPoolExecutor | None = None
+        self.instrumentation = instrumentation
         self.last_latency = 0.01
 
     def discover(self, website_url: str) -> FeedEndpoint | None:
-        """Try common feed endpoints and return the first valid match."""
-        for feed_type, path in self.POSSIBLE_FEEDS:
-            feed_url = website_url.rstrip("/") + path
-            result = self.fetcher.get(feed_url, headers=HEADERS_XML, timeout=timeout, desc="RSS 探测")
-            response = result.response
+        """Return the homepage-declared feed or the first common path that answers with a feed."""
+        return self.discover_feed(website_url).endpoint
 
-            if response is None or response.status_code != 200:
-                continue
+    def discover_feed(self, website_url: str) -> FeedDiscoveryResult:
+        """Like `discover`, but also return the timing of every request made by this call."""
+        timings: list[RequestTiming] = []
+        result = FeedDiscoveryResult(endpoint=self._find_endpoint(website_url, timings), timings=timings)
+        if self.instrumentation is not None:
+            for timing in result.timings:
+                self.instrumentation.record(STAGE_DISCOVER, timing)
+        return result
+
+    def _find_endpoint(self, website_url: str, timings: list[RequestTiming]) -> FeedEndpoint | None:
+        for href in self._declared_feed_urls(website_url, timings):
+            result = self.fetcher.get(
+                href, headers=HEADERS_XML, timeout=timeout, desc="RSS 探测", max_bytes=self.FEED_SNIFF_BYTES
+            )
+            timings.append(result.timing(href))
+            if self._looks_like_feed(result.response):
+                return FeedEndpoint(url=href, feed_type="alternate", source="auto")
+
+        known_misses = self.probe_store.load_misses(website_url) if self.probe_store else set()
+        candidates = [(feed_type, path) for feed_type, path in self.POSSIBLE_FEEDS if path not in known_misses]
+        if known_misses:
+            logging.info(f"[RSS 探测] {website_url} 跳过 {len(self.POSSIBLE_FEEDS) - len(candidates)} 个近期返回 404 的路径")
+
+        endpoint, misses = self._probe_candidates(website_url, candidates, timings)
+        if misses and self.probe_store:
+            self.probe_store.record_misses(website_url, misses)
+        if endpoint is None:
+            logging.warning(f"[RSS 探测] 未找到 {website_url} 的 RSS 订阅源")
+        return endpoint
+
+    def _declared_feed_urls(self, website_url: str, timings: list[RequestTiming]) -> list[str]:
+        result = self.fetcher.get(
+            website_url, headers=HEADERS_JSON, timeout=timeout, desc="RSS 声明探测", max_bytes=self.HOMEPAGE_SCAN_CHARS
+        )
+        timings.append(result.timing(website_url))
+        if not result.success:
+            return []
+        parser = _AlternateFeedLinkParser()
+        text = result.response.text[:self.HOMEPAGE_SCAN_CHARS]
+        try:
+            # 分段喂给解析器，读到 </head> 或 <body> 即停止。
+            for start in range(0, len(text), 4096):
+                parser.feed(text[start:start + 4096])
+                if parser.finished:
+                    break
+        except Exception as exc:
+            logging.warning(f"[RSS 探测] 解析主页 RSS 声明失败：{website_url}，错误: {exc}")
+        return list(dict.fromkeys(urljoin(website_url, href) for href in parser.hrefs))
+
+    def _probe_candidates(
+        self,
+        website_url: str,
+        candidates: list[tuple[str, str]],
+        timings: list[RequestTiming],
+    ) -> tuple[FeedEndpoint | None, list[tuple[str, int]]]:
+        """Probe candidate paths concurrently and return the highest-priority valid feed.
+
+        Results are read in `POSSIBLE_FEEDS` order: a lower-priority feed that answers first
+        is only used once every path ahead of it has failed.
+        """
+        if not candidates:
+            return None, []
+        misses: list[tuple[str, int]] = []
+        endpoint = None
+        pool = self._get_probe_pool()
+        probes = [
+            (pool.submit(self._probe, website_url.rstrip("/") + path), feed_type, path)
+            for feed_type, path in candidates
+        ]
+        try:
+            for future, feed_type, path in probes:
+                feed_url, status_code, is_feed, timing = future.result()
+                timings.append(timing)
+                if is_feed:
+                    endpoint = FeedEndpoint(url=feed_url, feed_type=feed_type, source="auto")
+                    break
+                if status_code in self.MISS_STATUS_CODES:
+                    misses.append((path, status_code))
+        finally:
+            # 已选定地址后取消排队中的低优先级探测；已发出的请求只占用共享线程池，结束后不再使用。
+            for future, _, _ in probes:
+                future.cancel()
+        return endpoint, misses
+
+    def _get_probe_pool(self) -> ThreadPoolExecutor:
+        with self._probe_lock:
+            if self._probe_pool is None:
+                self._probe_pool = ThreadPoolExecutor(max_workers=self.max_probe_workers, thread_name_prefix="fcl-feed-probe")
+            return self._probe_pool
+
+    def close(self) -> None:
+        """Shut down the shared probe pool, if one was started."""
+        with self._probe_lock:
+            pool, self._probe_pool = self._probe_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "FeedDiscoveryService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _probe(self, feed_url: str) -> tuple[str, int | None, bool, RequestTiming]:
+        result = self.fetcher.get(
+            feed_url, headers=HEADERS_XML, timeout=timeout, desc="RSS 探测", max_bytes=self.FEED_SNIFF_BYTES
+        )
+        status_code = result.response.status_code if result.response is not None else None
+        return feed_url, status_code, self._looks_like_feed(result.response), result.timing(feed_url)
+
+    @staticmethod
+    def _looks_like_feed(response: requests.Response | None) -> bool:
+        if response is None or response.status_code != 200:
+            return False
+
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "xml" in content_type or "rss" in content_type or "atom" in content_type:
+            return True
+
+        text_head = response.text[:1000].lower()
+        return "<rss" in text_head or "<feed" in text_head or "<rdf:rdf" in text_head
+
+
+class FeedParseMemo:
+    """Per-run memo of parsed feeds shared by the link-check and crawl phases.
+
+    Articles are kept with their raw links so one entry can serve every caller
+    regardless of the blog URL used to resolve relative links. Entries are keyed
+    by the normalized feed URL, and concurrent loads of the same feed are
+    collapsed into a single download and parse by `single_flight`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, FeedState] = {}
+        self._in_flight: dict[str, Future] = {}
+
+    def get(self, feed_url: str, count: int) -> list[Article] | None:
+        with self._lock:
+            entry = self._entries.get(normalize_feed_url(feed_url))
+        if entry is None or not entry.covers(count):
+            return None
+        return entry.articles[:count]
+
+    def put(self, feed_url: str, count: int, articles: list[Article]) -> None:
+        if not articles:
+            return
+        key = normalize_feed_url(feed_url)
+        with self._lock:
+            self._entries[key] = FeedState(feed_url=key, article_count=count, articles=articles)
+
+    def single_flight(self, feed_url: str, load: Callable[[], T]) -> tuple[T, bool]:
+        """Run `load` once per feed at a time; concurrent callers wait for and share its result.
 
-            content_type = response.headers.get("Content-Type", "").lower()
-            if "xml" in content_type or "rss" in content_type or "atom" in content_type:
-                return FeedEndpoint(url=feed_url, feed_type=feed_type, source="auto")
+        Returns the result and whether it was shared from another caller's load.
+        """
+        key = normalize_feed_url(feed_url)
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result(), True
 
-            text_head = response.text[:1000].lower()
-            if "<rss" in text_head or "<feed" in text_head or "<rdf:rdf" in text_head:
-                return FeedEndpoint(url=feed_url, feed_type=feed_type, source="auto")
+        try:
+            result = load()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
 
-        logging.warning(f"[RSS 探测] 未找到 {website_url} 的 RSS 订阅源")
-        return None
+
+def parse_feed_rows(content: bytes, count: int, stream_parse: bool = False) -> list[tuple[str, ...]]:
+    """Parse a feed body into compact article tuples; safe to run in a worker process."""
+    articles = parse_feed_stream(content, count) if stream_parse else None
+    if articles is None:
+        # 强制使用 UTF-8 编码，与线程内解析保持一致
+        feed = feedparser.parse(content.decode("utf-8", errors="replace"))
+        articles = FeedParserService._collect_articles(feed, count)
+    return [
+        (article.title, article.author, article.link, article.published, article.summary, article.content)
+        for article in articles
+    ]
 
 
 class FeedParserService:
     """Parse a discovered feed into normalized article objects."""
 
-    def __init__(self, session: requests.Session, proxy_settings: ProxySettings | None = None):
+    def __init__(
+        self,
+        session: requests.Session,
+        proxy_settings: ProxySettings | None = None,
+        state_store: FeedStateStore | None = None,
+        memo: FeedParseMemo | None = None,
+        min_count: int = 0,
+        stream_parse: bool = False,
+        parse_workers: int = 0,
+        timeout_policy: AdaptiveTimeoutPolicy | None = None,
+        route_memory: RouteMemory | None = None,
+        instrumentation: RunInstrumentation | None = None,
+        max_response_bytes: int = 0,
+        retry_policy: RetryPolicy | None = None,
+        hedge_executor: ThreadPoolExecutor | None = None,
+    ):
         self.session = session
-        self.fetcher = WebFetchClient(session, proxy_settings)
+        # 订阅源按下载上限截断时，流式解析仍能取到开头的最新文章，feedparser 也能容错解析。
+        self.fetcher = WebFetchClient(
+            session, proxy_settings, timeout_policy, route_memory, max_response_bytes, retry_policy, hedge_executor
+        )
+        self.state_store = state_store
+        self.memo = memo
+        # 链接检测只需要 1 篇文章，但按抓取阶段的数量解析，便于同一次运行复用结果。
+        self.min_count = min_count
+        # 流式解析只读取文章元数据，不包含 summary 与 content。
+        self.stream_parse = stream_parse
+        # 大于 0 时在独立进程池中解析，下载仍在调度引擎的线程中进行；进程池按需创建。
+        self.parse_workers = parse_workers
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self.instrumentation = instrumentation
+        # 仅为兼容旧调用方保留；并发场景请使用 parse_feed 返回的计时。
         self.last_latency = 0.01
 
     def parse(self, feed_url: str, count: int = 5, blog_url: str = "") -> list[Article]:
         """Parse a feed URL and return the newest `count` articles.
 
         The returned articles are normalized to the project's internal domain
-        model, while preserving the original public output fields.
+        model, while preserving the original public output fields. When a state
+        store is configured the feed is requested with its stored validators,
+        and a 304 response reuses the articles parsed last time. With a memo,
+        a feed already parsed earlier in the same run is not fetched again.
         """
+        return self.parse_feed(feed_url, count, blog_url).articles
+
+    def parse_feed(self, feed_url: str, count: int = 5, blog_url: str = "") -> FeedParseResult:
+        """Like `parse`, but also return the timing of the request made by this call."""
+        parse_count = max(count, self.min_count)
+        if self.memo is None:
+            articles, timing = self._fetch_articles(feed_url, parse_count)
+        else:
+            # 多个友链指向同一订阅源时，并发的请求共用同一次下载与解析。
+            (articles, timing), shared = self.memo.single_flight(
+                feed_url, lambda: self._fetch_memoized(feed_url, count, parse_count)
+            )
+            if shared:
+                logging.info(f"[RSS 抓取] 复用其他站点同时抓取的订阅源：{feed_url}")
+                timing = RequestTiming(url=feed_url, from_memo=True)
+        self._record_timing(timing)
+        return FeedParseResult(self._resolve_links(articles[:count], blog_url), timing)
+
+    def _fetch_memoized(self, feed_url: str, count: int, parse_count: int) -> tuple[list[Article], RequestTiming]:
+        memoized = self.memo.get(feed_url, count)
+        if memoized is not None:
+            logging.info(f"[RSS 抓取] 复用本次运行已解析的订阅源：{feed_url}")
+            return memoized, RequestTiming(url=feed_url, from_memo=True)
+        articles, timing = self._fetch_articles(feed_url, parse_count)
+        self.memo.put(feed_url, parse_count, articles)
+        return articles, timing
+
+    def _fetch_articles(self, feed_url: str, count: int) -> tuple[list[Article], RequestTiming]:
+        """Download and parse a feed, returning raw-link articles and the request timing."""
+        state = self._load_state(feed_url, count)
+        headers = {**HEADERS_XML, **state.conditional_headers()} if state else HEADERS_XML
+        timing = RequestTiming(url=feed_url)
         try:
-            result = self.fetcher.get(feed_url, headers=HEADERS_XML, timeout=timeout, desc="RSS 抓取")
+            result = self.fetcher.get(feed_url, headers=headers, timeout=timeout, desc="RSS 抓取")
+            timing = result.timing(feed_url)
             self.last_latency = normalize_latency(result.latency)
             if result.response is None:
-                return []
+                return [], timing
+            if result.not_modified:
+                if state is None:
+                    return [], timing
+                logging.info(f"[RSS 抓取] 订阅源未变化，复用上次解析结果：{feed_url}")
+                return state.articles[:count], timing
             response = result.response
-            # 强制使用 UTF-8 编码，因为 apparent_encoding 可能检测错误
-            response.encoding = "utf-8"
-            feed = feedparser.parse(response.text)
+            # 截断的订阅源内容不完整：照常解析开头部分，但不计算摘要、不保存条件请求状态，
+            # 否则之后的 304 与摘要命中会一直复用这份不完整的解析结果。
+            content_hash = "" if result.truncated else self._content_hash(response)
+            if state is not None and content_hash and content_hash == state.content_hash:
+                # 不支持条件请求的服务端常常每次返回完全相同的内容，摘要一致时直接复用上次结果。
+                logging.info(f"[RSS 抓取] 订阅源内容未变化，跳过解析：{feed_url}")
+                self._save_state(feed_url, count, response, state.articles, content_hash, state.changed_at)
+                return state.articles[:count], timing
+            parse_started = time.perf_counter()
+            articles = self._parse_response(response, count)
+            timing.parse = round(time.perf_counter() - parse_started, 4)
         except Exception as exc:
             logging.error(f"[RSS 抓取] 解析 RSS 失败：{feed_url}，错误: {exc}")
-            return []
+            return [], timing
+
+        if result.truncated:
+            logging.warning(f"[RSS 抓取] 订阅源超过下载上限，本次结果不保存为条件请求状态：{feed_url}")
+        else:
+            self._save_state(feed_url, count, response, articles, content_hash)
+        return articles, timing
+
+    def _record_timing(self, timing: RequestTiming) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.record(STAGE_PARSE, timing)
+
+    def _parse_response(self, response: requests.Response, count: int) -> list[Article]:
+        pool = self._get_parse_pool()
+        if pool is not None:
+            try:
+                rows = pool.submit(parse_feed_rows, response.content, count, self.stream_parse).result()
+                return [Article(*row) for row in rows]
+            except BrokenProcessPool as exc:
+                logging.warning(f"[RSS 抓取] 解析进程池不可用，改为在当前线程解析：{exc}")
+                self.parse_workers = 0
+        if self.stream_parse:
+            articles = parse_feed_stream(response.content, count)
+            if articles is not None:
+                return articles
+        # 强制使用 UTF-8 编码，因为 apparent_encoding 可能检测错误
+        response.encoding = "utf-8"
+        return self._collect_articles(feedparser.parse(response.text), count)
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor | None:
+        if self.parse_workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._parse_pool is None:
+                # 抓取线程已在运行，使用 spawn 避免 fork 复制线程锁状态。
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._parse_pool
 
+    def close(self) -> None:
+        """Shut down the parse process pool, if one was started."""
+        with self._pool_lock:
+            pool, self._parse_pool = self._parse_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    @staticmethod
+    def _collect_articles(feed, count: int) -> list[Article]:
+        """Build the newest `count` articles from a parsed feed, keeping raw links."""
         default_author = feed.feed.author if "author" in feed.feed else ""
         articles: list[Article] = []
 
         for entry in feed.entries:
-            published = self._extract_published_time(entry)
-            article_link = replace_non_domain(entry.link, blog_url) if "link" in entry else ""
+            published = FeedParserService._extract_published_time(entry)
             article = Article(
                 title=entry.title if "title" in entry else "",
                 author=default_author,
-                link=article_link,
+                link=entry.link if "link" in entry else "",
                 published=published,
                 summary=entry.summary if "summary" in entry else "",
                 content=entry.content[0].value if "content" in entry and entry.content else entry.description if "description" in entry else "",
             )
             articles.append(article)
 
-        valid_articles = [article for article in articles if article.published]
-        
-        # 过滤掉无法解析的日期格式
-        def safe_parse_date(article):
-            try:
-                return datetime.strptime(article.published, "%Y-%m-%d %H:%M")
-            except ValueError:
-                logging.warning(f"[RSS 抓取] 文章 {article.title} 的发布时间格式异常: {article.published}，已跳过")
-                return None
-        
-        # 只保留能成功解析日期的文章
-        valid_articles_with_dates = []
-        for article in valid_articles:
-            parsed_date = safe_parse_date(article)
-            if parsed_date:
-                valid_articles_with_dates.append((article, parsed_date))
-        
-        # 按日期排序
-        valid_articles_with_dates.sort(key=lambda item: item[1], reverse=True)
-        sorted_articles = [item[0] for item in valid_articles_with_dates]
-        
-        return sorted_articles[:count] if count < len(sorted_articles) else sorted_articles
+        return select_newest_articles(articles, count)
+
+    @staticmethod
+    def _resolve_links(articles: list[Article], blog_url: str) -> list[Article]:
+        """Return copies of `articles` with relative or local links resolved against the blog."""
+        return [replace(article, link=replace_non_domain(article.link, blog_url)) for article in articles]
+
+    def _load_state(self, feed_url: str, count: int) -> FeedState | None:
+        if self.state_store is None:
+            return None
+        state = self.state_store.load(feed_url)
+        return state if state and state.covers(count) else None
+
+    def _save_state(
+        self,
+        feed_url: str,
+        count: int,
+        response: requests.Response,
+        articles: list[Article],
+        content_hash: str = "",
+        changed_at: str = "",
+    ) -> None:
+        if self.state_store is None or not articles:
+            return
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        if not etag and not last_modified and not content_hash:
+            return
+        fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.state_store.save(FeedState(
+            feed_url=feed_url,
+            etag=etag,
+            last_modified=last_modified,
+            article_count=count,
+            articles=articles,
+            fetched_at=fetched_at,
+            content_hash=content_hash,
+            changed_at=changed_at or fetched_at,
+        ))
+
+    @staticmethod
+    def _content_hash(response: requests.Response) -> str:
+        content = getattr(response, "content", None)
+        if not isinstance(content, bytes):
+            return ""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
 
     @staticmethod
     def _extract_published_time(entry) -> str:
-        """Extract a normalized publish time from a feed entry."""
-        import time
-        
-        def convert_time_to_string(time_value):
-            """Convert various time formats to string."""
-            if isinstance(time_value, str):
-                return time_value
-            elif isinstance(time_value, time.struct_time):
+        """Extract a normalized publish time from a feed entry.
+
+        feedparser's `published_parsed` / `updated_parsed` struct_time is formatted directly; the raw
+        string is parsed only when feedparser could not parse it or it ends in an ambiguous zone
+        abbreviation such as CST.
+        """
+
+        def normalize_time(key: str) -> str:
+            parsed = entry.get(f"{key}_parsed")
+            raw = entry.get(key)
+            if isinstance(parsed, time.struct_time) and not has_ambiguous_zone(raw):
                 # 检查年份是否异常
-                if time_value.tm_year < 1900:
-                    logging.warning(f"[RSS 抓取] 文章 {entry.get('title', 'Unknown')} 的时间年份异常: {time_value.tm_year}，已跳过")
+                if parsed.tm_year < 1900:
+                    logging.warning(f"[RSS 抓取] 文章 {entry.get('title', 'Unknown')} 的时间年份异常: {parsed.tm_year}，已跳过")
                     return ""
-                return time.strftime('%Y-%m-%dT%H:%M:%SZ', time_value)
-            else:
-                logging.warning(f"[RSS 抓取] 文章 {entry.get('title', 'Unknown')} 的时间格式未知: {type(time_value)}，已跳过")
-                return ""
-        
+                return format_struct_time(parsed)
+            if isinstance(raw, str):
+                return format_published_time(raw)
+            logging.warning(f"[RSS 抓取] 文章 {entry.get('title', 'Unknown')} 的时间格式未知: {type(raw)}，已跳过")
+            return ""
+
         if "published" in entry:
-            time_str = convert_time_to_string(entry.published)
-            if not time_str:
-                return ""
-            return format_published_time(time_str)
+            return normalize_time("published")
         if "updated" in entry:
-            time_str = convert_time_to_string(entry.updated)
-            if not time_str:
+            published = normalize_time("updated")
+            if not published:
                 return ""
-            published = format_published_time(time_str)
             logging.warning(f"[RSS 抓取] 文章 {entry.title} 未包含发布时间，已使用更新时间 {published}")
             return published
 
@@ -0,0 +1,191 @@
+"""流式订阅源解析。
+
+抓取只需要每个订阅源最新的几篇文章，但 feedparser 会完整解析、清洗并构造全部条目。
+本模块使用 `xml.etree.ElementTree.XMLPullParser` 增量解析 RSS 2.0、RSS 1.0 与 Atom，
+只读取 `Article` 需要的标题、链接、作者与时间字段，每个条目处理完即释放：
+
+- 条目按发布时间从新到旧排列时，收集到足够数量即停止解析，不再读取后续内容；
+- 顺序被打乱时继续读完整个订阅源，再按时间排序截取；
+- XML 格式错误、未定义实体或无法识别的根元素时返回 None，由调用方回退到 feedparser。
+
+流式模式不读取 summary 与 content 字段，需要正文的场景（如邮件推送）应继续使用 feedparser。
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Iterable
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from friend_circle_lite.domain.models import Article
+from friend_circle_lite.utils.time import format_published_time
+
+
+CHUNK_SIZE = 16 * 1024
+PUBLISHED_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+ROOT_TAGS = {"rss", "feed", "RDF"}
+ENTRY_TAGS = {"item", "entry"}
+PUBLISHED_TAGS = ("pubDate", "published", "date", "issued")
+UPDATED_TAGS = ("updated", "modified")
+FEED_AUTHOR_TAGS = {"managingEditor", "creator", "author"}
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _published_datetime(article: Article) -> datetime | None:
+    try:
+        return datetime.strptime(article.published, PUBLISHED_DATE_FORMAT)
+    except ValueError:
+        logging.warning(f"[RSS 抓取] 文章 {article.title} 的发布时间格式异常: {article.published}，已跳过")
+        return None
+
+
+def select_newest_articles(articles: Iterable[Article], count: int) -> list[Article]:
+    """按发布时间倒序返回最新的 `count` 篇文章，跳过时间缺失或格式异常的文章。"""
+    dated = []
+    for article in articles:
+        if not article.published:
+            continue
+        published = _published_datetime(article)
+        if published:
+            dated.append((article, published))
+    dated.sort(key=lambda item: item[1], reverse=True)
+    return [item[0] for item in dated[:count]]
+
+
+class StreamingFeedParser:
+    """增量解析订阅源，收集到最新的 `count` 篇文章后提前停止。"""
+
+    def __init__(self, count: int):
+        self.count = max(1, count)
+        self.feed_author = ""
+        self.entries: list[Article] = []
+        self._dated: list[datetime] = []
+        self._ordered = True
+        self._root_checked = False
+        self._entry_depth = 0
+        self._author_depth = 0
+
+    def parse(self, chunks: Iterable[bytes]) -> list[Article] | None:
+        """解析字节块序列；无法按流式解析时返回 None。"""
+        parser = XMLPullParser(events=("start", "end"))
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                if self._consume(parser.read_events()):
+                    return self._result()
+            parser.close()
+            if self._consume(parser.read_events()):
+                return self._result()
+        except (ParseError, UnicodeDecodeError) as exc:
+            logging.info(f"[RSS 抓取] 流式解析失败，回退到 feedparser：{exc}")
+            return None
+        if not self._root_checked or not self.entries:
+            return None
+        return self._result()
+
+    def _consume(self, events) -> bool:
+        """处理解析事件；返回 True 表示已收集足够的文章。"""
+        for event, element in events:
+            name = _local_name(element.tag)
+            if not self._root_checked:
+                if name not in ROOT_TAGS:
+                    raise ParseError(f"unsupported root element <{name}>")
+                self._root_checked = True
+            if event == "start":
+                if name in ENTRY_TAGS:
+                    self._entry_depth += 1
+                elif name == "author" and not self._entry_depth:
+                    self._author_depth += 1
+                continue
+
+            if name in ENTRY_TAGS:
+                self._entry_depth -= 1
+                self._add_entry(element)
+                element.clear()
+                if self._enough():
+                    return True
+            elif not self._entry_depth:
+                self._read_feed_author(name, element)
+        return False
+
+    def _read_feed_author(self, name: str, element: Element) -> None:
+        if name == "author":
+            self._author_depth -= 1
+        if self.feed_author or name not in FEED_AUTHOR_TAGS | {"name"}:
+            return
+        if name == "name" and not self._author_depth:
+            return
+        # Atom 的 <author> 只包含子元素，名称取自 <name>。
+        text = (element.text or "").strip()
+        if text:
+            self.feed_author = text
+
+    def _add_entry(self, element: Element) -> None:
+        fields: dict[str, str] = {}
+        link = ""
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "link":
+                # RSS 的链接写在文本中，Atom 写在 href 属性中，只取 alternate 链接。
+                if link:
+                    continue
+                if child.get("href"):
+                    if child.get("rel", "alternate") == "alternate":
+                        link = child.get("href", "").strip()
+                else:
+                    link = (child.text or "").strip()
+            elif name not in fields:
+                fields[name] = (child.text or "").strip()
+
+        title = fields.get("title", "")
+        self.entries.append(Article(
+            title=title,
+            author=self.feed_author,
+            link=link,
+            published=self._published(fields, title),
+        ))
+
+    def _published(self, fields: dict[str, str], title: str) -> str:
+        for tag in PUBLISHED_TAGS:
+            if fields.get(tag):
+                return format_published_time(fields[tag])
+        for tag in UPDATED_TAGS:
+            if fields.get(tag):
+                published = format_published_time(fields[tag])
+                logging.warning(f"[RSS 抓取] 文章 {title} 未包含发布时间，已使用更新时间 {published}")
+                return published
+        logging.warning(f"[RSS 抓取] 文章 {title} 未包含任何时间信息，请检查原文，跳过该文章")
+        return ""
+
+    def _enough(self) -> bool:
+        try:
+            published = datetime.strptime(self.entries[-1].published, PUBLISHED_DATE_FORMAT)
+        except ValueError:
+            return False
+        if self._dated and published > self._dated[-1]:
+            self._ordered = False
+        self._dated.append(published)
+        return self._ordered and len(self._dated) >= self.count
+
+    def _result(self) -> list[Article]:
+        # 频道作者可能出现在条目之后（Atom 允许），统一补齐。
+        if self.feed_author:
+            for article in self.entries:
+                article.author = article.author or self.feed_author
+        return select_newest_articles(self.entries, self.count)
+
+
+def iter_chunks(content: bytes, chunk_size: int = CHUNK_SIZE) -> Iterable[bytes]:
+    """把已下载的响应体切成小块，便于解析器在提前停止时跳过剩余内容。"""
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+
+
+def parse_feed_stream(content: bytes, count: int) -> list[Article] | None:
+    """流式解析订阅源字节内容，返回最新的 `count` 篇文章；需要回退时返回 None。"""
+    return StreamingFeedParser(count).parse(iter_chunks(content))
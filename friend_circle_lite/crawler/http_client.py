@@ -1,19 +1,65 @@
 """统一网页请求封装。
 
 本模块负责把“直连优先，失败后自动尝试代理”的请求逻辑收口到一个地方。
-调用方只关心是否拿到响应，不需要感知重试细节。
+调用方只关心是否拿到响应，不需要感知重试细节。配置了 `RouteMemory` 时，
+只能通过代理访问的主机会直接走代理，不必每次先等待直连超时。
+
+配置了 `AdaptiveTimeoutPolicy` 时，下载完整正文的直连 GET 请求的超时按主机历史延迟动态计算：
+响应快的站点使用更短的超时，长期缓慢的站点也不会超过上限，避免少数站点拖慢整轮运行。
+HEAD/Range 探测、只读开头的嗅探与边下载边查找的请求耗时与完整下载不可比，既不记录样本也不套用该超时。
+
+配置了 `max_response_bytes` 时，响应体按块流式读取，超过上限的部分不再下载，
+单个站点返回超大页面时每个工作线程占用的内存仍然有上限。
+
+配置了 `RetryPolicy` 时，连接被重置、429 与 502~504 等临时错误会在同一线路上按退避时间重试，
+重试次数从整次运行共享的预算中扣减；其他错误视为确定结果，直接返回或切换线路。
+
+传入 `BodyScan` 时，响应体边下载边查找，首次命中后立即停止下载，适合只需判断页面是否包含某段文本的请求。
+传入 `probe_method` 时只取响应头，不下载正文，适合只关心状态码的可达性探测。
 """
 
 from __future__ import annotations
 
 import logging
+import math
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 import requests
+from urllib3 import exceptions as urllib3_exceptions
+
+from friend_circle_lite.config.models import ProxySettings, RequestSettings
+from friend_circle_lite.crawler.engine import host_key
+from friend_circle_lite.domain.models import RequestTiming, normalize_latency
+from friend_circle_lite.storage.sqlite_store import RequestLatencyStore, RequestRouteStore
+
+
+ROUTE_DIRECT = "direct"
+ROUTE_PROXY = "proxy"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 提前停止读取后，剩余正文不超过该大小时读完丢弃，连接可以放回连接池复用；更大时直接关闭连接。
+DRAIN_REMAINDER_BYTES = 64 * 1024
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(slots=True)
+class BodyScan:
+    """在流式下载的响应体中查找正则，首次命中后停止下载。"""
+
+    pattern: re.Pattern[bytes]
+    # 可能命中的最长文本长度；相邻数据块之间保留这么多字节，跨块的命中不会漏掉。
+    max_match_bytes: int
 
-from friend_circle_lite.config.models import ProxySettings
-from friend_circle_lite.domain.models import normalize_latency
+    def search(self, data: bytes) -> str:
+        """在完整内容中查找，返回命中的文本，未命中返回空字符串。"""
+        match = self.pattern.search(data)
+        return match.group(0).decode("utf-8", "replace") if match else ""
 
 
 @dataclass(slots=True)
@@ -23,19 +69,228 @@ class FetchResult:
     response: requests.Response | None
     latency: float = -1
     used_proxy: bool = False
+    # 响应体超过下载上限、只保留了开头部分。
+    truncated: bool = False
+    # 请求未取得响应时的异常，用于判断是否值得重试。
+    error: Exception | None = None
+    # 传入 BodyScan 时命中的文本；未命中为空字符串，未扫描为 None。命中后响应体只保留已下载的部分。
+    match: str | None = None
+    # 请求带有 Range 头；只有这类请求的 206 响应视为成功。
+    range_requested: bool = False
 
     @property
     def success(self) -> bool:
-        """是否成功取得 HTTP 200 响应。"""
-        return self.response is not None and self.response.status_code == 200
+        """是否成功取得 HTTP 200 响应；带 Range 头的请求返回 206 同样视为成功。"""
+        if self.response is None:
+            return False
+        return self.response.status_code == 200 or (self.range_requested and self.response.status_code == 206)
+
+    @property
+    def not_modified(self) -> bool:
+        """条件请求命中，服务端返回 HTTP 304。"""
+        return self.response is not None and self.response.status_code == 304
+
+    def timing(self, url: str) -> RequestTiming:
+        """拆分本次请求的计时：首字节时间取自 `response.elapsed`，其余为下载时间。"""
+        timing = RequestTiming(url=url, latency=self.latency, used_proxy=self.used_proxy)
+        if self.response is None:
+            return timing
+        timing.status_code = self.response.status_code
+        elapsed = getattr(self.response, "elapsed", None)
+        if elapsed is not None:
+            timing.ttfb = round(elapsed.total_seconds(), 4)
+            timing.download = round(max(0.0, self.latency - timing.ttfb), 4)
+        content = getattr(self.response, "content", None)
+        if isinstance(content, (bytes, str)):
+            timing.bytes = len(content)
+        return timing
+
+
+class AdaptiveTimeoutPolicy:
+    """按主机的历史延迟推导 (连接, 读取) 超时。
+
+    超时取最近若干次请求延迟的 p95 乘以倍数，再限制在配置的上下限之间。
+    请求超时记为一次等于超时上限的样本，历史上很快的主机变慢后，超时可以随之放宽，
+    不会一直停留在下限而每次都超时。
+    样本不足或未启用时返回调用方给出的默认超时。延迟在内存中累积，`flush` 时写回 SQLite。
+    """
+
+    def __init__(self, settings: RequestSettings | None = None, store: RequestLatencyStore | None = None):
+        self.settings = settings or RequestSettings()
+        self.store = store
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] = store.load_samples() if store and self.settings.adaptive_timeout else {}
+        self._dirty: set[str] = set()
+
+    def timeout_for(self, url: str, default: int | tuple | None) -> int | tuple | None:
+        if not self.settings.adaptive_timeout:
+            return default
+        with self._lock:
+            samples = sorted(self._samples.get(host_key(url), ()))
+        if len(samples) < self.settings.min_samples:
+            return default
+
+        p95 = samples[max(0, math.ceil(len(samples) * 0.95) - 1)]
+        budget = p95 * self.settings.timeout_multiplier
+        connect = min(max(budget, self.settings.min_timeout), self.settings.max_connect_timeout)
+        read = min(max(budget, self.settings.min_timeout), self.settings.max_timeout)
+        return round(connect, 2), round(read, 2)
+
+    def record(self, url: str, latency: float) -> None:
+        if not self.settings.adaptive_timeout or latency <= 0:
+            return
+        host = host_key(url)
+        with self._lock:
+            samples = self._samples.setdefault(host, [])
+            samples.append(latency)
+            del samples[:-self.settings.latency_samples]
+            self._dirty.add(host)
+
+    def record_timeout(self, url: str) -> None:
+        """请求超时时没有实际延迟，按超时上限记一次样本。"""
+        self.record(url, self.settings.max_timeout)
+
+    def flush(self) -> None:
+        """把本次运行更新过的主机延迟写回存储。"""
+        with self._lock:
+            updates = {host: list(self._samples[host]) for host in self._dirty}
+            self._dirty.clear()
+        if self.store is not None and updates:
+            self.store.save_samples(updates)
+
+
+class RouteMemory:
+    """记住每个主机上次请求成功的线路（直连或代理），下次直接走该线路。"""
+
+    def __init__(self, store: RequestRouteStore | None = None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._routes: dict[str, str] = store.load_routes() if store else {}
+        self._dirty: set[str] = set()
+
+    def preferred(self, url: str) -> str:
+        with self._lock:
+            return self._routes.get(host_key(url), ROUTE_DIRECT)
+
+    def remember(self, url: str, route: str) -> None:
+        host = host_key(url)
+        with self._lock:
+            if self._routes.get(host, ROUTE_DIRECT) == route:
+                return
+            self._routes[host] = route
+            self._dirty.add(host)
+
+    def flush(self) -> None:
+        """把本次运行中发生变化的线路写回存储。"""
+        with self._lock:
+            updates = {host: self._routes[host] for host in self._dirty}
+            self._dirty.clear()
+        if self.store is not None and updates:
+            self.store.save_routes(updates)
+
+
+class RetryPolicy:
+    """临时错误的重试策略，整次运行的所有请求共用一份重试预算。
+
+    只有连接被重置等连接错误与 `RETRYABLE_STATUS_CODES` 中的状态码会重试；
+    超时、域名解析失败、证书错误与其他状态码视为确定结果。
+    等待时间优先使用响应的 `Retry-After`，否则按指数退避随机抖动。
+    """
+
+    def __init__(self, settings: RequestSettings | None = None):
+        self.settings = settings or RequestSettings()
+        self._lock = threading.Lock()
+        self._remaining = self.settings.retry_budget
+        self.retries = 0
+        self.denied = 0
+
+    def retry_delay(self, result: FetchResult, attempt: int) -> float | None:
+        """第 `attempt` 次重试前应等待的秒数；不应重试时返回 None。"""
+        if attempt >= self.settings.max_retries:
+            return None
+        if result.response is not None:
+            if result.response.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            delay = self._retry_after(result.response)
+            if delay is not None and delay > self.settings.max_retry_delay:
+                return None
+        elif self.retryable_error(result.error):
+            delay = None
+        else:
+            return None
+        if delay is None:
+            delay = random.uniform(0, min(self.settings.retry_backoff * 2 ** attempt, self.settings.max_retry_delay))
+        with self._lock:
+            if self._remaining <= 0:
+                self.denied += 1
+                return None
+            self._remaining -= 1
+            self.retries += 1
+        return delay
+
+    @staticmethod
+    def retryable_error(error: Exception | None) -> bool:
+        if isinstance(error, requests.exceptions.ChunkedEncodingError):
+            return True
+        if not isinstance(error, requests.ConnectionError) or isinstance(error, (requests.Timeout, requests.exceptions.SSLError)):
+            return False
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return not isinstance(reason, getattr(urllib3_exceptions, "NameResolutionError", ()))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float | None:
+        value = (response.headers.get("Retry-After") or "").strip()
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def log_summary(self) -> None:
+        if not self.retries and not self.denied:
+            return
+        logging.info(f"[请求重试] 本次运行共重试 {self.retries} 次，重试预算用尽后放弃 {self.denied} 次")
+
+
+def build_hedge_executor(proxy_settings: ProxySettings, max_workers: int) -> ThreadPoolExecutor | None:
+    """为一次运行创建对冲请求线程池；未配置代理或未开启对冲时返回 None。
+
+    每个并发请求至多同时占用两条线路，线程数按调用方的并发数的两倍设置。
+    线程池由创建方持有，运行结束时关闭。
+    """
+    if not proxy_settings.proxy_url or proxy_settings.hedge_delay <= 0:
+        return None
+    return ThreadPoolExecutor(max_workers=max(2, 2 * max_workers), thread_name_prefix="fcl-hedge")
 
 
 class WebFetchClient:
     """网页请求客户端，封装直连和代理回退逻辑。"""
 
-    def __init__(self, session: requests.Session, proxy_settings: ProxySettings | None = None):
+    def __init__(
+        self,
+        session: requests.Session,
+        proxy_settings: ProxySettings | None = None,
+        timeout_policy: AdaptiveTimeoutPolicy | None = None,
+        route_memory: RouteMemory | None = None,
+        max_response_bytes: int = 0,
+        retry_policy: RetryPolicy | None = None,
+        hedge_executor: ThreadPoolExecutor | None = None,
+    ):
         self.session = session
         self.proxy_settings = proxy_settings or ProxySettings()
+        self.timeout_policy = timeout_policy
+        self.route_memory = route_memory
+        # 大于 0 时以 stream=True 请求并限制响应体大小；为 0 时保持一次性读取。
+        self.max_response_bytes = max(0, max_response_bytes)
+        self.retry_policy = retry_policy
+        # 对冲请求使用调用方持有的线程池；未传入时两条线路依次请求。
+        self.hedge_executor = hedge_executor
 
     def get(
         self,
@@ -43,22 +298,154 @@ class WebFetchClient:
         headers: dict[str, str] | None = None,
         timeout: int | tuple | None = None,
         desc: str = "网页请求",
+        max_bytes: int | None = None,
+        scan: BodyScan | None = None,
+        probe_method: str = "",
     ) -> FetchResult:
-        """先直连请求，失败时自动尝试代理请求。"""
-        direct = self._get_once(url, headers=headers, timeout=timeout, desc=desc, used_proxy=False)
-        if direct.success or not self.proxy_settings.proxy_url:
-            return direct
-
-        proxy_url = self._build_proxy_url(url)
-        proxy = self._get_once(
-            proxy_url,
+        """先按主机上次成功的线路请求，失败时自动尝试另一条线路。
+
+        没有线路记录时先直连。条件请求返回 304 视为成功，不会再切换线路。
+        配置了超时策略时，直连请求使用按主机历史延迟计算的超时，代理请求仍使用调用方给出的超时。
+        `proxy_settings.hedge_delay` 大于 0 且传入了 `hedge_executor` 时，首选线路在该时间内没有结果
+        就同时发起另一条线路，取先成功的结果。两条线路都失败时返回直连结果。
+
+        `max_bytes` 只读取响应开头的指定字节数，用于只需要嗅探内容的请求；
+        它不会超过 `max_response_bytes`，后者为 0 时两者都不生效。
+        `scan` 在下载过程中查找内容，命中后停止下载，结果写入 `FetchResult.match`。
+        `probe_method`（如 "HEAD"、"GET"）表示只读取响应头的探测请求，正文不下载。
+        """
+        limit = self._byte_limit(max_bytes)
+        if not self.proxy_settings.proxy_url:
+            return self._get_route(ROUTE_DIRECT, url, headers, timeout, desc, limit, scan, probe_method)
+
+        first = self.route_memory.preferred(url) if self.route_memory else ROUTE_DIRECT
+        second = ROUTE_PROXY if first == ROUTE_DIRECT else ROUTE_DIRECT
+        if self.proxy_settings.hedge_delay > 0 and self.hedge_executor is not None:
+            results = self._get_hedged(first, second, url, headers, timeout, desc, limit, scan, probe_method)
+        else:
+            results = {first: self._get_route(first, url, headers, timeout, desc, limit, scan, probe_method)}
+            if not self._usable(results[first]):
+                results[second] = self._get_route(second, url, headers, timeout, desc, limit, scan, probe_method)
+
+        for route, result in results.items():
+            if self._usable(result):
+                if self.route_memory:
+                    self.route_memory.remember(url, route)
+                return result
+        return results.get(ROUTE_DIRECT) or results[first]
+
+    def _get_hedged(
+        self,
+        first: str,
+        second: str,
+        url: str,
+        headers: dict[str, str] | None,
+        timeout: int | tuple | None,
+        desc: str,
+        limit: int = 0,
+        scan: BodyScan | None = None,
+        probe_method: str = "",
+    ) -> dict[str, FetchResult]:
+        """对冲请求：首选线路超过 hedge_delay 仍无结果时并发请求另一条线路。
+
+        落后的请求无法中途取消，会在后台自然结束，其结果被丢弃。
+        """
+        executor = self.hedge_executor
+        futures = {executor.submit(self._get_route, first, url, headers, timeout, desc, limit, scan, probe_method): first}
+        done, _ = wait(futures, timeout=self.proxy_settings.hedge_delay)
+        if done and self._usable(next(iter(done)).result()):
+            return {first: next(iter(done)).result()}
+
+        futures[executor.submit(self._get_route, second, url, headers, timeout, desc, limit, scan, probe_method)] = second
+        results: dict[str, FetchResult] = {}
+        for future in as_completed(futures):
+            route = futures[future]
+            results[route] = future.result()
+            if self._usable(results[route]):
+                break
+        return results
+
+    def _get_route(
+        self,
+        route: str,
+        url: str,
+        headers: dict[str, str] | None,
+        timeout: int | tuple | None,
+        desc: str,
+        limit: int = 0,
+        scan: BodyScan | None = None,
+        probe_method: str = "",
+    ) -> FetchResult:
+        """请求一条线路；遇到临时错误时按重试策略在同一线路上重试。"""
+        attempt = 0
+        while True:
+            result = self._get_route_once(route, url, headers, timeout, desc, limit, scan, probe_method)
+            delay = self.retry_policy.retry_delay(result, attempt) if self.retry_policy else None
+            if delay is None:
+                return result
+            attempt += 1
+            logging.info(f"[{desc}] 临时错误，{delay:.1f} 秒后第 {attempt} 次重试: {url}")
+            time.sleep(delay)
+
+    def _get_route_once(
+        self,
+        route: str,
+        url: str,
+        headers: dict[str, str] | None,
+        timeout: int | tuple | None,
+        desc: str,
+        limit: int = 0,
+        scan: BodyScan | None = None,
+        probe_method: str = "",
+    ) -> FetchResult:
+        if route == ROUTE_PROXY:
+            return self._get_once(
+                self._build_proxy_url(url),
+                headers=headers,
+                timeout=timeout,
+                desc=f"{desc} 代理",
+                used_proxy=True,
+                display_url=f"{url} （通过代理）",
+                limit=limit,
+                scan=scan,
+                probe_method=probe_method,
+            )
+
+        adaptive = self.timeout_policy is not None and self._full_body(headers, limit, scan, probe_method)
+        direct_timeout = self.timeout_policy.timeout_for(url, timeout) if adaptive else timeout
+        direct = self._get_once(
+            url,
             headers=headers,
-            timeout=timeout,
-            desc=f"{desc} 代理",
-            used_proxy=True,
-            display_url=f"{url} （通过代理）",
+            timeout=direct_timeout,
+            desc=desc,
+            used_proxy=False,
+            limit=limit,
+            scan=scan,
+            probe_method=probe_method,
         )
-        return proxy if proxy.success else direct
+        if adaptive and direct.response is not None and direct.response.status_code < 500:
+            self.timeout_policy.record(url, direct.latency)
+        elif adaptive and isinstance(direct.error, requests.Timeout):
+            self.timeout_policy.record_timeout(url)
+        return direct
+
+    def _full_body(self, headers: dict[str, str] | None, limit: int, scan: BodyScan | None, probe_method: str) -> bool:
+        """是否为下载完整正文的 GET 请求；只有这类请求的延迟计入、并使用按主机的自适应超时。"""
+        if probe_method or scan is not None or (headers and "Range" in headers):
+            return False
+        # 未指定 max_bytes 时 limit 等于响应体上限，仍视为完整下载。
+        return limit in (0, self.max_response_bytes)
+
+    @staticmethod
+    def _usable(result: FetchResult) -> bool:
+        return result.success or result.not_modified
+
+    def _byte_limit(self, max_bytes: int | None) -> int:
+        if not self.max_response_bytes:
+            return 0
+        if max_bytes is None or max_bytes <= 0:
+            return self.max_response_bytes
+        return min(max_bytes, self.max_response_bytes)
 
     def _get_once(
         self,
@@ -68,21 +455,110 @@ class WebFetchClient:
         desc: str,
         used_proxy: bool,
         display_url: str | None = None,
+        limit: int = 0,
+        scan: BodyScan | None = None,
+        probe_method: str = "",
     ) -> FetchResult:
         log_url = display_url or url
         start_time = time.time()
+        truncated = False
+        match = None
         try:
-            response = self.session.get(url, headers=headers, timeout=timeout)
+            if probe_method:
+                response = self.session.request(probe_method, url, headers=headers, timeout=timeout, stream=True)
+                self._discard_body(response)
+            elif limit or scan:
+                response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+                truncated, match = self._read_limited(response, limit, scan)
+                if truncated and limit == self.max_response_bytes:
+                    logging.warning(f"[{desc}] 响应体超过 {limit} 字节，只保留开头部分: {log_url}")
+            else:
+                response = self.session.get(url, headers=headers, timeout=timeout)
             latency = self._elapsed_latency(start_time)
-            if response.status_code == 200:
+            if response.status_code in (200, 206):
                 logging.info(f"[{desc}] 成功访问: {log_url} ，延迟 {latency} 秒")
+            elif response.status_code == 304:
+                logging.info(f"[{desc}] 内容未变化: {log_url} ，延迟 {latency} 秒")
             else:
                 logging.warning(f"[{desc}] 状态码异常: {log_url} -> {response.status_code}")
-            return FetchResult(response=response, latency=latency, used_proxy=used_proxy)
+            return FetchResult(
+                response=response,
+                latency=latency,
+                used_proxy=used_proxy,
+                truncated=truncated,
+                match=match,
+                range_requested=bool(headers and "Range" in headers),
+            )
         except requests.RequestException as exc:
             error_text = exc.__class__.__name__ if used_proxy else str(exc)
             logging.warning(f"[{desc}] 请求失败: {log_url} ，错误: {error_text}")
-            return FetchResult(response=None, latency=self._elapsed_latency(start_time), used_proxy=used_proxy)
+            return FetchResult(response=None, latency=self._elapsed_latency(start_time), used_proxy=used_proxy, error=exc)
+
+    @staticmethod
+    def _read_limited(response: requests.Response, limit: int, scan: BodyScan | None = None) -> tuple[bool, str | None]:
+        """按块读取最多 `limit` 字节的响应体（0 表示不限制）；返回 (是否因超过上限而截断, 扫描命中的文本)。
+
+        读取结果写回 `response._content`，调用方仍按普通响应使用 `content` 与 `text`。
+        传入 `scan` 时每读到一块就在新数据及上一块末尾中查找，命中后停止读取。
+        提前停止时由 `_release_early` 决定读完剩余的少量正文以复用连接，还是直接关闭连接。
+        """
+        chunks: list[bytes] = []
+        size = 0
+        truncated = False
+        match = "" if scan else None
+        tail = b""
+        try:
+            chunk_size = min(DOWNLOAD_CHUNK_SIZE, limit) if limit else DOWNLOAD_CHUNK_SIZE
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                chunks.append(chunk)
+                size += len(chunk)
+                if scan:
+                    window = tail + chunk
+                    match = scan.search(window)
+                    if match:
+                        break
+                    tail = window[-max(0, scan.max_match_bytes - 1):] if scan.max_match_bytes > 1 else b""
+                if limit and size > limit:
+                    truncated = True
+                    break
+        finally:
+            if truncated or match:
+                WebFetchClient._release_early(response)
+        content = b"".join(chunks)
+        response._content = content[:limit] if limit else content
+        response._content_consumed = True
+        return truncated, match
+
+    @staticmethod
+    def _release_early(response: requests.Response) -> None:
+        """提前停止读取后释放连接。
+
+        按 `Content-Length` 与已从连接读取的字节数计算剩余正文，不超过 `DRAIN_REMAINDER_BYTES` 时读完丢弃，
+        连接放回连接池；分块传输或剩余较多时关闭连接，以一次新建连接换取不下载剩余内容。
+        """
+        try:
+            remaining = int(response.headers.get("Content-Length", "")) - response.raw.tell()
+            if 0 <= remaining <= DRAIN_REMAINDER_BYTES:
+                for _ in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    pass
+                return
+        except Exception:
+            pass
+        response.close()
+
+    @staticmethod
+    def _discard_body(response: requests.Response) -> None:
+        """探测请求不需要正文。
+
+        HEAD 与命中 Range 的 206 响应正文为空或只有几个字节，读完后连接可以放回连接池；
+        其他响应直接关闭，正文不再下载。
+        """
+        if (response.request is not None and response.request.method == "HEAD") or response.status_code == 206:
+            response.content
+            return
+        response.close()
+        response._content = b""
+        response._content_consumed = True
 
     def _build_proxy_url(self, url: str) -> str:
         proxy_url = self.proxy_settings.proxy_url
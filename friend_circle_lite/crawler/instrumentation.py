@@ -0,0 +1,61 @@
+"""单次运行的请求计时汇总。
+
+每次解析或探测调用都会返回自己的 `RequestTiming`，并按阶段登记到 `RunInstrumentation`。
+计时归属于发起请求的调用本身，不再依赖被并发线程覆盖的实例属性，
+运行结束时按阶段输出汇总日志。
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import defaultdict
+
+from friend_circle_lite.domain.models import RequestTiming
+
+
+STAGE_DISCOVER = "discover"
+STAGE_PARSE = "parse"
+
+
+def _percentile(values: list[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * ratio) - 1)]
+
+
+class RunInstrumentation:
+    """线程安全地收集本次运行各阶段的请求计时。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: dict[str, list[RequestTiming]] = defaultdict(list)
+
+    def record(self, stage: str, timing: RequestTiming) -> None:
+        with self._lock:
+            self._timings[stage].append(timing)
+
+    def timings(self, stage: str | None = None) -> list[RequestTiming]:
+        with self._lock:
+            if stage is not None:
+                return list(self._timings.get(stage, ()))
+            return [timing for items in self._timings.values() for timing in items]
+
+    def log_summary(self) -> None:
+        with self._lock:
+            stages = {stage: list(items) for stage, items in self._timings.items()}
+        for stage, items in sorted(stages.items()):
+            fetched = [timing for timing in items if not timing.from_memo and timing.latency > 0]
+            memo_hits = len(items) - len(fetched)
+            if not fetched:
+                if memo_hits:
+                    logging.info(f"[运行计时] {stage}: 复用 {memo_hits} 次，无网络请求")
+                continue
+            latencies = [timing.latency for timing in fetched]
+            parse_seconds = sum(timing.parse for timing in fetched if timing.parse > 0)
+            total_bytes = sum(timing.bytes for timing in fetched)
+            logging.info(
+                f"[运行计时] {stage}: 请求 {len(fetched)} 次，复用 {memo_hits} 次，"
+                f"延迟 p50 {_percentile(latencies, 0.5):.2f} 秒 / p95 {_percentile(latencies, 0.95):.2f} 秒，"
+                f"下载 {total_bytes / 1024:.1f} KB，解析耗时 {parse_seconds:.2f} 秒"
+            )
@@ -0,0 +1,116 @@
+"""按站点发文频率安排 RSS 抓取。
+
+每次抓取成功后，根据订阅源最近几篇文章的发布间隔、距最近一篇文章的时间，
+以及本次内容是否发生变化，计算该订阅源下次需要抓取的时间：
+
+- 抓取间隔取 “发文间隔中位数” 与 “距最近一篇文章的时间” 中的较大者乘以 `INTERVAL_RATIO`；
+- 本次抓取发现内容变化时间隔减半，活跃站点能更快看到新文章；
+- 结果限制在 `min_interval_hours` 与 `max_interval_hours` 之间。
+
+未到期的订阅源本次不发起请求，直接复用 `feed_state` 中保存的文章。
+没有抓取计划或没有保存文章的订阅源始终视为到期。
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import threading
+from datetime import datetime, timedelta
+
+from friend_circle_lite.config.models import SpiderSettings
+from friend_circle_lite.domain.models import Article, FeedState
+from friend_circle_lite.storage.sqlite_store import CrawlScheduleStore, FeedStateStore
+from friend_circle_lite.utils.time import OUTPUT_FORMAT, SHANGHAI_TZ
+
+
+SCHEDULE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+RECENT_POSTS = 5
+INTERVAL_RATIO = 0.25
+
+
+class CrawlScheduler:
+    """决定订阅源本次是否需要抓取，并记录抓取后的下次到期时间。"""
+
+    def __init__(
+        self,
+        settings: SpiderSettings | None = None,
+        store: CrawlScheduleStore | None = None,
+        state_store: FeedStateStore | None = None,
+    ):
+        self.settings = settings or SpiderSettings()
+        self.store = store
+        self.state_store = state_store
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._due_times: dict[str, str] = store.load_due_times() if store and self.enabled else {}
+        self._plans: dict[str, tuple[float, str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.adaptive_schedule and self.state_store is not None
+
+    def stored_articles(self, feed_url: str, count: int) -> list[Article] | None:
+        """未到抓取时间时返回上次保存的文章；需要抓取时返回 None。"""
+        if not self.enabled:
+            return None
+        due_at = self._due_times.get(feed_url)
+        if not due_at or due_at <= self.started_at.strftime(SCHEDULE_TIME_FORMAT):
+            return None
+        state = self.state_store.load(feed_url)
+        if state is None or not state.articles or not state.covers(count):
+            return None
+        return state.articles[:count]
+
+    def plan(self, feed_url: str) -> None:
+        """按本次抓取后保存的订阅源状态安排下次抓取时间。"""
+        if not self.enabled:
+            return
+        state = self.state_store.load(feed_url)
+        if state is None or not state.articles:
+            return
+        hours = self.interval_hours(state)
+        next_due_at = (self.started_at + timedelta(hours=hours)).strftime(SCHEDULE_TIME_FORMAT)
+        with self._lock:
+            self._plans[feed_url] = (round(hours, 2), next_due_at)
+
+    def defer(self, feed_url: str, count: int) -> list[Article]:
+        """记录订阅源因运行预算推迟到下次运行，并返回上次保存的文章。"""
+        state = self.state_store.load(feed_url) if self.state_store is not None else None
+        if self.enabled:
+            hours = self.interval_hours(state) if state is not None and state.articles else self.settings.min_interval_hours
+            # 下次到期时间取本次运行开始时间，下次运行时一定会重新抓取。
+            with self._lock:
+                self._plans[feed_url] = (round(hours, 2), self.started_at.strftime(SCHEDULE_TIME_FORMAT))
+        if state is None or not state.articles:
+            return []
+        return state.articles[:count]
+
+    def interval_hours(self, state: FeedState) -> float:
+        now = datetime.now(SHANGHAI_TZ).replace(tzinfo=None)
+        published = sorted(
+            (
+                datetime.strptime(article.published, OUTPUT_FORMAT)
+                for article in state.articles[:RECENT_POSTS]
+                if article.published
+            ),
+            reverse=True,
+        )
+        if published:
+            idle = max(0.0, (now - published[0]).total_seconds() / 3600)
+            gaps = [(newer - older).total_seconds() / 3600 for newer, older in zip(published, published[1:])]
+            cadence = statistics.median(gaps) if gaps else idle
+            hours = max(cadence, idle) * INTERVAL_RATIO
+        else:
+            hours = self.settings.max_interval_hours
+        if state.changed_at and state.changed_at >= self.started_at.strftime(SCHEDULE_TIME_FORMAT):
+            hours /= 2
+        return min(max(hours, self.settings.min_interval_hours), self.settings.max_interval_hours)
+
+    def flush(self) -> None:
+        """把本次运行安排的抓取时间写回存储。"""
+        with self._lock:
+            plans, self._plans = self._plans, {}
+        if self.store is not None and plans:
+            self.store.save_plans(plans)
+            logging.info(f"[抓取调度] 已更新 {len(plans)} 个订阅源的下次抓取时间")
@@ -7,19 +7,42 @@ formatting.
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import requests
 
 from friend_circle_lite import HEADERS_JSON, timeout
-from friend_circle_lite.config.models import LinkCheckConfig, ProxySettings
-from friend_circle_lite.crawler.feed_service import FeedDiscoveryService, FeedParserService
+from friend_circle_lite.config.models import LinkCheckConfig, ProxySettings, RequestSettings, ShardSettings, SpiderSettings
+from friend_circle_lite.crawler.budget import RunBudget, crawl_priority
+from friend_circle_lite.crawler.engine import ThreadCrawlEngine, host_key
+from friend_circle_lite.crawler.http_client import AdaptiveTimeoutPolicy, RetryPolicy, RouteMemory, build_hedge_executor
+from friend_circle_lite.crawler.instrumentation import RunInstrumentation
+from friend_circle_lite.crawler.schedule import CrawlScheduler
+from friend_circle_lite.crawler.sharding import select_shard
+from friend_circle_lite.crawler.transport import HttpTransport
+from friend_circle_lite.crawler.feed_service import FeedDiscoveryService, FeedParseMemo, FeedParserService
 from friend_circle_lite.domain.models import Article, CacheRecord, CacheUpdate, CrawlResult, CrawlStatistics, FeedEndpoint, LinkCheckRecord, Website
-from friend_circle_lite.link_checker.service import LinkReachabilityService
-from friend_circle_lite.storage.sqlite_store import FeedCacheStore, LinkCheckStore
+from friend_circle_lite.link_checker.service import HomepageProbeMemory, LinkReachabilityService
+from friend_circle_lite.storage.sqlite_store import (
+    CrawlCheckpointStore,
+    CrawlScheduleStore,
+    FeedCacheStore,
+    FeedProbeStore,
+    FeedStateStore,
+    HomepageProbeStore,
+    LinkCheckStore,
+    RequestLatencyStore,
+    RequestRouteStore,
+)
+from friend_circle_lite.utils.url import replace_non_domain
 
 
 class FeedResolver:
@@ -99,6 +122,177 @@ class SingleSiteCrawler:
             logging.info(f"[RSS 抓取] {website.name} 发布了新文章：{article.title}，时间：{article.published}，链接：{article.link}")
         return articles
 
+    def reuse(self, website: Website, record: CacheRecord, articles: list[Article]) -> CrawlResult:
+        """Build a result from articles stored by an earlier run without requesting the feed."""
+        return CrawlResult(
+            website=website,
+            status="active",
+            articles=[
+                replace(
+                    article,
+                    author=website.name,
+                    avatar=website.avatar,
+                    link=replace_non_domain(article.link, website.url),
+                )
+                for article in articles
+            ],
+            feed_url=record.url,
+            feed_type="specific",
+            source_used=record.source,
+        )
+
+
+class CrawlPipeline:
+    """Submit crawl tasks as soon as each website's link-check record allows it.
+
+    Link checking and crawling share one engine, so a site whose check has
+    finished is crawled while slower checks are still running. With a
+    scheduler, sites whose feed is not due yet reuse their stored articles
+    instead of being submitted. With a checkpoint store, every finished crawl
+    is committed immediately, and sites in `resumed` (finished by an earlier,
+    interrupted run) are not crawled again.
+
+    Sites waiting for a free engine slot are kept in a priority queue ordered
+    by `crawl_priority`. With a run budget, sites still queued once the budget
+    is spent are deferred to the next run instead of being submitted.
+    """
+
+    def __init__(
+        self,
+        engine,
+        crawler: SingleSiteCrawler,
+        resolver: FeedResolver,
+        count: int,
+        manual_names: set[str],
+        scheduler: CrawlScheduler | None = None,
+        checkpoint: CrawlCheckpointStore | None = None,
+        resumed: dict[str, CrawlResult] | None = None,
+        budget: RunBudget | None = None,
+    ):
+        self.engine = engine
+        self.crawler = crawler
+        self.resolver = resolver
+        self.count = count
+        self.manual_names = manual_names
+        self.scheduler = scheduler
+        self.checkpoint = checkpoint
+        self.resumed = resumed or {}
+        self.budget = budget
+        # 0 表示引擎没有声明并发上限，站点直接提交给引擎。
+        self.capacity = getattr(engine, "capacity", 0)
+        self.future_to_website: dict[Future, Website] = {}
+        self.reused_results: list[CrawlResult] = []
+        self.deferred_results: list[CrawlResult] = []
+        self._dispatched: set[str] = set()
+        self._queue: list[tuple[tuple, int, Website]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def on_link_record(
+        self,
+        website: Website,
+        record: LinkCheckRecord,
+        feed_updates: dict[str, CacheRecord | None] | None = None,
+    ) -> None:
+        """Apply the feed found or dropped by link checking, then crawl the site if allowed."""
+        if feed_updates and website.name in feed_updates and website.name not in self.manual_names:
+            update = feed_updates[website.name]
+            if update is None:
+                self.resolver.feed_lookup.pop(website.name, None)
+            else:
+                self.resolver.feed_lookup[website.name] = update
+        if record.crawl_allowed and website.name in self.resolver.feed_lookup:
+            self.dispatch(website, record)
+
+    def dispatch(self, website: Website, link_record: LinkCheckRecord | None = None) -> None:
+        with self._lock:
+            if website.url in self._dispatched:
+                return
+            self._dispatched.add(website.url)
+        finished = self.resumed.get(website.url)
+        if finished is not None:
+            logging.info(f"[抓取断点] {website.name} 已在上次中断的运行中完成抓取，直接复用结果")
+            self.reused_results.append(replace(finished, website=website))
+            return
+        record = self.resolver.feed_lookup.get(website.name)
+        if self.scheduler is not None and record is not None:
+            stored = self.scheduler.stored_articles(record.url, self.count)
+            if stored is not None:
+                logging.info(f"[抓取调度] {website.name} 未到抓取时间，复用上次抓取的 {len(stored)} 篇文章")
+                self.reused_results.append(self.crawler.reuse(website, record, stored))
+                return
+        with self._lock:
+            heapq.heappush(self._queue, (crawl_priority(link_record), next(self._sequence), website))
+        self._drain()
+
+    def _drain(self) -> None:
+        """Submit queued sites while engine slots are free; defer them once the budget is spent."""
+        while True:
+            with self._changed:
+                if not self._queue:
+                    return
+                exhausted = self.budget is not None and self.budget.exhausted()
+                if not exhausted and self.capacity and self._in_flight >= self.capacity:
+                    return
+                _, _, website = heapq.heappop(self._queue)
+                allowed = self.budget is None or self.budget.try_acquire()
+                if allowed:
+                    self._in_flight += 1
+                self._changed.notify_all()
+            if not allowed:
+                self._defer(website)
+                continue
+            future = self.engine.submit(self._crawl, website, host=host_key(website.url))
+            with self._lock:
+                self.future_to_website[future] = website
+            future.add_done_callback(self._on_done)
+
+    def _on_done(self, _future: Future) -> None:
+        with self._changed:
+            self._in_flight -= 1
+            self._changed.notify_all()
+        self._drain()
+
+    def _defer(self, website: Website) -> None:
+        record = self.resolver.feed_lookup.get(website.name)
+        stored = self.scheduler.defer(record.url, self.count) if self.scheduler is not None and record is not None else []
+        if stored:
+            result = self.crawler.reuse(website, record, stored)
+        else:
+            result = CrawlResult(website=website, status="deferred")
+        logging.info(f"[运行预算] {website.name} 超出本次运行预算，推迟到下次运行，复用上次保存的 {len(stored)} 篇文章")
+        with self._lock:
+            self.deferred_results.append(result)
+
+    def _crawl(self, website: Website) -> CrawlResult:
+        result = self.crawler.crawl(website, self.count)
+        if result.status == "active":
+            if self.checkpoint is not None:
+                self.checkpoint.save_result(result)
+            if self.scheduler is not None and result.feed_url:
+                self.scheduler.plan(result.feed_url)
+        return result
+
+    def collect(self) -> list[CrawlResult]:
+        while True:
+            with self._changed:
+                if not self._queue and not self._in_flight:
+                    break
+                # 到达截止时间时醒来，把仍在排队的站点推迟到下次运行。
+                self._changed.wait(timeout=self.budget.remaining() if self.budget else None)
+            self._drain()
+
+        crawl_results: list[CrawlResult] = list(self.reused_results) + list(self.deferred_results)
+        for future, website in self.future_to_website.items():
+            try:
+                crawl_results.append(future.result())
+            except Exception as exc:
+                logging.error(f"[朋友圈抓取] 处理 {website.to_error_payload()} 时发生错误: {exc}", exc_info=True)
+                crawl_results.append(CrawlResult(website=website, status="error"))
+        return crawl_results
+
 
 class FriendCircleCrawlService:
     """System-level orchestrator for crawling all configured websites."""
@@ -111,6 +305,9 @@ class FriendCircleCrawlService:
         cache_file: str | None = None,
         link_check_config: LinkCheckConfig | None = None,
         proxy_settings: ProxySettings | None = None,
+        spider_settings: SpiderSettings | None = None,
+        request_settings: RequestSettings | None = None,
+        shard_settings: ShardSettings | None = None,
     ):
         self.json_url = json_url
         self.count = count
@@ -118,62 +315,140 @@ class FriendCircleCrawlService:
         self.cache_store = FeedCacheStore(cache_file)
         self.link_check_config = link_check_config or LinkCheckConfig()
         self.proxy_settings = proxy_settings or ProxySettings()
+        self.spider_settings = spider_settings or SpiderSettings()
+        self.request_settings = request_settings or RequestSettings()
+        self.shard_settings = shard_settings or ShardSettings()
         self.link_check_store = LinkCheckStore(cache_file)
+        self.feed_state_store = FeedStateStore(cache_file)
+        self.feed_probe_store = FeedProbeStore(cache_file)
+        self.latency_store = RequestLatencyStore(cache_file, max_samples=self.request_settings.latency_samples)
+        self.route_store = RequestRouteStore(cache_file)
+        self.schedule_store = CrawlScheduleStore(cache_file)
+        self.checkpoint_store = CrawlCheckpointStore(cache_file)
+        self.homepage_probe_store = HomepageProbeStore(cache_file)
+        # 友链检测与抓取共用传输层的会话，连接池与按主机并发上限对两个阶段同样生效。
+        self.session: requests.Session | None = None
+        self.discovery_service: FeedDiscoveryService | None = None
+        self.parser_service: FeedParserService | None = None
+        self.pipeline: CrawlPipeline | None = None
+        # 本次运行的 RSS 缓存，友链检测每保存一条变化同步更新一次，运行结束时整体写回。
+        self.cache_map: dict[str, CacheRecord] = {}
+        self.timeout_policy: AdaptiveTimeoutPolicy | None = None
+        self.route_memory: RouteMemory | None = None
+        self.retry_policy: RetryPolicy | None = None
+        self.probe_memory: HomepageProbeMemory | None = None
+        self.hedge_executor: ThreadPoolExecutor | None = None
+        self.instrumentation: RunInstrumentation | None = None
+        self.scheduler: CrawlScheduler | None = None
 
     def run(self) -> tuple[dict, list[list[str]]] | None:
         """Fetch website list, crawl all websites, and build public outputs."""
-        session = requests.Session()
+        # 运行预算从运行开始计时，友链检测耗时也计入其中。
+        budget = RunBudget(self.spider_settings.run_budget_minutes * 60, self.spider_settings.max_crawl_requests)
+        transport = HttpTransport(self.request_settings)
+        session = self.session = transport.session
         websites = self._load_websites(session)
         if websites is None:
             return None
+        websites = select_shard(websites, self.shard_settings.index, self.shard_settings.count)
 
         cache_records = self.cache_store.load_records()
+        self.cache_map = {record.name: record for record in cache_records}
         manual_records = self._build_manual_records()
         merged_records = self._merge_feed_records(cache_records, manual_records)
         manual_names = {record.name for record in manual_records}
 
-        link_check_records = self._check_links(websites, merged_records, manual_names)
-        link_check_map = {record.url: record for record in link_check_records}
-
-        cache_records = self.cache_store.load_records()
-        merged_records = self._merge_feed_records(cache_records, manual_records)
-        feed_names = {record.name for record in merged_records}
-        crawlable_websites = [
-            website for website in websites
-            if link_check_map.get(website.url, LinkCheckRecord.unchecked(website)).crawl_allowed
-            and website.name in feed_names
-        ]
-        skipped_count = len(websites) - len(crawlable_websites)
-        logging.info(
-            f"[朋友圈抓取] 友链总数 {len(websites)} 个，可进入 RSS 抓取 {len(crawlable_websites)} 个，"
-            f"跳过 {skipped_count} 个不可抓取或无 RSS 缓存站点"
+        # 所有请求共用一份按主机的延迟历史，用于计算自适应超时。
+        self.timeout_policy = AdaptiveTimeoutPolicy(self.request_settings, self.latency_store)
+        self.route_memory = RouteMemory(self.route_store) if self.proxy_settings.proxy_url else None
+        self.retry_policy = RetryPolicy(self.request_settings)
+        self.probe_memory = HomepageProbeMemory(self.homepage_probe_store)
+        self.instrumentation = RunInstrumentation()
+        # 对冲请求线程池按本次运行的并发数创建，运行结束时关闭。
+        shared_workers = max(self.link_check_config.max_workers, self.spider_settings.max_workers)
+        self.hedge_executor = build_hedge_executor(self.proxy_settings, shared_workers)
+        # 友链检测与文章抓取共用同一个解析器，检测阶段已下载的 RSS 在抓取阶段直接复用。
+        self.discovery_service = FeedDiscoveryService(
+            session,
+            self.proxy_settings,
+            probe_store=self.feed_probe_store,
+            # 所有站点的路径探测共用一个线程池，线程数与调度引擎相同，而不是每个站点各开一组线程。
+            max_probe_workers=shared_workers,
+            timeout_policy=self.timeout_policy,
+            route_memory=self.route_memory,
+            instrumentation=self.instrumentation,
+            max_response_bytes=self.request_settings.max_response_bytes,
+            retry_policy=self.retry_policy,
+            hedge_executor=self.hedge_executor,
         )
+        self.parser_service = FeedParserService(
+            session,
+            self.proxy_settings,
+            state_store=self.feed_state_store,
+            memo=FeedParseMemo(),
+            min_count=self.count,
+            stream_parse=self.spider_settings.stream_parse,
+            parse_workers=self.spider_settings.parse_workers,
+            timeout_policy=self.timeout_policy,
+            route_memory=self.route_memory,
+            instrumentation=self.instrumentation,
+            max_response_bytes=self.request_settings.max_response_bytes,
+            retry_policy=self.retry_policy,
+            hedge_executor=self.hedge_executor,
+        )
+        resolver = FeedResolver(discovery_service=self.discovery_service, configured_feeds=merged_records)
+        crawler = SingleSiteCrawler(parser_service=self.parser_service, resolver=resolver)
+        self.scheduler = CrawlScheduler(self.spider_settings, self.schedule_store, self.feed_state_store)
 
-        discovery_service = FeedDiscoveryService(session, self.proxy_settings)
-        parser_service = FeedParserService(session, self.proxy_settings)
-        resolver = FeedResolver(discovery_service=discovery_service, configured_feeds=merged_records)
-        crawler = SingleSiteCrawler(parser_service=parser_service, resolver=resolver)
-
-        crawl_results: list[CrawlResult] = []
-        logging.info(f"[朋友圈抓取] 开始抓取 {len(crawlable_websites)} 个可抓取站点，每站最多 {self.count} 篇文章")
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_website = {
-                executor.submit(crawler.crawl, website, self.count): website
-                for website in crawlable_websites
-            }
-            for future in as_completed(future_to_website):
-                website = future_to_website[future]
-                try:
-                    crawl_results.append(future.result())
-                except Exception as exc:
-                    logging.error(f"[朋友圈抓取] 处理 {website.to_error_payload()} 时发生错误: {exc}", exc_info=True)
-                    crawl_results.append(CrawlResult(website=website, status="error"))
+        # 友链检测与文章抓取共用同一个调度引擎：站点检测结果允许抓取后立即进入抓取阶段，
+        # 不再等待全部友链检测完成。
+        try:
+            with self._build_engine(shared_workers) as engine:
+                checkpoint, resumed = self._load_checkpoints()
+                self.pipeline = CrawlPipeline(
+                    engine, crawler, resolver, self.count, manual_names, self.scheduler, checkpoint, resumed,
+                    budget=budget if budget.enabled else None,
+                )
+                link_check_records = self._check_links(websites, merged_records, manual_names)
+                link_check_map = {record.url: record for record in link_check_records}
+
+                # 检测阶段的 RSS 变化已逐站写入 cache_map 与解析器，不再重新读库或替换解析器，
+                # 已提交的抓取任务始终读到同一份映射。
+                cache_records = list(self.cache_map.values())
+                crawlable_websites = [
+                    website for website in websites
+                    if link_check_map.get(website.url, LinkCheckRecord.unchecked(website)).crawl_allowed
+                    and website.name in resolver.feed_lookup
+                ]
+                skipped_count = len(websites) - len(crawlable_websites)
+                logging.info(
+                    f"[朋友圈抓取] 友链总数 {len(websites)} 个，可进入 RSS 抓取 {len(crawlable_websites)} 个，"
+                    f"跳过 {skipped_count} 个不可抓取或无 RSS 缓存站点"
+                )
+                # 检测阶段已提交的站点不会重复提交，这里补齐未通过回调进入抓取的站点。
+                for website in crawlable_websites:
+                    self.pipeline.dispatch(website, link_check_map.get(website.url))
+                logging.info(f"[朋友圈抓取] 等待 {len(crawlable_websites)} 个可抓取站点完成抓取，每站最多 {self.count} 篇文章")
+                crawl_results = self.pipeline.collect()
+                if self.pipeline.reused_results:
+                    logging.info(f"[朋友圈抓取] {len(self.pipeline.reused_results)} 个站点未到抓取时间或已在中断的运行中完成，已复用保存的文章")
+                if self.pipeline.deferred_results:
+                    logging.warning(
+                        f"[运行预算] 本次运行预算已用尽，{len(self.pipeline.deferred_results)} 个站点推迟到下次运行："
+                        f"{'、'.join(result.website.name for result in self.pipeline.deferred_results)}"
+                    )
+        finally:
+            # 抓取中途出错时也要写回调度、延迟与线路等状态，并关闭解析进程池与对冲线程池。
+            self._finish_run(transport)
 
         self._apply_cache_updates(cache_records, crawl_results, manual_names)
+        if checkpoint is not None:
+            # 运行正常结束后清空断点，之后的运行（包括手动触发）重新抓取全部站点。
+            checkpoint.clear()
 
         active_results = [result for result in crawl_results if result.status == "active"]
         unreachable_results = [record for record in link_check_records if not record.reachable]
-        crawl_error_results = [result.website.to_error_payload() for result in crawl_results if result.status != "active"]
+        crawl_error_results = [result.website.to_error_payload() for result in crawl_results if result.status not in ("active", "deferred")]
         error_results = [[record.name, record.url, record.avatar] for record in unreachable_results]
         all_articles = [article.to_public_dict() for result in active_results for article in result.articles]
 
@@ -195,36 +470,90 @@ class FriendCircleCrawlService:
         )
         return result, error_results, link_payload
 
+    def _load_checkpoints(self) -> tuple[CrawlCheckpointStore | None, dict[str, CrawlResult]]:
+        """Return the checkpoint store and results finished within the resume window."""
+        window = self.spider_settings.resume_window_minutes
+        if window <= 0:
+            return None, {}
+        since = (datetime.now() - timedelta(minutes=window)).strftime("%Y-%m-%d %H:%M:%S")
+        self.checkpoint_store.prune(since)
+        resumed = self.checkpoint_store.load_results(since)
+        if resumed:
+            logging.info(f"[抓取断点] 发现 {len(resumed)} 个站点在 {window} 分钟内已完成抓取，本次直接复用")
+        return self.checkpoint_store, resumed
+
+    def _finish_run(self, transport: HttpTransport) -> None:
+        """释放本次运行的线程池与进程池，写回运行中积累的状态并输出统计。"""
+        self.pipeline = None
+        if self.hedge_executor is not None:
+            # 等待落后的对冲请求结束，它们记录的延迟与线路在下面一并写回。
+            self.hedge_executor.shutdown(wait=True, cancel_futures=True)
+            self.hedge_executor = None
+        self.scheduler.flush()
+        self.discovery_service.close()
+        self.parser_service.close()
+        self.timeout_policy.flush()
+        if self.route_memory:
+            self.route_memory.flush()
+        self.probe_memory.flush()
+        transport.log_summary()
+        self.retry_policy.log_summary()
+        self.instrumentation.log_summary()
+
     def _check_links(self, websites: list[Website], feed_records: list[CacheRecord], manual_names: set[str]) -> list[LinkCheckRecord]:
-        service = LinkReachabilityService(
-            config=self.link_check_config,
-            proxy_settings=self.proxy_settings,
-            store=self.link_check_store,
-            feed_records=feed_records,
-        )
-        records = service.check_websites(websites)
-        if service.feed_updates:
-            self._apply_feed_updates_from_link_check(service.feed_updates, manual_names)
+        pipeline = self.pipeline
+        engine_context = nullcontext(pipeline.engine) if pipeline else self._build_engine(self.link_check_config.max_workers)
+        with engine_context as engine:
+            service = LinkReachabilityService(
+                config=self.link_check_config,
+                proxy_settings=self.proxy_settings,
+                store=self.link_check_store,
+                feed_records=feed_records,
+                feed_parser=self.parser_service,
+                feed_discovery=self.discovery_service,
+                feed_state_store=self.feed_state_store,
+                engine=engine,
+                timeout_policy=self.timeout_policy,
+                route_memory=self.route_memory,
+                max_response_bytes=self.request_settings.max_response_bytes,
+                retry_policy=self.retry_policy,
+                probe_memory=self.probe_memory,
+                session=self.session,
+                budget=pipeline.budget if pipeline else None,
+                hedge_executor=self.hedge_executor,
+            )
+
+            def on_record(website: Website, record: LinkCheckRecord) -> None:
+                # 每个站点检测完成即保存其 RSS 缓存变化，与分批保存的检测结果保持一致。
+                if website.name in service.feed_updates:
+                    self._apply_feed_updates_from_link_check(
+                        {website.name: service.feed_updates[website.name]}, manual_names
+                    )
+                if pipeline:
+                    pipeline.on_link_record(website, record, service.feed_updates)
+
+            records = service.check_websites(websites, on_record=on_record)
         return records
 
+    def _build_engine(self, max_workers: int) -> ThreadCrawlEngine:
+        """按爬虫配置创建调度引擎，使用调用方给出的线程数。"""
+        return ThreadCrawlEngine(max_workers=max_workers, per_host_limit=self.spider_settings.per_host_limit)
+
     def _apply_feed_updates_from_link_check(self, updates: dict[str, CacheRecord | None], manual_names: set[str]) -> None:
         """保存可达性检测阶段发现或失效的 RSS 缓存。"""
-        cache_map = {record.name: record for record in self.cache_store.load_records()}
-        changed = False
+        updates = {name: record for name, record in updates.items() if name not in manual_names}
+        changed = self.cache_store.apply_updates(updates)
         for name, record in updates.items():
-            if name in manual_names:
-                continue
             if record is None:
-                if name in cache_map:
-                    cache_map.pop(name)
-                    changed = True
-                    logging.info(f"[RSS 缓存] 可达性检测删除失效 RSS 缓存: {name}")
+                self.cache_map.pop(name, None)
+            else:
+                self.cache_map[name] = record
+        for name in sorted(changed):
+            record = updates[name]
+            if record is None:
+                logging.info(f"[RSS 缓存] 可达性检测删除失效 RSS 缓存: {name}")
             else:
-                cache_map[name] = record
-                changed = True
                 logging.info(f"[RSS 缓存] 可达性检测保存 RSS 缓存: {name} -> {record.url}")
-        if changed:
-            self.cache_store.save_records(list(cache_map.values()))
 
     @staticmethod
     def _build_link_statistics(records: list[LinkCheckRecord]) -> dict[str, int | str]:
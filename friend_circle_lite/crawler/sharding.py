@@ -0,0 +1,36 @@
+"""按友链地址把站点分配到多个运行实例。
+
+分片使用最高随机权重哈希（rendezvous hashing）：每个站点对每个分片计算一个权重，
+归属权重最大的分片。同一地址在任何运行实例上都得到相同结果，不依赖友链列表顺序；
+分片数量变化时只有约 1/N 的站点改变归属，各分片的缓存大部分仍然有效。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from friend_circle_lite.domain.models import Website
+from friend_circle_lite.utils.url import normalize_feed_url
+
+
+def _shard_weight(key: str, shard: int) -> int:
+    digest = hashlib.blake2b(f"{shard}:{key}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def shard_of(url: str, count: int) -> int:
+    """返回地址所属的分片序号（0 到 count - 1）。"""
+    if count <= 1:
+        return 0
+    key = normalize_feed_url(url)
+    return max(range(count), key=lambda shard: _shard_weight(key, shard))
+
+
+def select_shard(websites: list[Website], index: int, count: int) -> list[Website]:
+    """保留属于第 index 个分片的站点，顺序与原列表一致。"""
+    if count <= 1:
+        return websites
+    selected = [website for website in websites if shard_of(website.url, count) == index]
+    logging.info(f"[分片抓取] 当前为第 {index + 1}/{count} 个分片，负责 {len(selected)}/{len(websites)} 个友链")
+    return selected
@@ -0,0 +1,119 @@
+"""HTTP 传输层配置。
+
+抓取与友链检测的所有线程共用一个 `requests.Session`。默认的 `HTTPAdapter` 只缓存 10 个主机连接池、
+每个主机 10 个连接，大量友链与代理回退集中在少数主机上时，连接池会被频繁淘汰，
+并出现 “connection pool is full” 丢弃连接。本模块提供：
+
+- 可配置连接池数量与单主机连接数的适配器；
+- 按请求主机的并发上限，避免集中请求同一托管平台或代理服务；
+- 连接复用统计：请求数、新建连接数与连接池溢出丢弃数，运行结束时输出。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from friend_circle_lite.config.models import RequestSettings
+from friend_circle_lite.crawler.engine import host_key
+
+
+@dataclass(slots=True)
+class TransportStats:
+    """连接复用统计。"""
+
+    requests: int = 0
+    new_connections: int = 0
+    discarded_connections: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, requests: int = 0, new_connections: int = 0, discarded_connections: int = 0) -> None:
+        with self._lock:
+            self.requests += requests
+            self.new_connections += new_connections
+            self.discarded_connections += discarded_connections
+
+    @property
+    def reused_connections(self) -> int:
+        return max(0, self.requests - self.new_connections)
+
+
+def _counting_pool_class(base: type[HTTPConnectionPool], stats: TransportStats) -> type[HTTPConnectionPool]:
+    """为连接池类加上新建连接与溢出丢弃计数。"""
+
+    class CountingPool(base):
+        def _new_conn(self):
+            stats.add(new_connections=1)
+            return super()._new_conn()
+
+        def _put_conn(self, conn):
+            # 连接池已满时 urllib3 会关闭并丢弃连接，这里提前计数；并发下为近似值。
+            if conn is not None and self.pool is not None and self.pool.full():
+                stats.add(discarded_connections=1)
+            super()._put_conn(conn)
+
+    CountingPool.__name__ = f"Counting{base.__name__}"
+    return CountingPool
+
+
+class HostLimitedAdapter(HTTPAdapter):
+    """限制单主机并发并统计连接复用的适配器。"""
+
+    def __init__(self, stats: TransportStats, max_per_host: int = 8, **kwargs):
+        self.stats = stats
+        self.max_per_host = max(1, max_per_host)
+        self._host_lock = threading.Lock()
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        # 只覆盖请求发送与响应头读取；stream=True 时响应体在释放信号量后读取。
+        with self._host_semaphore(host_key(request.url)):
+            self.stats.add(requests=1)
+            return super().send(request, **kwargs)
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return semaphore
+
+
+class HttpTransport:
+    """按请求配置创建共享 Session，并汇总连接复用情况。"""
+
+    def __init__(self, settings: RequestSettings | None = None):
+        self.settings = settings or RequestSettings()
+        self.stats = TransportStats()
+        self.session = requests.Session()
+        adapter = HostLimitedAdapter(
+            self.stats,
+            max_per_host=self.settings.max_connections_per_host,
+            pool_connections=self.settings.pool_connections,
+            pool_maxsize=self.settings.pool_maxsize,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def log_summary(self) -> None:
+        stats = self.stats
+        if not stats.requests:
+            return
+        reuse_rate = stats.reused_connections / stats.requests * 100
+        logging.info(
+            f"[连接复用] 共发起请求 {stats.requests} 次，新建连接 {stats.new_connections} 个，"
+            f"复用率 {reuse_rate:.1f}%，连接池溢出丢弃 {stats.discarded_connections} 个"
+        )
@@ -243,6 +243,34 @@ class Article:
         }
 
 
+@dataclass(slots=True)
+class FeedState:
+    """Conditional request validators, body hash and last parsed articles for one feed URL."""
+
+    feed_url: str
+    etag: str = ""
+    last_modified: str = ""
+    article_count: int = 0
+    articles: list[Article] = field(default_factory=list)
+    fetched_at: str = ""
+    # 上次解析的原始响应体摘要，以及内容最近一次发生变化的时间。
+    content_hash: str = ""
+    changed_at: str = ""
+
+    def covers(self, count: int) -> bool:
+        """Whether the stored articles can answer a request for `count` articles."""
+        return self.article_count >= count or len(self.articles) < self.article_count
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the validators to send with a conditional GET."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
 @dataclass(slots=True)
 class FeedEndpoint:
     """Represents a concrete feed endpoint and how it was found."""
@@ -252,6 +280,42 @@ class FeedEndpoint:
     source: str
 
 
+@dataclass(slots=True)
+class RequestTiming:
+    """Timing breakdown of one feed request, owned by the call that made it.
+
+    `ttfb` is the time until response headers were parsed and `download` the
+    remaining transfer time. requests does not expose DNS or connect phases
+    separately, so they are part of `ttfb`. Unknown values stay at -1.
+    """
+
+    url: str
+    latency: float = -1
+    ttfb: float = -1
+    download: float = -1
+    parse: float = -1
+    bytes: int = 0
+    status_code: int | None = None
+    used_proxy: bool = False
+    from_memo: bool = False
+
+
+@dataclass(slots=True)
+class FeedParseResult:
+    """Articles parsed from one feed together with the request timing."""
+
+    articles: list[Article]
+    timing: RequestTiming
+
+
+@dataclass(slots=True)
+class FeedDiscoveryResult:
+    """Discovered feed endpoint and the timings of every request made to find it."""
+
+    endpoint: FeedEndpoint | None
+    timings: list[RequestTiming] = field(default_factory=list)
+
+
 @dataclass(slots=True)
 class CacheRecord:
     """Represents one cached RSS endpoint mapping for a website."""
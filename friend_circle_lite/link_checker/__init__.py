@@ -1,3 +1,4 @@
 """Friend link reachability checks."""
 
 from friend_circle_lite.link_checker.service import LinkReachabilityService
+from friend_circle_lite.link_checker.status_api import StatusApiClient
@@ -10,17 +10,31 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-from urllib.parse import quote, urlparse, urlsplit, urlunsplit
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Callable
+from urllib.parse import urlparse, urlsplit, urlunsplit
 
 import requests
 
 from friend_circle_lite.config.models import LinkCheckConfig, ProxySettings
+from friend_circle_lite.crawler.budget import RunBudget
+from friend_circle_lite.crawler.engine import ThreadCrawlEngine, host_key
 from friend_circle_lite.crawler.feed_service import FeedDiscoveryService, FeedParserService
-from friend_circle_lite.crawler.http_client import WebFetchClient
+from friend_circle_lite.crawler.http_client import (
+    AdaptiveTimeoutPolicy,
+    BodyScan,
+    FetchResult,
+    RetryPolicy,
+    RouteMemory,
+    WebFetchClient,
+)
 from friend_circle_lite.domain.models import (
     Article,
     CacheRecord,
@@ -31,7 +45,9 @@ from friend_circle_lite.domain.models import (
     calculate_elapsed_days,
     normalize_latency,
 )
-from friend_circle_lite.storage.sqlite_store import LinkCheckStore
+from friend_circle_lite.link_checker.status_api import StatusApiClient
+from friend_circle_lite.storage.sqlite_store import FeedStateStore, HomepageProbeStore, LinkCheckStore
+from friend_circle_lite.utils.url import normalize_feed_url
 
 
 LINK_CHECK_HEADERS = {
@@ -52,6 +68,78 @@ RAW_HEADERS = {
     "X-Friend-Circle-Link-Check": "1.0",
 }
 
+# 主页检测只关心状态码，启用下载上限时只读取响应开头部分。
+HOMEPAGE_PEEK_BYTES = 16 * 1024
+
+# 主页轻量探测依次尝试的方式：HEAD、只请求首字节的 Range GET、完整 GET。
+PROBE_HEAD = "head"
+PROBE_RANGE = "range"
+PROBE_GET = "get"
+PROBE_METHODS = (PROBE_HEAD, PROBE_RANGE, PROBE_GET)
+# 只有这些状态码表示服务器不支持该探测方式，才换下一种方式；其他状态码即为主页的检测结果。
+# 部分站点的防火墙会以 400/403 拒绝 HEAD，Range 不被接受时返回 416。
+PROBE_UNSUPPORTED_STATUS = {
+    PROBE_HEAD: frozenset({400, 403, 405, 501}),
+    PROBE_RANGE: frozenset({405, 416, 501}),
+}
+# 记住的探测方式的有效天数；过期后重新从 HEAD 开始尝试，避免一次临时失败让主机永久使用更重的方式。
+PROBE_MEMORY_DAYS = 7
+
+
+def build_backlink_scan(author_url: str) -> BodyScan:
+    """把站点地址的各种写法合并为一个正则，一次扫描即可判断页面是否包含反链。
+
+    较长的写法排在前面，同一位置命中时返回最具体的写法，便于在日志中确认命中的形式。
+    """
+    normalized = author_url if author_url.startswith(("http://", "https://")) else "https://" + author_url
+    variants = {
+        normalized,
+        normalized.replace("https://", "http://"),
+        normalized.replace("https://", "//"),
+        normalized.replace("https://", ""),
+        author_url,
+        "//" + author_url,
+        "https://" + author_url,
+        "http://" + author_url,
+    }
+    encoded = sorted((variant.encode("utf-8") for variant in variants if variant), key=len, reverse=True)
+    return BodyScan(
+        pattern=re.compile(b"|".join(re.escape(variant) for variant in encoded)),
+        max_match_bytes=len(encoded[0]),
+    )
+
+
+class HomepageProbeMemory:
+    """记住每个主机上次主页探测成功的方式，下次从该方式开始尝试；记录超过 `max_age_days` 天后失效。"""
+
+    def __init__(self, store: HomepageProbeStore | None = None, max_age_days: int = PROBE_MEMORY_DAYS):
+        self.store = store
+        self._lock = threading.Lock()
+        since = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+        self._methods: dict[str, str] = store.load_methods(since) if store else {}
+        self._dirty: set[str] = set()
+
+    def methods_for(self, url: str) -> tuple[str, ...]:
+        with self._lock:
+            preferred = self._methods.get(host_key(url), PROBE_HEAD)
+        return PROBE_METHODS[PROBE_METHODS.index(preferred):] if preferred in PROBE_METHODS else PROBE_METHODS
+
+    def remember(self, url: str, method: str) -> None:
+        host = host_key(url)
+        with self._lock:
+            if self._methods.get(host, PROBE_HEAD) == method:
+                return
+            self._methods[host] = method
+            self._dirty.add(host)
+
+    def flush(self) -> None:
+        """把本次运行中发生变化的探测方式写回存储。"""
+        with self._lock:
+            updates = {host: self._methods[host] for host in self._dirty}
+            self._dirty.clear()
+        if self.store is not None and updates:
+            self.store.save_methods(updates)
+
 
 class RetryBackoffPolicy:
     """Compute dynamic recheck windows for long-term failures."""
@@ -67,10 +155,26 @@ class RetryBackoffPolicy:
             return 10 * 24
         return 5 * 24
 
+    @staticmethod
+    def jittered_max_age_hours(url: str, checked_at: str, default_hours: float, jitter: float) -> float:
+        """Shorten the regular recheck window by a fraction of up to `jitter` derived from URL and check time.
+
+        Sites first checked in the same run then expire at different times, and each recheck draws a new
+        offset so a site does not keep the same short window forever.
+        """
+        if jitter <= 0:
+            return default_hours
+        key = f"{normalize_feed_url(url)}|{checked_at}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        fraction = int.from_bytes(digest, "big") / 2**64
+        return default_hours * (1 - jitter * fraction)
+
 
 class LinkReachabilityService:
     """检查友链是否可达，以及是否可参与 RSS 抓取。"""
 
+    SAVE_BATCH_SIZE = 10
+
     def __init__(
         self,
         config: LinkCheckConfig,
@@ -80,6 +184,17 @@ class LinkReachabilityService:
         feed_parser=None,
         feed_discovery=None,
         fetcher: WebFetchClient | None = None,
+        feed_state_store: FeedStateStore | None = None,
+        engine=None,
+        timeout_policy: AdaptiveTimeoutPolicy | None = None,
+        route_memory: RouteMemory | None = None,
+        max_response_bytes: int = 0,
+        retry_policy: RetryPolicy | None = None,
+        probe_memory: HomepageProbeMemory | None = None,
+        status_api: StatusApiClient | None = None,
+        session: requests.Session | None = None,
+        budget: RunBudget | None = None,
+        hedge_executor: ThreadPoolExecutor | None = None,
     ):
         self.config = config
         self.proxy_settings = proxy_settings
@@ -88,10 +203,31 @@ class LinkReachabilityService:
         self.feed_parser = feed_parser
         self.feed_discovery = feed_discovery
         self.fetcher = fetcher
+        self.feed_state_store = feed_state_store
+        self.engine = engine
+        self.timeout_policy = timeout_policy
+        self.route_memory = route_memory
+        self.max_response_bytes = max_response_bytes
+        self.retry_policy = retry_policy
+        self.probe_memory = probe_memory or HomepageProbeMemory()
+        self.status_api = status_api
+        # 由调用方传入时与抓取共用同一个会话与连接池；未传入时每次检测各自创建会话。
+        self.session = session
+        # 运行预算用尽后尚未开始的检测不再发起请求，站点沿用上次的检测结果。
+        self.budget = budget
+        self.hedge_executor = hedge_executor
         self.feed_updates: dict[str, CacheRecord | None] = {}
 
-    def check_websites(self, websites: list[Website]) -> list[LinkCheckRecord]:
-        """检查一组友链，优先复用未过期缓存。"""
+    def check_websites(
+        self,
+        websites: list[Website],
+        on_record: Callable[[Website, LinkCheckRecord], None] | None = None,
+    ) -> list[LinkCheckRecord]:
+        """检查一组友链，优先复用未过期缓存。
+
+        传入 `on_record` 时，每个站点的检测结果一经确定就在调用线程中回调，
+        调用方可以据此立即安排后续抓取，而不必等待全部友链检测完成。
+        """
         cached_records = self.store.load_records([website.url for website in websites])
         records_by_url: dict[str, LinkCheckRecord] = {}
         websites_to_check: list[Website] = []
@@ -103,25 +239,38 @@ class LinkReachabilityService:
                 linkpage_changed = not self._same_linkpage(cached.linkpage, website.linkpage)
                 refreshed = self._refresh_cached_metadata(cached, website)
                 records_by_url[website.url] = refreshed
+                if on_record:
+                    on_record(website, refreshed)
                 if self._should_refresh_backlink(refreshed, website, linkpage_changed):
                     backlink_refresh_records.append((website, refreshed))
             else:
                 websites_to_check.append(website)
 
+        websites_to_check, deferred = self._apply_recheck_limit(websites_to_check, cached_records)
+        for website in deferred:
+            refreshed = self._refresh_cached_metadata(cached_records[website.url], website)
+            records_by_url[website.url] = refreshed
+            if on_record:
+                on_record(website, refreshed)
+
         total_count = len(websites)
         cached_count = total_count - len(websites_to_check)
         logging.info(
             f"[友链检测] 友链总数 {total_count} 个，缓存复用 {cached_count} 个，"
             f"本次实际检测 {len(websites_to_check)} 个，缓存有效期 {self.config.max_age_hours} 小时"
         )
+        if deferred:
+            logging.info(
+                f"[友链检测] 已过期友链超过单次复检上限 {self.config.max_rechecks_per_run} 个，"
+                f"{len(deferred)} 个沿用旧结果，推迟到后续运行"
+            )
 
         if websites_to_check:
             logging.info(
                 f"[友链检测] 开始实际检测 {len(websites_to_check)} 个友链状态，"
                 f"其余 {cached_count} 个复用缓存"
             )
-            checked_records = self._check_fresh_websites(websites_to_check, cached_records)
-            self.store.save_records(checked_records)
+            checked_records = self._check_fresh_websites(websites_to_check, cached_records, on_record)
             for record in checked_records:
                 records_by_url[record.url] = record
         else:
@@ -133,37 +282,138 @@ class LinkReachabilityService:
 
         return [records_by_url.get(website.url) or LinkCheckRecord.unchecked(website) for website in websites]
 
-    def _check_fresh_websites(self, websites: list[Website], cached_records: dict[str, LinkCheckRecord]) -> list[LinkCheckRecord]:
+    def _check_fresh_websites(
+        self,
+        websites: list[Website],
+        cached_records: dict[str, LinkCheckRecord],
+        on_record: Callable[[Website, LinkCheckRecord], None] | None = None,
+    ) -> list[LinkCheckRecord]:
+        """检测一组友链。
+
+        每个站点先在检测引擎中检查 RSS 与主页；主页不可访问时改由状态 API 客户端的线程池兜底，
+        检测线程不等待 API 限速，继续处理其他站点。API 判定可达且需要检测反链时，再回到检测引擎完成。
+
+        运行预算到期时只取消尚未开始的检测并推迟到下次；已在进行的检测等它结束后照常保存，
+        但不再为它们发起状态 API 或反链检测等后续请求，需要后续请求的站点同样推迟。
+        """
         records: list[LinkCheckRecord] = []
-        with requests.Session() as session:
-            self.feed_parser = self.feed_parser or FeedParserService(session, self.proxy_settings)
-            self.feed_discovery = self.feed_discovery or FeedDiscoveryService(session, self.proxy_settings)
-            self.fetcher = self.fetcher or WebFetchClient(session, self.proxy_settings)
-            with ThreadPoolExecutor(max_workers=max(1, self.config.max_workers)) as executor:
-                future_to_website = {
-                    executor.submit(self._check_website, session, website, cached_records.get(website.url)): website
+        # 检测结果分批写入缓存，运行中途被取消时已完成的检测不会丢失，重跑时按缓存复用。
+        unsaved: list[LinkCheckRecord] = []
+        with self._session_context() as session:
+            self.feed_parser = self.feed_parser or FeedParserService(session, self.proxy_settings, state_store=self.feed_state_store)
+            # 未传入时自行创建的订阅源探测服务在检测结束后关闭其探测线程池。
+            discovery_context = nullcontext() if self.feed_discovery else FeedDiscoveryService(session, self.proxy_settings)
+            self.feed_discovery = self.feed_discovery or discovery_context
+            self.fetcher = self.fetcher or self._build_fetcher(session)
+            api_context = nullcontext(self.status_api) if self.status_api else StatusApiClient(session, self.config, headers=RAW_HEADERS)
+            engine_context = nullcontext(self.engine) if self.engine else ThreadCrawlEngine(self.config.max_workers)
+            with discovery_context, api_context as status_api, engine_context as engine:
+                # Future -> (站点, 主页检测结果)；主页检测结果只在等待状态 API 的阶段存在。
+                pending: dict[Future, tuple[Website, LinkMethodStatus | None]] = {
+                    engine.submit(
+                        self._check_website, session, website, cached_records.get(website.url), host=host_key(website.url)
+                    ): (website, None)
                     for website in websites
                 }
-                for future in as_completed(future_to_website):
-                    website = future_to_website[future]
-                    try:
-                        records.append(future.result())
-                    except Exception as exc:
-                        logging.warning(f"[友链检测] 友链 {website.name} 检测失败: {exc}")
-                        records.append(self._build_failed_record(website, cached_records.get(website.url)))
+                deferred: list[Website] = []
+                draining = False
+                while pending:
+                    done, _ = wait(pending, timeout=None if draining else self._budget_timeout(), return_when=FIRST_COMPLETED)
+                    if not done:
+                        # 运行预算到期：未开始的检测直接取消，已在进行的检测继续等待其结果。
+                        draining = True
+                        for future in [future for future in pending if future.cancel()]:
+                            website, _ = pending.pop(future)
+                            deferred.append(website)
+                            self._emit_deferred(website, cached_records.get(website.url), records, on_record)
+                        continue
+                    for future in done:
+                        website, homepage = pending.pop(future)
+                        cached = cached_records.get(website.url)
+                        try:
+                            outcome = future.result()
+                        except Exception as exc:
+                            logging.warning(f"[友链检测] 友链 {website.name} 检测失败: {exc}")
+                            outcome = self._build_failed_record(website, cached)
+                        if homepage is None and isinstance(outcome, LinkMethodStatus) and not draining:
+                            pending[status_api.submit(website.url)] = (website, outcome)
+                            continue
+                        if homepage is not None and isinstance(outcome, LinkMethodStatus):
+                            record = self._compose_non_rss_record(website, cached, homepage, outcome)
+                            if not self._needs_backlink_check(record, website):
+                                outcome = self._complete_record(session, website, record)
+                            elif not draining:
+                                backlink_future = engine.submit(
+                                    self._complete_record, session, website, record, host=host_key(website.url)
+                                )
+                                pending[backlink_future] = (website, None)
+                                continue
+                        if not isinstance(outcome, LinkCheckRecord):
+                            # 预算用尽时未发起请求，或预算到期后仍需后续请求的站点，沿用上次的检测结果。
+                            deferred.append(website)
+                            self._emit_deferred(website, cached, records, on_record)
+                            continue
+                        records.append(outcome)
+                        unsaved.append(outcome)
+                        if len(unsaved) >= self.SAVE_BATCH_SIZE:
+                            self.store.save_records(unsaved)
+                            unsaved = []
+                        if on_record:
+                            on_record(website, outcome)
+                if deferred:
+                    logging.warning(
+                        f"[运行预算] 本次运行预算已用尽，{len(deferred)} 个友链推迟到下次检测，沿用上次的检测结果："
+                        f"{'、'.join(website.name for website in deferred)}"
+                    )
+        if unsaved:
+            self.store.save_records(unsaved)
         return records
 
-    def _check_website(self, session: requests.Session, website: Website, cached: LinkCheckRecord | None) -> LinkCheckRecord:
+    def _session_context(self):
+        return nullcontext(self.session) if self.session is not None else requests.Session()
+
+    def _budget_timeout(self) -> float | None:
+        """距离运行截止时间的秒数；没有时长预算时返回 None（一直等待）。"""
+        if self.budget is None or self.budget.deadline is None:
+            return None
+        return self.budget.remaining() or 0
+
+    def _emit_deferred(
+        self,
+        website: Website,
+        cached: LinkCheckRecord | None,
+        records: list[LinkCheckRecord],
+        on_record: Callable[[Website, LinkCheckRecord], None] | None,
+    ) -> None:
+        """推迟检测的友链沿用缓存记录（没有缓存时为未检测记录），不写回缓存。"""
+        record = self._refresh_cached_metadata(cached, website) if cached else LinkCheckRecord.unchecked(website)
+        records.append(record)
+        if on_record:
+            on_record(website, record)
+
+    def _check_website(
+        self, session: requests.Session, website: Website, cached: LinkCheckRecord | None
+    ) -> LinkCheckRecord | LinkMethodStatus | None:
+        """检测单个友链。
+
+        主页不可访问且配置了状态 API 时返回主页检测结果，由调用方交给状态 API 兜底；
+        运行预算已用尽时不发起请求，返回 None。
+        """
+        if self.budget is not None and self.budget.exhausted():
+            return None
         record = self._check_rss_first(website, cached)
         if record is None:
             homepage = self._request_homepage(website.url)
-            api = LinkMethodStatus()
-            if not homepage.success:
-                api = self._request_api(session, website.url)
-                time.sleep(0.2)
-            record = self._compose_non_rss_record(website, cached, homepage, api)
+            if not homepage.success and self.config.status_api_url:
+                return homepage
+            record = self._compose_non_rss_record(website, cached, homepage, LinkMethodStatus())
+        return self._complete_record(session, website, record)
 
-        if record.reachable and self.config.enable_backlink_check and self.config.author_url and website.linkpage:
+    def _needs_backlink_check(self, record: LinkCheckRecord, website: Website) -> bool:
+        return bool(record.reachable and self.config.enable_backlink_check and self.config.author_url and website.linkpage)
+
+    def _complete_record(self, session: requests.Session, website: Website, record: LinkCheckRecord) -> LinkCheckRecord:
+        if self._needs_backlink_check(record, website):
             record.backlink_checked = True
             record.has_author_link = self._check_author_link_in_page(session, website.linkpage)
         elif not record.reachable:
@@ -175,26 +425,45 @@ class LinkReachabilityService:
         configured = self.feed_lookup.get(website.name)
         if configured:
             endpoint = FeedEndpoint(url=configured.url, feed_type="specific", source=configured.source)
-            latest_article = self._latest_feed_article(endpoint, website)
+            latest_article, latency = self._latest_feed_article(endpoint, website)
             if latest_article:
-                return self._build_feed_record(website, endpoint, self._last_feed_latency(), latest_article)
+                return self._build_feed_record(website, endpoint, self._known_latency(latency, cached), latest_article)
             logging.warning(f"友链 {website.name} 的缓存 RSS 失效: {configured.url} ，开始重新探测")
             if configured.source == "cache":
                 self.feed_updates[website.name] = None
 
         discovered = self.feed_discovery.discover(website.url) if self.feed_discovery else None
-        latest_article = self._latest_feed_article(discovered, website) if discovered else None
+        latest_article, latency = self._latest_feed_article(discovered, website) if discovered else (None, -1)
         if discovered and latest_article:
             self.feed_updates[website.name] = CacheRecord(name=website.name, url=discovered.url, source="cache")
-            return self._build_feed_record(website, discovered, self._last_feed_latency(), latest_article)
+            return self._build_feed_record(website, discovered, self._known_latency(latency, cached), latest_article)
         return None
 
-    def _latest_feed_article(self, endpoint: FeedEndpoint, website: Website) -> Article | None:
-        articles = self.feed_parser.parse(endpoint.url, count=1, blog_url=website.url)
-        return articles[0] if articles else None
-
-    def _last_feed_latency(self) -> float:
-        return normalize_latency(getattr(self.feed_parser, "last_latency", None))
+    @staticmethod
+    def _known_latency(latency: float, cached: LinkCheckRecord | None) -> float:
+        """本次没有实际请求（复用了其他请求的解析结果）时沿用上次测得的延迟，没有则保持未知（-1）。"""
+        if latency >= 0:
+            return latency
+        if cached is not None and cached.best_latency > 0:
+            return cached.best_latency
+        return -1
+
+    def _latest_feed_article(self, endpoint: FeedEndpoint, website: Website) -> tuple[Article | None, float]:
+        """返回最新文章与本次解析请求自身的延迟，避免并发检测时读到其他站点的延迟。
+
+        解析结果来自其他请求的共享或复用时，本次没有实际延迟，返回 -1。
+        """
+        parse_feed = getattr(self.feed_parser, "parse_feed", None)
+        if parse_feed is not None:
+            result = parse_feed(endpoint.url, count=1, blog_url=website.url)
+            if result.timing.from_memo:
+                return (result.articles[0] if result.articles else None), -1
+            articles, latency = result.articles, result.timing.latency
+        else:
+            # 兼容只提供 parse 的解析器实现
+            articles = self.feed_parser.parse(endpoint.url, count=1, blog_url=website.url)
+            latency = getattr(self.feed_parser, "last_latency", None)
+        return (articles[0] if articles else None), normalize_latency(latency)
 
     def _build_feed_record(self, website: Website, endpoint: FeedEndpoint, latency: float, latest_article: Article) -> LinkCheckRecord:
         method = "rss_cache" if endpoint.source == "cache" else "rss"
@@ -228,39 +497,52 @@ class LinkReachabilityService:
         days_ago = max(0, int((datetime.now() - published_at).total_seconds() // 86400))
         return published, days_ago
 
+    def _build_fetcher(self, session: requests.Session) -> WebFetchClient:
+        return WebFetchClient(
+            session,
+            self.proxy_settings,
+            self.timeout_policy,
+            self.route_memory,
+            self.max_response_bytes,
+            self.retry_policy,
+            self.hedge_executor,
+        )
+
     def _request_homepage(self, url: str) -> LinkMethodStatus:
         if not self._is_url(url):
             return LinkMethodStatus()
-        result = self.fetcher.get(url, headers=LINK_CHECK_HEADERS, timeout=self.config.timeout, desc="主页检测")
-        if result.response is None:
-            return LinkMethodStatus(success=False, status_code=None, latency=result.latency)
+        methods = self.probe_memory.methods_for(url) if self.config.homepage_probe else (PROBE_GET,)
+        for method in methods:
+            result = self._probe_homepage(url, method)
+            if result.response is None:
+                # 连接失败与超时换一种请求方式也不会成功，直接判定。
+                return LinkMethodStatus(success=False, status_code=None, latency=result.latency)
+            if result.success:
+                if self.config.homepage_probe:
+                    self.probe_memory.remember(url, method)
+                break
+            if result.response.status_code not in PROBE_UNSUPPORTED_STATUS.get(method, ()):
+                # 404、410、5xx 等明确的状态码换一种请求方式结果相同，不再重复请求。
+                break
         return LinkMethodStatus(success=result.success, status_code=result.response.status_code, latency=result.latency)
 
-    def _request_api(self, session: requests.Session, url: str) -> LinkMethodStatus:
-        if not self.config.status_api_url:
-            return LinkMethodStatus()
-
-        api_url = self.config.status_api_url.format(url=quote(url, safe=""))
-        start_time = time.time()
-        try:
-            response = session.get(api_url, headers=RAW_HEADERS, timeout=30)
-            latency = normalize_latency(time.time() - start_time)
-        except requests.RequestException as exc:
-            logging.warning(f"[API 检查] 请求失败: {url} ，错误: {exc}")
-            return LinkMethodStatus(success=False, status_code=None, latency=normalize_latency(time.time() - start_time))
-
-        try:
-            payload = response.json()
-            status_code = int(payload.get("data", 0))
-            success = int(payload.get("code", 0)) == 200 and status_code == 200
-            if success:
-                logging.info(f"[API 检查] 成功访问: {url} ，状态码 200")
-            else:
-                logging.warning(f"[API 检查] 状态异常: {url} -> [{payload.get('code')}, {payload.get('data')}]")
-            return LinkMethodStatus(success=success, status_code=status_code, latency=latency)
-        except Exception as exc:
-            logging.warning(f"[API 检查] 解析响应失败: {url} ，错误: {exc}")
-            return LinkMethodStatus(success=False, status_code=response.status_code, latency=latency)
+    def _probe_homepage(self, url: str, method: str) -> FetchResult:
+        """按探测方式请求主页；HEAD 与 Range 请求只读取响应头。"""
+        if method == PROBE_HEAD:
+            return self.fetcher.get(
+                url, headers=LINK_CHECK_HEADERS, timeout=self.config.timeout, desc="主页检测 HEAD", probe_method="HEAD"
+            )
+        if method == PROBE_RANGE:
+            return self.fetcher.get(
+                url,
+                headers={**LINK_CHECK_HEADERS, "Range": "bytes=0-0"},
+                timeout=self.config.timeout,
+                desc="主页检测 Range",
+                probe_method="GET",
+            )
+        return self.fetcher.get(
+            url, headers=LINK_CHECK_HEADERS, timeout=self.config.timeout, desc="主页检测", max_bytes=HOMEPAGE_PEEK_BYTES
+        )
 
     def _compose_non_rss_record(
         self,
@@ -302,37 +584,24 @@ class LinkReachabilityService:
         )
 
     def _check_author_link_in_page(self, session: requests.Session, linkpage_url: str) -> bool:
-        fetcher = self.fetcher or WebFetchClient(session, self.proxy_settings)
-        result = fetcher.get(linkpage_url, headers=RAW_HEADERS, timeout=self.config.timeout, desc="友链页面检测")
+        fetcher = self.fetcher or self._build_fetcher(session)
+        scan = self._backlink_scan
+        result = fetcher.get(linkpage_url, headers=RAW_HEADERS, timeout=self.config.timeout, desc="友链页面检测", scan=scan)
         response = result.response
         if response is None:
             return False
 
-        author_url = self.config.author_url
-        if not author_url.startswith(("http://", "https://")):
-            author_url = "https://" + author_url
-
-        variants = {
-            author_url,
-            author_url.replace("https://", "http://"),
-            author_url.replace("https://", "//"),
-            author_url.replace("https://", ""),
-            self.config.author_url,
-            "//" + self.config.author_url,
-            "https://" + self.config.author_url,
-            "http://" + self.config.author_url,
-        }
-        content = response.text
-        for variant in variants:
-            if (
-                f'href="{variant}"' in content
-                or f"href='{variant}'" in content
-                or f'href="{variant}/"' in content
-                or f"href='{variant}/'" in content
-                or variant in content
-            ):
-                return True
-        return False
+        match = result.match
+        if match is None:
+            # 响应未经流式扫描时，一次性在完整内容中查找。
+            match = scan.search(response.content)
+        if match:
+            logging.info(f"[反链检测] {linkpage_url} 包含反链：{match}")
+        return bool(match)
+
+    @cached_property
+    def _backlink_scan(self) -> BodyScan:
+        return build_backlink_scan(self.config.author_url)
 
     def _can_reuse_cached_record(self, cached: LinkCheckRecord, website: Website) -> bool:
         max_age_hours = self._effective_recheck_hours(cached)
@@ -346,6 +615,32 @@ class LinkReachabilityService:
             return False
         return self.store.is_fresh(cached, max_age_hours)
 
+    def _apply_recheck_limit(
+        self,
+        websites: list[Website],
+        cached_records: dict[str, LinkCheckRecord],
+    ) -> tuple[list[Website], list[Website]]:
+        """按 `max_rechecks_per_run` 拆分待检测友链，返回 (本次检测, 推迟复检)。
+
+        只有已有检测结果、仅因缓存过期而需要复检的友链计入上限，最早检测的优先复检；
+        新增友链与缺少抓取信息的友链总是本次检测。
+        """
+        limit = self.config.max_rechecks_per_run
+        rechecks = [website for website in websites if self._can_defer_recheck(cached_records.get(website.url), website)]
+        if not limit or len(rechecks) <= limit:
+            return websites, []
+        rechecks.sort(key=lambda website: cached_records[website.url].checked_at)
+        deferred_urls = {website.url for website in rechecks[limit:]}
+        return (
+            [website for website in websites if website.url not in deferred_urls],
+            [website for website in websites if website.url in deferred_urls],
+        )
+
+    def _can_defer_recheck(self, cached: LinkCheckRecord | None, website: Website) -> bool:
+        if cached is None or not cached.checked_at:
+            return False
+        return not (cached.crawl_allowed and website.name not in self.feed_lookup)
+
     @staticmethod
     def _refresh_cached_metadata(cached: LinkCheckRecord, website: Website) -> LinkCheckRecord:
         cached.name = website.name
@@ -363,8 +658,8 @@ class LinkReachabilityService:
         )
 
     def _refresh_backlinks_only(self, items: list[tuple[Website, LinkCheckRecord]]) -> None:
-        with requests.Session() as session:
-            self.fetcher = self.fetcher or WebFetchClient(session, self.proxy_settings)
+        with self._session_context() as session:
+            self.fetcher = self.fetcher or self._build_fetcher(session)
             for website, record in items:
                 record.backlink_checked = True
                 record.has_author_link = self._check_author_link_in_page(session, website.linkpage)
@@ -393,12 +688,19 @@ class LinkReachabilityService:
             return cached.checked_at
         return checked_at
 
-    def _effective_recheck_hours(self, cached: LinkCheckRecord) -> int:
+    def _effective_recheck_hours(self, cached: LinkCheckRecord) -> float:
         if not cached.reachable:
-            return RetryBackoffPolicy.effective_max_age_hours(cached.unreachable_since, self.config.max_age_hours)
-        if self._is_rss_unavailable_record(cached):
-            return RetryBackoffPolicy.effective_max_age_hours(cached.rss_unavailable_since, self.config.max_age_hours)
-        return self.config.max_age_hours
+            hours = RetryBackoffPolicy.effective_max_age_hours(cached.unreachable_since, self.config.max_age_hours)
+        elif self._is_rss_unavailable_record(cached):
+            hours = RetryBackoffPolicy.effective_max_age_hours(cached.rss_unavailable_since, self.config.max_age_hours)
+        else:
+            hours = self.config.max_age_hours
+        if hours != self.config.max_age_hours:
+            # 长期失败站点的延长间隔从各自的失败时间起算，本身已经错开。
+            return hours
+        return RetryBackoffPolicy.jittered_max_age_hours(
+            cached.url, cached.checked_at, hours, self.config.recheck_jitter
+        )
 
     @staticmethod
     def _is_rss_unavailable_record(record: LinkCheckRecord) -> bool:
@@ -0,0 +1,113 @@
+"""兜底状态码 API 客户端。
+
+主页无法直接访问时，友链检测会通过第三方状态 API 判断站点是否可能可达。
+所有检测共用一个客户端，API 请求在客户端自己的小线程池中执行：
+
+- 线程池大小即同时在途的 API 请求数；
+- 令牌桶限制整次运行对 API 的请求速率，突发请求不超过桶容量；
+- 等待令牌只占用 API 线程，友链检测线程提交请求后即可处理其他站点。
+
+当前使用的状态 API 每次只接受一个地址，不支持批量提交，因此按地址逐个请求。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+
+from friend_circle_lite.config.models import LinkCheckConfig
+from friend_circle_lite.domain.models import LinkMethodStatus, normalize_latency
+
+
+class TokenBucket:
+    """线程安全的令牌桶；`rate` 为每秒补充的令牌数，0 表示不限速。"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = max(0.0, rate)
+        self.capacity = max(1.0, capacity if capacity is not None else self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """取一个令牌，令牌不足时等待补充；返回等待的秒数。"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class StatusApiClient:
+    """限速、限并发的状态 API 客户端；使用完毕后调用 `close` 或作为上下文管理器使用。"""
+
+    def __init__(self, session: requests.Session, config: LinkCheckConfig, headers: dict[str, str] | None = None):
+        self.session = session
+        self.config = config
+        self.headers = headers or {}
+        self.bucket = TokenBucket(config.status_api_rate)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, config.status_api_concurrency), thread_name_prefix="status-api"
+        )
+
+    def __enter__(self) -> "StatusApiClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """等待进行中的请求结束；尚未开始的请求直接取消。"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, url: str) -> Future:
+        """提交一次检查，返回结果为 `LinkMethodStatus` 的 Future。"""
+        if not self.config.status_api_url:
+            future: Future = Future()
+            future.set_result(LinkMethodStatus())
+            return future
+        return self._executor.submit(self._check, url)
+
+    def check(self, url: str) -> LinkMethodStatus:
+        return self.submit(url).result()
+
+    def _check(self, url: str) -> LinkMethodStatus:
+        self.bucket.acquire()
+        return self._request(url)
+
+    def _request(self, url: str) -> LinkMethodStatus:
+        api_url = self.config.status_api_url.format(url=quote(url, safe=""))
+        start_time = time.time()
+        try:
+            response = self.session.get(api_url, headers=self.headers, timeout=self.config.status_api_timeout)
+            latency = normalize_latency(time.time() - start_time)
+        except requests.RequestException as exc:
+            logging.warning(f"[API 检查] 请求失败: {url} ，错误: {exc}")
+            return LinkMethodStatus(success=False, status_code=None, latency=normalize_latency(time.time() - start_time))
+
+        try:
+            payload = response.json()
+            status_code = int(payload.get("data", 0))
+            success = int(payload.get("code", 0)) == 200 and status_code == 200
+            if success:
+                logging.info(f"[API 检查] 成功访问: {url} ，状态码 200")
+            else:
+                logging.warning(f"[API 检查] 状态异常: {url} -> [{payload.get('code')}, {payload.get('data')}]")
+            return LinkMethodStatus(success=success, status_code=status_code, latency=latency)
+        except Exception as exc:
+            logging.warning(f"[API 检查] 解析响应失败: {url} ，错误: {exc}")
+            return LinkMethodStatus(success=False, status_code=response.status_code, latency=latency)
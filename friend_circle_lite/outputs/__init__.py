@@ -1,3 +1,4 @@
 """Output assembly and legacy-compatible JSON helpers."""
 
 from friend_circle_lite.outputs.legacy_api import *  # noqa: F401,F403
+from friend_circle_lite.outputs.shard_merge import *  # noqa: F401,F403
@@ -25,6 +25,9 @@ def fetch_and_process_data(
     cache_file: str = None,
     link_check_config=None,
     proxy_settings=None,
+    spider_settings=None,
+    request_settings=None,
+    shard_settings=None,
 ):
     """Legacy wrapper around the new crawler orchestration service."""
     return FriendCircleCrawlService(
@@ -34,6 +37,9 @@ def fetch_and_process_data(
         cache_file=cache_file,
         link_check_config=link_check_config,
         proxy_settings=proxy_settings,
+        spider_settings=spider_settings,
+        request_settings=request_settings,
+        shard_settings=shard_settings,
     ).run()
 
 def sort_articles_by_time(data, future_tolerance_days=2):
@@ -94,36 +100,50 @@ def merge_link_data_from_json_url(link_data, merge_json_url):
         logging.warning("远程数据不包含可用友链字段，跳过友链数据合并")
         return link_data
 
-    local_links = [_normalize_merge_link(link) for link in _extract_links(link_data)]
-    remote_links = [_normalize_merge_link(link) for link in _extract_links(remote_data)]
+    return merge_link_payloads(link_data, remote_data)
 
-    logging.info(f"开始合并友链数据，本地 {len(local_links)} 条，远程 {len(remote_links)} 条")
 
-    # 按 URL 建立索引
-    link_map = {link["url"]: link for link in local_links}
+def merge_link_payloads(*payloads):
+    """
+    按 URL 合并多份 link.json 内容，单条友链的合并规则见 `_merge_single_link`。
 
-    for remote_link in remote_links:
-        url = remote_link["url"]
-        if url not in link_map:
-            # 新友链，直接添加
-            link_map[url] = remote_link
-        else:
-            # 已存在，智能合并
-            local_link = link_map[url]
-            link_map[url] = _merge_single_link(local_link, remote_link)
+    所有输入先统一为内部结构后一次性合并，避免逐对合并时丢失检测方式等内部字段。
+
+    参数：
+    payloads (dict): 依次合并的友链数据，例如本地输出、远程输出或各分片的输出
+
+    返回：
+    dict: 合并后的友链数据
+    """
+    link_groups = [[_normalize_merge_link(link) for link in _extract_links(payload)] for payload in payloads]
+
+    logging.info(
+        f"开始合并友链数据，共 {len(payloads)} 份，各份分别有 {'、'.join(str(len(links)) for links in link_groups)} 条"
+    )
+
+    # 按 URL 建立索引
+    link_map = {}
+
+    for links in link_groups:
+        for link in links:
+            url = link["url"]
+            if url not in link_map:
+                # 新友链，直接添加
+                link_map[url] = link
+            else:
+                # 已存在，智能合并
+                link_map[url] = _merge_single_link(link_map[url], link)
 
     # 重新计算统计数据
     merged_records = list(link_map.values())
     merged_stats = _recalculate_link_statistics(merged_records)
     merged_links = [_to_public_link(link) for link in merged_records]
     logging.info(f"合并友链数据完成，共有 {len(merged_links)} 条友链")
-    local_stats = _extract_stats(link_data)
-    remote_stats = _extract_stats(remote_data)
     checked_times = [
-        local_stats.get("checked", "") or local_stats.get("link_last_checked_time", ""),
-        remote_stats.get("checked", "") or remote_stats.get("link_last_checked_time", ""),
-        merged_stats.get("link_last_checked_time", ""),
+        _extract_stats(payload).get("checked", "") or _extract_stats(payload).get("link_last_checked_time", "")
+        for payload in payloads
     ]
+    checked_times.append(merged_stats.get("link_last_checked_time", ""))
     merged_stats["link_last_checked_time"] = max([item for item in checked_times if item] or [""])
 
     return {
@@ -0,0 +1,102 @@
+"""合并多个分片运行的输出文件。
+
+每个分片只抓取一部分友链，并各自输出 `all.json`、`errors.json` 与 `link.json`。
+合并步骤读取所有分片的输出目录（本地路径或 HTTP 地址），生成与单实例运行相同结构的结果：
+
+- 文章按链接去重后合并，统计数据中的友链数、成功数与失败数逐分片累加；
+- 不可达友链按地址去重后合并；
+- 友链检测结果按 `merge_link_payloads` 的规则合并。
+
+默认要求所有分片的输出都能读取，任一分片缺失时放弃合并，避免用不完整的结果覆盖已发布的数据；
+开启 `allow_partial` 后才会跳过无法读取的分片，只合并其余分片。
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import requests
+
+from friend_circle_lite import HEADERS_JSON, timeout
+from friend_circle_lite.domain.models import CrawlStatistics
+from friend_circle_lite.outputs.legacy_api import merge_link_payloads
+from friend_circle_lite.utils.json import read_json
+
+
+SHARD_OUTPUT_FILES = ("all.json", "errors.json", "link.json")
+
+
+def load_shard_output(source: str, file_name: str):
+    """读取单个分片输出目录中的 JSON 文件，读取失败时返回 None。"""
+    if source.startswith(("http://", "https://")):
+        url = f"{source.rstrip('/')}/{file_name}"
+        try:
+            response = requests.get(url, headers=HEADERS_JSON, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:
+            logging.warning(f"[分片合并] 无法获取 {url} ：{exc}")
+            return None
+    return read_json(Path(source) / file_name)
+
+
+def _valid_shard_outputs(outputs: list) -> bool:
+    result, lost_friends, link_payload = outputs
+    return isinstance(result, dict) and isinstance(lost_friends, list) and isinstance(link_payload, dict)
+
+
+def merge_shard_outputs(
+    sources: list[str], allow_partial: bool = False
+) -> tuple[dict, list[list[str]], dict] | None:
+    """合并各分片的输出，返回 (all.json, errors.json, link.json) 内容。
+
+    有分片输出不完整时返回 None；`allow_partial` 为真时跳过这些分片，只有全部不可用才返回 None。
+    """
+    shards = []
+    missing = []
+    for source in sources:
+        outputs = [load_shard_output(source, file_name) for file_name in SHARD_OUTPUT_FILES]
+        if not _valid_shard_outputs(outputs):
+            missing.append(source)
+            continue
+        shards.append(outputs)
+    if missing and not allow_partial:
+        logging.error(f"[分片合并] 分片 {', '.join(missing)} 缺少有效的输出文件，放弃合并")
+        return None
+    for source in missing:
+        logging.warning(f"[分片合并] 分片 {source} 缺少有效的输出文件，已跳过")
+    if not shards:
+        logging.error("[分片合并] 没有可用的分片输出，跳过合并")
+        return None
+
+    articles: dict[str, dict] = {}
+    totals = {"friends_num": 0, "active_num": 0, "error_num": 0}
+    updated_times = []
+    errors: dict[str, list[str]] = {}
+    link_payloads = []
+    for result, lost_friends, link_payload in shards:
+        for article in result.get("article_data", []):
+            articles.setdefault(article.get("link", ""), article)
+        stats = result.get("statistical_data", {})
+        for key in totals:
+            totals[key] += int(stats.get(key, 0) or 0)
+        if stats.get("last_updated_time"):
+            updated_times.append(stats["last_updated_time"])
+        for error in lost_friends:
+            errors.setdefault(error[1], error)
+        link_payloads.append(link_payload)
+
+    statistics = CrawlStatistics.create(article_num=len(articles), **totals)
+    stats_payload = statistics.to_dict()
+    stats_payload["last_updated_time"] = max(updated_times, default=stats_payload["last_updated_time"])
+    link_payload = merge_link_payloads(*link_payloads)
+    logging.info(
+        f"[分片合并] 已合并 {len(shards)}/{len(sources)} 个分片：友链 {totals['friends_num']} 个，"
+        f"文章 {len(articles)} 篇，不可达友链 {len(errors)} 个"
+    )
+    return (
+        {"statistical_data": stats_payload, "article_data": list(articles.values())},
+        list(errors.values()),
+        link_payload,
+    )
@@ -1,4 +1,4 @@
 """Persistent stores for feed cache, article tracking, and link checks."""
 
-from friend_circle_lite.storage.sqlite_store import ArticleTrackingStore, FeedCacheStore, LinkCheckStore
+from friend_circle_lite.storage.sqlite_store import ArticleTrackingStore, CrawlCheckpointStore, CrawlScheduleStore, FeedCacheStore, FeedProbeStore, FeedStateStore, HomepageProbeStore, LinkCheckStore, RequestLatencyStore, RequestRouteStore
 from friend_circle_lite.storage.diagnostics import SQLiteDebugDumper
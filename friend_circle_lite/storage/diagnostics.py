@@ -26,6 +26,91 @@ EXPECTED_SCHEMAS: dict[str, tuple[list[str], str]] = {
         )
         """,
     ),
+    "feed_state": (
+        ["feed_url", "etag", "last_modified", "article_count", "articles", "fetched_at", "content_hash", "changed_at"],
+        """
+        CREATE TABLE feed_state (
+            feed_url TEXT PRIMARY KEY,
+            etag TEXT DEFAULT '',
+            last_modified TEXT DEFAULT '',
+            article_count INTEGER NOT NULL DEFAULT 0,
+            articles TEXT NOT NULL DEFAULT '[]',
+            fetched_at TEXT DEFAULT '',
+            content_hash TEXT DEFAULT '',
+            changed_at TEXT DEFAULT ''
+        )
+        """,
+    ),
+    "feed_probe_miss": (
+        ["site_url", "path", "status_code", "checked_at"],
+        """
+        CREATE TABLE feed_probe_miss (
+            site_url TEXT NOT NULL,
+            path TEXT NOT NULL,
+            status_code INTEGER,
+            checked_at TEXT NOT NULL,
+            PRIMARY KEY (site_url, path)
+        )
+        """,
+    ),
+    "request_latency": (
+        ["host", "samples", "updated_at"],
+        """
+        CREATE TABLE request_latency (
+            host TEXT PRIMARY KEY,
+            samples TEXT NOT NULL DEFAULT '[]',
+            updated_at TEXT DEFAULT ''
+        )
+        """,
+    ),
+    "request_route": (
+        ["host", "route", "updated_at"],
+        """
+        CREATE TABLE request_route (
+            host TEXT PRIMARY KEY,
+            route TEXT NOT NULL DEFAULT 'direct',
+            updated_at TEXT DEFAULT ''
+        )
+        """,
+    ),
+    "homepage_probe": (
+        ["host", "method", "updated_at"],
+        """
+        CREATE TABLE homepage_probe (
+            host TEXT PRIMARY KEY,
+            method TEXT NOT NULL DEFAULT 'head',
+            updated_at TEXT DEFAULT ''
+        )
+        """,
+    ),
+    "crawl_schedule": (
+        ["feed_url", "interval_hours", "next_due_at", "updated_at"],
+        """
+        CREATE TABLE crawl_schedule (
+            feed_url TEXT PRIMARY KEY,
+            interval_hours REAL NOT NULL DEFAULT 0,
+            next_due_at TEXT DEFAULT '',
+            updated_at TEXT DEFAULT ''
+        )
+        """,
+    ),
+    "crawl_checkpoint": (
+        ["url", "name", "avatar", "status", "feed_url", "feed_type", "source_used", "articles", "cache_update", "finished_at"],
+        """
+        CREATE TABLE crawl_checkpoint (
+            url TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            avatar TEXT DEFAULT '',
+            status TEXT NOT NULL,
+            feed_url TEXT DEFAULT '',
+            feed_type TEXT NOT NULL DEFAULT 'none',
+            source_used TEXT NOT NULL DEFAULT 'none',
+            articles TEXT NOT NULL DEFAULT '[]',
+            cache_update TEXT NOT NULL DEFAULT '',
+            finished_at TEXT NOT NULL
+        )
+        """,
+    ),
     "article_tracking": (
         ["id", "title", "author", "link", "published", "summary", "content"],
         """
@@ -100,6 +185,15 @@ EXPECTED_SCHEMAS: dict[str, tuple[list[str], str]] = {
         )
         """,
     ),
+    "storage_migrations": (
+        ["name", "applied_at"],
+        """
+        CREATE TABLE storage_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TEXT NOT NULL DEFAULT ''
+        )
+        """,
+    ),
 }
 
 DEFAULT_EXPRESSIONS: dict[str, str] = {
@@ -107,6 +201,29 @@ DEFAULT_EXPRESSIONS: dict[str, str] = {
     "name": "''",
     "url": "''",
     "source": "'cache'",
+    "feed_url": "''",
+    "etag": "''",
+    "last_modified": "''",
+    "article_count": "0",
+    "articles": "'[]'",
+    "fetched_at": "''",
+    "content_hash": "''",
+    "changed_at": "''",
+    "site_url": "''",
+    "path": "''",
+    "status_code": "NULL",
+    "host": "''",
+    "samples": "'[]'",
+    "updated_at": "''",
+    "route": "'direct'",
+    "method": "'head'",
+    "interval_hours": "0",
+    "next_due_at": "''",
+    "status": "''",
+    "feed_type": "'none'",
+    "source_used": "'none'",
+    "cache_update": "''",
+    "finished_at": "''",
     "title": "''",
     "author": "''",
     "link": "''",
@@ -137,6 +254,7 @@ DEFAULT_EXPRESSIONS: dict[str, str] = {
     "api_success": "0",
     "api_status_code": "NULL",
     "api_latency": "-1",
+    "applied_at": "''",
 }
 
 
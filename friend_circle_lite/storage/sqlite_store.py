@@ -18,12 +18,22 @@ import json
 import logging
 import sqlite3
 from contextlib import closing
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import yaml
 
-from friend_circle_lite.domain.models import Article, CacheRecord, LinkCheckRecord, LinkMethodStatus, normalize_homepage_url
+from friend_circle_lite.domain.models import (
+    Article,
+    CacheRecord,
+    CacheUpdate,
+    CrawlResult,
+    FeedState,
+    LinkCheckRecord,
+    LinkMethodStatus,
+    Website,
+    normalize_homepage_url,
+)
 
 
 class FeedCacheStore:
@@ -70,6 +80,38 @@ class FeedCacheStore:
             logging.error(f"[RSS 缓存] 保存 RSS 缓存失败: {exc}")
             return False
 
+    def apply_updates(self, updates: dict[str, CacheRecord | None]) -> set[str]:
+        """Upsert or delete individual records by name; returns the names that changed.
+
+        Unlike `save_records`, this does not rewrite the whole table, so it is
+        cheap enough to call once per checked website.
+        """
+        if not self.cache_path or not updates:
+            return set()
+
+        changed: set[str] = set()
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                for name, record in updates.items():
+                    if record is None:
+                        cursor = connection.execute("DELETE FROM feed_cache WHERE name = ?", (name,))
+                    else:
+                        cursor = connection.execute(
+                            """
+                            INSERT INTO feed_cache(name, url, source) VALUES (?, ?, ?)
+                            ON CONFLICT(name) DO UPDATE SET url = excluded.url, source = excluded.source
+                            """,
+                            (name, record.url, record.source),
+                        )
+                    if cursor.rowcount:
+                        changed.add(name)
+                connection.commit()
+        except Exception as exc:
+            logging.error(f"[RSS 缓存] 更新 RSS 缓存失败: {exc}")
+        return changed
+
     def _load_from_sqlite(self) -> list[CacheRecord]:
         """Load records from the current SQLite cache file."""
         try:
@@ -169,6 +211,620 @@ class FeedCacheStore:
         return records
 
 
+class FeedStateStore:
+    """Persist conditional request validators, body hashes and last parsed articles per feed URL."""
+
+    ARTICLE_FIELDS = ("title", "author", "link", "published", "summary", "content")
+
+    def __init__(self, cache_path: str | Path | None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def load(self, feed_url: str) -> FeedState | None:
+        """Load the stored state of one feed, or None when it was never fetched."""
+        if not self.cache_path or not self.cache_path.exists():
+            return None
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                row = connection.execute(
+                    """
+                    SELECT feed_url, etag, last_modified, article_count, articles, fetched_at, content_hash, changed_at
+                    FROM feed_state
+                    WHERE feed_url = ?
+                    """,
+                    (feed_url,),
+                ).fetchone()
+        except Exception as exc:
+            logging.warning(f"[RSS 缓存] 读取订阅源状态失败: {feed_url} ，错误: {exc}")
+            return None
+
+        if row is None:
+            return None
+        feed_url, etag, last_modified, article_count, articles_json, fetched_at, content_hash, changed_at = row
+        return FeedState(
+            feed_url=feed_url,
+            etag=etag or "",
+            last_modified=last_modified or "",
+            article_count=article_count or 0,
+            articles=self._decode_articles(articles_json),
+            fetched_at=fetched_at or "",
+            content_hash=content_hash or "",
+            changed_at=changed_at or "",
+        )
+
+    def save(self, state: FeedState) -> bool:
+        """Insert or replace the stored state of one feed."""
+        if not self.cache_path:
+            return True
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.execute(
+                    """
+                    INSERT INTO feed_state(
+                        feed_url, etag, last_modified, article_count, articles, fetched_at, content_hash, changed_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(feed_url) DO UPDATE SET
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        article_count = excluded.article_count,
+                        articles = excluded.articles,
+                        fetched_at = excluded.fetched_at,
+                        content_hash = excluded.content_hash,
+                        changed_at = excluded.changed_at
+                    """,
+                    (
+                        state.feed_url,
+                        state.etag,
+                        state.last_modified,
+                        state.article_count,
+                        self._encode_articles(state.articles),
+                        state.fetched_at,
+                        state.content_hash,
+                        state.changed_at,
+                    ),
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[RSS 缓存] 保存订阅源状态失败: {state.feed_url} ，错误: {exc}")
+            return False
+
+    @classmethod
+    def _encode_articles(cls, articles: list[Article]) -> str:
+        """Serialize the article fields needed to rebuild crawl output and article tracking."""
+        return json.dumps(
+            [{key: getattr(article, key) for key in cls.ARTICLE_FIELDS} for article in articles],
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def _decode_articles(cls, payload: str | None) -> list[Article]:
+        try:
+            items = json.loads(payload or "[]")
+        except ValueError:
+            return []
+        return [
+            Article(**{key: str(item.get(key) or "") for key in cls.ARTICLE_FIELDS})
+            for item in items
+            if isinstance(item, dict)
+        ]
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the feed state table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feed_state (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT DEFAULT '',
+                last_modified TEXT DEFAULT '',
+                article_count INTEGER NOT NULL DEFAULT 0,
+                articles TEXT NOT NULL DEFAULT '[]',
+                fetched_at TEXT DEFAULT '',
+                content_hash TEXT DEFAULT '',
+                changed_at TEXT DEFAULT ''
+            )
+            """
+        )
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(feed_state)").fetchall()}
+        if "content_hash" not in columns:
+            connection.execute("ALTER TABLE feed_state ADD COLUMN content_hash TEXT DEFAULT ''")
+        if "changed_at" not in columns:
+            connection.execute("ALTER TABLE feed_state ADD COLUMN changed_at TEXT DEFAULT ''")
+
+
+class FeedProbeStore:
+    """Remember feed discovery paths that answered 404/410 for each site."""
+
+    def __init__(self, cache_path: str | Path | None, miss_ttl_days: int = 7):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.miss_ttl_days = miss_ttl_days
+
+    def load_misses(self, site_url: str) -> set[str]:
+        """Return probe paths that missed for `site_url` within the TTL."""
+        if not self.cache_path or not self.cache_path.exists():
+            return set()
+
+        cutoff = (datetime.now() - timedelta(days=self.miss_ttl_days)).strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute(
+                    "SELECT path FROM feed_probe_miss WHERE site_url = ? AND checked_at >= ?",
+                    (normalize_homepage_url(site_url), cutoff),
+                ).fetchall()
+        except Exception as exc:
+            logging.warning(f"[RSS 探测] 读取探测缓存失败: {exc}")
+            return set()
+        return {path for (path,) in rows}
+
+    def record_misses(self, site_url: str, misses: list[tuple[str, int]]) -> bool:
+        """Persist probe paths that answered with a definitive miss status."""
+        if not self.cache_path or not misses:
+            return True
+
+        checked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        site_url = normalize_homepage_url(site_url)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.executemany(
+                    """
+                    INSERT INTO feed_probe_miss(site_url, path, status_code, checked_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(site_url, path) DO UPDATE SET
+                        status_code = excluded.status_code,
+                        checked_at = excluded.checked_at
+                    """,
+                    [(site_url, path, status_code, checked_at) for path, status_code in misses],
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[RSS 探测] 保存探测缓存失败: {exc}")
+            return False
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the probe miss table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feed_probe_miss (
+                site_url TEXT NOT NULL,
+                path TEXT NOT NULL,
+                status_code INTEGER,
+                checked_at TEXT NOT NULL,
+                PRIMARY KEY (site_url, path)
+            )
+            """
+        )
+
+
+class RequestLatencyStore:
+    """Keep a rolling window of successful request latencies per host."""
+
+    def __init__(self, cache_path: str | Path | None, max_samples: int = 20):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_samples = max_samples
+
+    def load_samples(self) -> dict[str, list[float]]:
+        """Return recorded latency samples keyed by host."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute("SELECT host, samples FROM request_latency").fetchall()
+        except Exception as exc:
+            logging.warning(f"[请求延迟] 读取延迟历史失败: {exc}")
+            return {}
+
+        samples: dict[str, list[float]] = {}
+        for host, raw_samples in rows:
+            try:
+                samples[host] = [float(value) for value in json.loads(raw_samples or "[]")][-self.max_samples:]
+            except (TypeError, ValueError):
+                continue
+        return samples
+
+    def save_samples(self, samples: dict[str, list[float]]) -> bool:
+        """Replace the latency window of each given host."""
+        if not self.cache_path or not samples:
+            return True
+
+        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.executemany(
+                    """
+                    INSERT INTO request_latency(host, samples, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        samples = excluded.samples,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (host, json.dumps(values[-self.max_samples:]), updated_at)
+                        for host, values in samples.items()
+                    ],
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[请求延迟] 保存延迟历史失败: {exc}")
+            return False
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the latency history table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS request_latency (
+                host TEXT PRIMARY KEY,
+                samples TEXT NOT NULL DEFAULT '[]',
+                updated_at TEXT DEFAULT ''
+            )
+            """
+        )
+
+
+class RequestRouteStore:
+    """Remember which route, direct or proxy, last reached each host."""
+
+    def __init__(self, cache_path: str | Path | None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def load_routes(self) -> dict[str, str]:
+        """Return the last successful route keyed by host."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute("SELECT host, route FROM request_route").fetchall()
+        except Exception as exc:
+            logging.warning(f"[请求线路] 读取线路记录失败: {exc}")
+            return {}
+        return {host: route for host, route in rows}
+
+    def save_routes(self, routes: dict[str, str]) -> bool:
+        """Upsert the route of each given host."""
+        if not self.cache_path or not routes:
+            return True
+
+        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.executemany(
+                    """
+                    INSERT INTO request_route(host, route, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        route = excluded.route,
+                        updated_at = excluded.updated_at
+                    """,
+                    [(host, route, updated_at) for host, route in routes.items()],
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[请求线路] 保存线路记录失败: {exc}")
+            return False
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the route table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS request_route (
+                host TEXT PRIMARY KEY,
+                route TEXT NOT NULL DEFAULT 'direct',
+                updated_at TEXT DEFAULT ''
+            )
+            """
+        )
+
+
+class HomepageProbeStore:
+    """Remember which request method last probed each host's homepage successfully."""
+
+    def __init__(self, cache_path: str | Path | None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def load_methods(self, since: str = "") -> dict[str, str]:
+        """Return the last successful probe method keyed by host, ignoring entries saved before `since`."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute(
+                    "SELECT host, method FROM homepage_probe WHERE updated_at >= ?", (since,)
+                ).fetchall()
+        except Exception as exc:
+            logging.warning(f"[主页探测] 读取探测方式失败: {exc}")
+            return {}
+        return {host: method for host, method in rows}
+
+    def save_methods(self, methods: dict[str, str]) -> bool:
+        """Upsert the probe method of each given host."""
+        if not self.cache_path or not methods:
+            return True
+
+        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.executemany(
+                    """
+                    INSERT INTO homepage_probe(host, method, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        method = excluded.method,
+                        updated_at = excluded.updated_at
+                    """,
+                    [(host, method, updated_at) for host, method in methods.items()],
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[主页探测] 保存探测方式失败: {exc}")
+            return False
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the probe method table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS homepage_probe (
+                host TEXT PRIMARY KEY,
+                method TEXT NOT NULL DEFAULT 'head',
+                updated_at TEXT DEFAULT ''
+            )
+            """
+        )
+
+
+class CrawlScheduleStore:
+    """Persist the next time each feed is due to be crawled."""
+
+    def __init__(self, cache_path: str | Path | None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def load_due_times(self) -> dict[str, str]:
+        """Return the next due time keyed by feed URL."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute("SELECT feed_url, next_due_at FROM crawl_schedule").fetchall()
+        except Exception as exc:
+            logging.warning(f"[抓取调度] 读取抓取计划失败: {exc}")
+            return {}
+        return {feed_url: next_due_at for feed_url, next_due_at in rows if next_due_at}
+
+    def save_plans(self, plans: dict[str, tuple[float, str]]) -> bool:
+        """Upsert `(interval_hours, next_due_at)` of each given feed."""
+        if not self.cache_path or not plans:
+            return True
+
+        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.executemany(
+                    """
+                    INSERT INTO crawl_schedule(feed_url, interval_hours, next_due_at, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(feed_url) DO UPDATE SET
+                        interval_hours = excluded.interval_hours,
+                        next_due_at = excluded.next_due_at,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (feed_url, interval_hours, next_due_at, updated_at)
+                        for feed_url, (interval_hours, next_due_at) in plans.items()
+                    ],
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[抓取调度] 保存抓取计划失败: {exc}")
+            return False
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the schedule table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_schedule (
+                feed_url TEXT PRIMARY KEY,
+                interval_hours REAL NOT NULL DEFAULT 0,
+                next_due_at TEXT DEFAULT '',
+                updated_at TEXT DEFAULT ''
+            )
+            """
+        )
+
+
+class CrawlCheckpointStore:
+    """Persist each website's finished crawl result as soon as it completes.
+
+    A run that is cancelled midway keeps the results committed so far, and a
+    retry within the resume window reuses them instead of crawling again.
+    """
+
+    ARTICLE_FIELDS = ("title", "author", "link", "published", "summary", "content", "avatar")
+
+    def __init__(self, cache_path: str | Path | None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def save_result(self, result: CrawlResult) -> bool:
+        """Insert or replace the checkpoint of one website."""
+        if not self.cache_path:
+            return True
+
+        website = result.website
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.execute(
+                    """
+                    INSERT INTO crawl_checkpoint(
+                        url, name, avatar, status, feed_url, feed_type, source_used, articles, cache_update, finished_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        name = excluded.name,
+                        avatar = excluded.avatar,
+                        status = excluded.status,
+                        feed_url = excluded.feed_url,
+                        feed_type = excluded.feed_type,
+                        source_used = excluded.source_used,
+                        articles = excluded.articles,
+                        cache_update = excluded.cache_update,
+                        finished_at = excluded.finished_at
+                    """,
+                    (
+                        website.url,
+                        website.name,
+                        website.avatar,
+                        result.status,
+                        result.feed_url or "",
+                        result.feed_type,
+                        result.source_used,
+                        json.dumps(
+                            [{key: getattr(article, key) for key in self.ARTICLE_FIELDS} for article in result.articles],
+                            ensure_ascii=False,
+                        ),
+                        json.dumps(result.cache_update.to_dict(), ensure_ascii=False),
+                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    ),
+                )
+                connection.commit()
+            return True
+        except Exception as exc:
+            logging.error(f"[抓取断点] 保存抓取结果失败: {website.url} ，错误: {exc}")
+            return False
+
+    def load_results(self, since: str) -> dict[str, CrawlResult]:
+        """Return results finished at or after `since`, keyed by website URL."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.commit()
+                rows = connection.execute(
+                    """
+                    SELECT url, name, avatar, status, feed_url, feed_type, source_used, articles, cache_update
+                    FROM crawl_checkpoint
+                    WHERE finished_at >= ?
+                    """,
+                    (since,),
+                ).fetchall()
+        except Exception as exc:
+            logging.warning(f"[抓取断点] 读取抓取结果失败: {exc}")
+            return {}
+
+        results: dict[str, CrawlResult] = {}
+        for url, name, avatar, status, feed_url, feed_type, source_used, articles_json, cache_update_json in rows:
+            try:
+                items = json.loads(articles_json or "[]")
+                cache_update = json.loads(cache_update_json or "{}")
+            except ValueError:
+                continue
+            results[url] = CrawlResult(
+                website=Website(name=name, url=url, avatar=avatar or ""),
+                status=status,
+                articles=[
+                    Article(**{key: str(item.get(key) or "") for key in self.ARTICLE_FIELDS})
+                    for item in items
+                    if isinstance(item, dict)
+                ],
+                feed_url=feed_url or None,
+                feed_type=feed_type or "none",
+                source_used=source_used or "none",
+                cache_update=CacheUpdate(
+                    action=str(cache_update.get("action") or "none"),
+                    name=cache_update.get("name"),
+                    url=cache_update.get("url"),
+                    reason=str(cache_update.get("reason") or ""),
+                ),
+            )
+        return results
+
+    def clear(self) -> None:
+        """Delete all checkpoints once a run has finished normally."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.execute("DELETE FROM crawl_checkpoint")
+                connection.commit()
+        except Exception as exc:
+            logging.warning(f"[抓取断点] 清理抓取结果失败: {exc}")
+
+    def prune(self, before: str) -> None:
+        """Delete checkpoints finished before `before`."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+
+        try:
+            with closing(sqlite3.connect(self.cache_path)) as connection:
+                self._ensure_schema(connection)
+                connection.execute("DELETE FROM crawl_checkpoint WHERE finished_at < ?", (before,))
+                connection.commit()
+        except Exception as exc:
+            logging.warning(f"[抓取断点] 清理过期抓取结果失败: {exc}")
+
+    @staticmethod
+    def _ensure_schema(connection: sqlite3.Connection) -> None:
+        """Create the checkpoint table when it does not exist yet."""
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+                url TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                avatar TEXT DEFAULT '',
+                status TEXT NOT NULL,
+                feed_url TEXT DEFAULT '',
+                feed_type TEXT NOT NULL DEFAULT 'none',
+                source_used TEXT NOT NULL DEFAULT 'none',
+                articles TEXT NOT NULL DEFAULT '[]',
+                cache_update TEXT NOT NULL DEFAULT '',
+                finished_at TEXT NOT NULL
+            )
+            """
+        )
+
+
 class ArticleTrackingStore:
     """Persist and load article tracking data using SQLite."""
 
@@ -314,34 +970,44 @@ class ArticleTrackingStore:
 class LinkCheckStore:
     """Persist friend link reachability checks using SQLite."""
 
+    RECORD_COLUMNS = """
+        url, name, avatar, linkpage, checked_at, reachable, crawl_allowed,
+        best_method, best_latency, fail_count, backlink_checked, has_author_link,
+        rss_crawl_reason, last_post_published, last_post_days_ago,
+        unreachable_since, rss_unavailable_since,
+        direct_success, direct_status_code, direct_latency,
+        proxy_success, proxy_status_code, proxy_latency, api_success,
+        api_status_code, api_latency
+    """
+    # storage_migrations 中存在该记录时，link_check_state 中的地址均已规范化。
+    NORMALIZED_URLS_MIGRATION = "link_check_state.normalized_urls"
+
     def __init__(self, cache_path: str | Path | None):
         self.cache_path = Path(cache_path) if cache_path else None
 
     def load_records(self, urls: list[str] | None = None) -> dict[str, LinkCheckRecord]:
+        """读取检测记录；传入 `urls` 时只读取这些地址，不扫描历史友链。"""
         if not self.cache_path or not self.cache_path.exists():
             return {}
 
+        requested_urls = {normalize_homepage_url(url) for url in (urls or [])}
         try:
             with closing(sqlite3.connect(self.cache_path)) as connection:
                 self._ensure_schema(connection)
                 connection.commit()
-                rows = connection.execute(
-                    """
-                    SELECT url, name, avatar, linkpage, checked_at, reachable, crawl_allowed,
-                           best_method, best_latency, fail_count, backlink_checked, has_author_link,
-                           rss_crawl_reason, last_post_published, last_post_days_ago,
-                           unreachable_since, rss_unavailable_since,
-                           direct_success, direct_status_code, direct_latency,
-                           proxy_success, proxy_status_code, proxy_latency, api_success,
-                           api_status_code, api_latency
-                    FROM link_check_state
-                    """
-                ).fetchall()
+                if requested_urls:
+                    # 临时表随连接关闭自动删除；按主键连接查询，不受 SQL 参数个数上限影响。
+                    connection.execute("CREATE TEMP TABLE requested_link(url TEXT PRIMARY KEY)")
+                    connection.executemany("INSERT INTO requested_link(url) VALUES (?)", [(url,) for url in requested_urls])
+                    rows = connection.execute(
+                        f"SELECT {self.RECORD_COLUMNS} FROM link_check_state JOIN requested_link USING (url)"
+                    ).fetchall()
+                else:
+                    rows = connection.execute(f"SELECT {self.RECORD_COLUMNS} FROM link_check_state").fetchall()
         except Exception as exc:
             logging.warning(f"[友链检测] 读取友链检测缓存失败: {exc}")
             return {}
 
-        allowed_urls = {normalize_homepage_url(url) for url in (urls or [])}
         records: dict[str, LinkCheckRecord] = {}
         for row in rows:
             (
@@ -353,12 +1019,9 @@ class LinkCheckStore:
                 proxy_success, proxy_status_code, proxy_latency, api_success,
                 api_status_code, api_latency,
             ) = row
-            normalized_url = normalize_homepage_url(url or "")
-            if allowed_urls and normalized_url not in allowed_urls:
-                continue
-            records[normalized_url] = LinkCheckRecord(
+            records[url] = LinkCheckRecord(
                 name=name or "",
-                url=normalized_url,
+                url=url,
                 avatar=avatar or "",
                 linkpage=linkpage or "",
                 checked_at=checked_at or "",
@@ -435,7 +1098,7 @@ class LinkCheckStore:
             return False
 
     @staticmethod
-    def is_fresh(record: LinkCheckRecord, max_age_hours: int) -> bool:
+    def is_fresh(record: LinkCheckRecord, max_age_hours: float) -> bool:
         if not record.checked_at:
             return False
         try:
@@ -519,3 +1182,45 @@ class LinkCheckStore:
             connection.execute("ALTER TABLE link_check_state ADD COLUMN unreachable_since TEXT DEFAULT ''")
         if "rss_unavailable_since" not in columns:
             connection.execute("ALTER TABLE link_check_state ADD COLUMN rss_unavailable_since TEXT DEFAULT ''")
+        LinkCheckStore._normalize_stored_urls(connection)
+
+    @staticmethod
+    def _normalize_stored_urls(connection: sqlite3.Connection) -> None:
+        """一次性把旧版本写入的地址改为规范化形式，之后按主键精确查询。
+
+        规范化后重复的记录只保留检测时间最新的一条。迁移完成后在 storage_migrations 中记录，不再扫描全表。
+        迁移状态不使用 PRAGMA user_version，避免与缓存文件的其他使用方冲突。
+        """
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS storage_migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        migration = LinkCheckStore.NORMALIZED_URLS_MIGRATION
+        if connection.execute("SELECT 1 FROM storage_migrations WHERE name = ?", (migration,)).fetchone():
+            return
+        latest: dict[str, tuple[str, str]] = {}
+        stale_urls: list[str] = []
+        for url, checked_at in connection.execute("SELECT url, checked_at FROM link_check_state ORDER BY rowid"):
+            normalized_url = normalize_homepage_url(url or "")
+            current = latest.get(normalized_url)
+            if current is None:
+                latest[normalized_url] = (url, checked_at or "")
+                continue
+            if (checked_at or "") >= current[1]:
+                stale_urls.append(current[0])
+                latest[normalized_url] = (url, checked_at or "")
+            else:
+                stale_urls.append(url)
+        renames = [(normalized_url, url) for normalized_url, (url, _) in latest.items() if url != normalized_url]
+        connection.executemany("DELETE FROM link_check_state WHERE url = ?", [(url,) for url in stale_urls])
+        connection.executemany("UPDATE link_check_state SET url = ? WHERE url = ?", renames)
+        connection.execute(
+            "INSERT INTO storage_migrations(name, applied_at) VALUES (?, ?)",
+            (migration, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        if stale_urls or renames:
+            logging.info(f"[友链检测] 已规范化 {len(renames)} 条缓存地址，合并 {len(stale_urls)} 条重复记录")
@@ -1,17 +1,81 @@
 import logging
+import re
 from dateutil import parser
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
+SHANGHAI_TZ = timezone(timedelta(hours=8))
+OUTPUT_FORMAT = '%Y-%m-%d %H:%M'
+
+# RFC 822 时区只接受数字偏移与 UTC 写法；CST 等缩写含义不唯一，交给 dateutil 按原有方式处理。
+_RFC822_ZONE = re.compile(r'(?:[+-]\d{4}|GMT|UTC?|Z)')
+_ZONE_ABBREVIATION = re.compile(r'[A-Za-z]{2,5}')
+
+
+def _to_shanghai(parsed_time):
+    # 处理时区转换
+    if parsed_time.tzinfo is None:
+        parsed_time = parsed_time.replace(tzinfo=timezone.utc)
+    return parsed_time.astimezone(SHANGHAI_TZ).strftime(OUTPUT_FORMAT)
+
+
+def _parse_fast(time_str):
+    """按 ISO 8601 与 RFC 822 直接解析，无法识别时返回 None。"""
+    if time_str[:4].isdigit():
+        try:
+            return datetime.fromisoformat(time_str)
+        except ValueError:
+            return None
+    parts = time_str.rsplit(None, 1)
+    if len(parts) == 2 and _RFC822_ZONE.fullmatch(parts[1]):
+        try:
+            return parsedate_to_datetime(time_str)
+        except (TypeError, ValueError, IndexError):
+            return None
+    return None
+
+
+def has_ambiguous_zone(time_str):
+    """
+    判断时间字符串是否以 CST 等字母时区缩写结尾。
+
+    feedparser 会把这类缩写按固定含义换算（如 CST 视为美国中部时间），与按字符串解析的结果不同，
+    调用方此时应改用原字符串解析。
+    """
+    parts = (time_str or '').rsplit(None, 1)
+    return len(parts) == 2 and bool(_ZONE_ABBREVIATION.fullmatch(parts[1])) and not _RFC822_ZONE.fullmatch(parts[1])
+
+
+def format_struct_time(time_value):
+    """
+    将 feedparser 给出的 UTC struct_time 直接格式化为 YYYY-MM-DD HH:MM，无需再经过字符串解析。
+    """
+    parsed_time = datetime(*time_value[:6], tzinfo=timezone.utc)
+    return parsed_time.astimezone(SHANGHAI_TZ).strftime(OUTPUT_FORMAT)
+
+
+@lru_cache(maxsize=4096)
 def format_published_time(time_str):
     """
     格式化发布时间为统一格式 YYYY-MM-DD HH:MM
 
+    先按 ISO 8601 与 RFC 822 直接解析，失败后再使用 dateutil 与常见格式兜底。
+    同一订阅源的时间写法高度重复，结果按输入字符串缓存。
+
     参数:
     time_str (str): 输入的时间字符串，可能是多种格式。
 
     返回:
-    str: 格式化后的时间字符串，若解析失败返回空字符串。
+    str: 格式化后的时间字符串，若为空或解析失败返回空字符串。
     """
+    if not time_str:
+        return ''
+    time_str = time_str.strip()
+    parsed_time = _parse_fast(time_str)
+    if parsed_time is not None:
+        return _to_shanghai(parsed_time)
+
     # 尝试自动解析输入时间字符串
     try:
         parsed_time = parser.parse(time_str, fuzzy=True)
@@ -35,8 +99,4 @@ def format_published_time(time_str):
             logging.warning(f"无法解析时间字符串：{time_str}")
             return ''
 
-    # 处理时区转换
-    if parsed_time.tzinfo is None:
-        parsed_time = parsed_time.replace(tzinfo=timezone.utc)
-    shanghai_time = parsed_time.astimezone(timezone(timedelta(hours=8)))
-    return shanghai_time.strftime('%Y-%m-%d %H:%M')
\ No newline at end of file
+    return _to_shanghai(parsed_time)
@@ -1,5 +1,5 @@
 import logging
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlsplit, urlunsplit
 import re
 
 def replace_non_domain(link: str, blog_url: str) -> str:
@@ -41,3 +41,27 @@ def replace_non_domain(link: str, blog_url: str) -> str:
     except Exception as e:
         logging.warning(f"替换链接时出错：{link}, error: {e}")
         return link
+
+
+def normalize_feed_url(url: str) -> str:
+    """
+    规范化订阅源地址，用于识别指向同一订阅源的不同写法。
+    - 协议与域名转为小写，去掉默认端口
+    - 去掉片段（# 之后的内容），空路径补为 /
+    - 保留路径大小写、结尾斜杠与查询参数，它们可能对应不同的订阅源
+
+    :param url: 原始订阅源地址
+    :return: 规范化后的地址，无法解析时返回去除首尾空白的原值
+    """
+    value = str(url or "").strip()
+    try:
+        parts = urlsplit(value)
+        if not parts.scheme or not parts.hostname:
+            return value
+        scheme = parts.scheme.lower()
+        netloc = parts.hostname.lower()
+        if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+            netloc = f"{netloc}:{parts.port}"
+        return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+    except ValueError:
+        return value
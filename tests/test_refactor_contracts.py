@@ -2,25 +2,44 @@ import unittest
 import json
 import sqlite3
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
+from zoneinfo import ZoneInfo
 
+import feedparser
 import requests
+from dateutil import parser as dateutil_parser
 
-from friend_circle_lite.config.models import ProxySettings
+from friend_circle_lite.config.models import ProxySettings, RequestSettings, SpiderSettings
 from friend_circle_lite.config.printer import print_startup_config
-from friend_circle_lite.crawler.http_client import WebFetchClient
-from friend_circle_lite.crawler.service import FeedResolver, FriendCircleCrawlService, SingleSiteCrawler
+from friend_circle_lite.crawler.budget import RunBudget
+from friend_circle_lite.crawler.engine import ThreadCrawlEngine
+from friend_circle_lite.crawler.feed_service import FeedDiscoveryService, FeedParseMemo, FeedParserService, parse_feed_rows
+from friend_circle_lite.crawler.feed_stream import StreamingFeedParser
+from friend_circle_lite.crawler.http_client import AdaptiveTimeoutPolicy, FetchResult, RetryPolicy, RouteMemory, WebFetchClient, build_hedge_executor
+from friend_circle_lite.crawler.instrumentation import STAGE_PARSE, RunInstrumentation
+from friend_circle_lite.crawler.schedule import CrawlScheduler
+from friend_circle_lite.crawler.sharding import select_shard, shard_of
+from friend_circle_lite.crawler.service import CrawlPipeline, FeedResolver, FriendCircleCrawlService, SingleSiteCrawler
+from friend_circle_lite.crawler.transport import HttpTransport
 from friend_circle_lite.all_friends import deal_with_large_data, merge_link_data_from_json_url
 from friend_circle_lite.app_config import ApplicationConfig
 from friend_circle_lite.cli import FriendCircleLiteApplication
-from friend_circle_lite.link_checker.service import LinkReachabilityService, RetryBackoffPolicy
-from friend_circle_lite.models import Article, CacheRecord, FeedEndpoint, LinkCheckRecord, LinkMethodStatus, Website
+from friend_circle_lite.link_checker.service import HomepageProbeMemory, LinkReachabilityService, RetryBackoffPolicy, build_backlink_scan
+from friend_circle_lite.link_checker.status_api import StatusApiClient
+from friend_circle_lite.models import Article, CacheRecord, CacheUpdate, CrawlResult, FeedEndpoint, FeedParseResult, FeedState, LinkCheckRecord, LinkMethodStatus, RequestTiming, Website
 from friend_circle_lite.outputs.legacy_api import _to_public_link
+from friend_circle_lite.outputs.shard_merge import merge_shard_outputs
 from friend_circle_lite.storage.diagnostics import SQLiteDebugDumper
+from friend_circle_lite.storage.sqlite_store import CrawlCheckpointStore, CrawlScheduleStore, FeedProbeStore, HomepageProbeStore, FeedStateStore, LinkCheckStore, RequestLatencyStore, RequestRouteStore
 from friend_circle_lite.utils.json import write_json
+from friend_circle_lite.utils.time import format_published_time, format_struct_time
 
 
 class RefactorContractsTest(unittest.TestCase):
@@ -378,12 +397,11 @@ class RefactorContractsTest(unittest.TestCase):
             def discover(self, website_url):
                 return None
 
-        class Response:
-            status_code = 200
-
         class Fetcher:
             def get(self, *args, **kwargs):
-                return type("Result", (), {"response": Response(), "latency": 0.1, "success": True})()
+                response = requests.Response()
+                response.status_code = 200
+                return FetchResult(response=response, latency=0.1)
 
         service = LinkReachabilityService(
             config=ApplicationConfig.from_dict({"link_check": {"max_age_hours": 24}}).link_check,
@@ -509,10 +527,6 @@ class RefactorContractsTest(unittest.TestCase):
             def is_fresh(self, record, max_age_hours):
                 return True
 
-        class Response:
-            status_code = 200
-            text = '<a href="https://blog.liushen.fun/">清羽飞扬</a>'
-
         class Fetcher:
             calls = []
 
@@ -520,7 +534,11 @@ class RefactorContractsTest(unittest.TestCase):
                 self.calls.append(url)
                 if url != "https://site.example/new-links/":
                     raise AssertionError("反链页变化时只应请求新的友链页")
-                return type("Result", (), {"response": Response(), "latency": 0.2, "success": True})()
+                response = requests.Response()
+                response.status_code = 200
+                response._content = '<a href="https://blog.liushen.fun/">清羽飞扬</a>'.encode("utf-8")
+                # 未经流式扫描的响应没有 match，由检测方在完整内容中查找。
+                return FetchResult(response=response, latency=0.2)
 
         fetcher = Fetcher()
         service = LinkReachabilityService(
@@ -678,15 +696,14 @@ class RefactorContractsTest(unittest.TestCase):
             def discover(self, website_url):
                 return None
 
-        class Response:
-            status_code = 200
-
         class Fetcher:
             calls = 0
 
             def get(self, *args, **kwargs):
                 self.calls += 1
-                return type("Result", (), {"response": Response(), "latency": 0.31, "success": True})()
+                response = requests.Response()
+                response.status_code = 200
+                return FetchResult(response=response, latency=0.31)
 
         fetcher = Fetcher()
         service = LinkReachabilityService(
@@ -789,6 +806,1491 @@ class RefactorContractsTest(unittest.TestCase):
         self.assertNotIn("proxy.example", messages)
         self.assertIn("https://site.example/feed.xml", messages)
 
+    def test_web_fetch_client_goes_straight_to_remembered_proxy_route(self):
+        calls = []
+
+        class Response:
+            status_code = 200
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                calls.append(url)
+                if url.startswith("https://site.example"):
+                    raise requests.RequestException("direct failed")
+                return Response()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = RequestRouteStore(Path(temp_dir) / "cache.sqlite3")
+            proxy_settings = ProxySettings(proxy_url="https://proxy.example/")
+            memory = RouteMemory(store)
+            WebFetchClient(Session(), proxy_settings, route_memory=memory).get("https://site.example/feed.xml")
+            memory.flush()
+
+            calls.clear()
+            result = WebFetchClient(Session(), proxy_settings, route_memory=RouteMemory(store)).get("https://site.example/atom.xml")
+
+        self.assertTrue(result.used_proxy)
+        self.assertEqual(calls, ["https://proxy.example/https://site.example/atom.xml"])
+
+    def test_web_fetch_client_hedges_slow_primary_route(self):
+        release_direct = threading.Event()
+
+        class Response:
+            status_code = 200
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                if url.startswith("https://site.example"):
+                    release_direct.wait(timeout=5)
+                return Response()
+
+        proxy_settings = ProxySettings(proxy_url="https://proxy.example/", hedge_delay=0.05)
+        self.assertIsNone(build_hedge_executor(ProxySettings(hedge_delay=0.05), 4))
+        executor = build_hedge_executor(proxy_settings, 4)
+        self.assertEqual(executor._max_workers, 8)
+        client = WebFetchClient(Session(), proxy_settings, hedge_executor=executor)
+        try:
+            result = client.get("https://site.example/feed.xml")
+        finally:
+            release_direct.set()
+            executor.shutdown(wait=True)
+
+        self.assertTrue(result.success)
+        self.assertTrue(result.used_proxy)
+
+    def test_http_transport_reuses_connections_and_caps_host_concurrency(self):
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with lock:
+                    state["active"] += 1
+                    state["peak"] = max(state["peak"], state["active"])
+                time.sleep(0.02)
+                with lock:
+                    state["active"] -= 1
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        try:
+            transport = HttpTransport(ApplicationConfig.from_dict({
+                "request_settings": {"max_connections_per_host": 1},
+            }).request_settings)
+            for _ in range(3):
+                transport.session.get(url, timeout=5)
+            sequential_connections = transport.stats.new_connections
+
+            with ThreadCrawlEngine(max_workers=4) as engine:
+                futures = [engine.submit(transport.session.get, url) for _ in range(4)]
+                statuses = [future.result().status_code for future in futures]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(sequential_connections, 1)
+        self.assertEqual(transport.stats.requests, 7)
+        self.assertEqual(statuses, [200] * 4)
+        self.assertEqual(state["peak"], 1)
+
+    def test_homepage_probe_falls_back_from_head_and_remembers_method_per_host(self):
+        requests_seen = []
+        page = b"<html>" + b"x" * (512 * 1024) + b"</html>"
+
+        def make_handler(supports_head):
+            class Handler(BaseHTTPRequestHandler):
+                protocol_version = "HTTP/1.1"
+
+                def do_HEAD(self):
+                    requests_seen.append((self.server.server_address[1], "HEAD", None))
+                    self.send_response(200 if supports_head else 405)
+                    self.send_header("Content-Length", str(len(page)) if supports_head else "0")
+                    self.end_headers()
+
+                def do_GET(self):
+                    requests_seen.append((self.server.server_address[1], "GET", self.headers.get("Range")))
+                    if self.headers.get("Range") == "bytes=0-0":
+                        self.send_response(206)
+                        self.send_header("Content-Range", f"bytes 0-0/{len(page)}")
+                        self.send_header("Content-Length", "1")
+                        self.end_headers()
+                        self.wfile.write(page[:1])
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+
+                def log_message(self, *args):
+                    pass
+
+            return Handler
+
+        servers = [ThreadingHTTPServer(("127.0.0.1", 0), make_handler(flag)) for flag in (True, False)]
+        for server in servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        head_port, range_port = (server.server_address[1] for server in servers)
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir, requests.Session() as session:
+                store = HomepageProbeStore(Path(temp_dir) / "cache.sqlite3")
+                service = LinkReachabilityService(
+                    config=ApplicationConfig.from_dict({"link_check": {"timeout": 5}}).link_check,
+                    proxy_settings=ProxySettings(),
+                    store=None,
+                    fetcher=WebFetchClient(session, max_response_bytes=64 * 1024),
+                    probe_memory=HomepageProbeMemory(store),
+                )
+                first = [service._request_homepage(f"http://127.0.0.1:{port}/") for port in (head_port, range_port)]
+                service.probe_memory.flush()
+                service.probe_memory = HomepageProbeMemory(store)
+                requests_seen.clear()
+                second = service._request_homepage(f"http://127.0.0.1:{range_port}/")
+                remembered = store.load_methods()
+        finally:
+            for server in servers:
+                server.shutdown()
+                server.server_close()
+
+        self.assertTrue(all(status.success for status in first))
+        self.assertEqual([status.status_code for status in first], [200, 206])
+        self.assertTrue(second.success)
+        self.assertEqual(requests_seen, [(range_port, "GET", "bytes=0-0")])
+        self.assertEqual(remembered, {f"127.0.0.1:{range_port}": "range"})
+
+    def test_homepage_probe_falls_back_only_when_the_method_is_unsupported(self):
+        script = {
+            "https://dead.example/": {"HEAD": 404},
+            "https://down.example/": {"HEAD": 503},
+            "https://waf.example/": {"HEAD": 403, "RANGE": 410},
+            "https://plain.example/": {"HEAD": 405, "RANGE": 416, "GET": 200},
+        }
+        calls = []
+
+        class Fetcher:
+            def get(self, url, headers=None, timeout=None, desc="", max_bytes=None, scan=None, probe_method=""):
+                method = "RANGE" if (headers or {}).get("Range") else probe_method or "GET"
+                calls.append((url, method))
+                response = requests.Response()
+                response.status_code = script[url][method]
+                return FetchResult(response=response, latency=0.1, range_requested=method == "RANGE")
+
+        service = LinkReachabilityService(
+            config=ApplicationConfig.from_dict({}).link_check,
+            proxy_settings=ProxySettings(),
+            store=None,
+            fetcher=Fetcher(),
+        )
+        statuses = {url: service._request_homepage(url) for url in script}
+
+        self.assertEqual({url: status.status_code for url, status in statuses.items()}, {
+            "https://dead.example/": 404,
+            "https://down.example/": 503,
+            "https://waf.example/": 410,
+            "https://plain.example/": 200,
+        })
+        self.assertEqual([method for url, method in calls if url == "https://dead.example/"], ["HEAD"])
+        self.assertEqual([method for url, method in calls if url == "https://down.example/"], ["HEAD"])
+        self.assertEqual([method for url, method in calls if url == "https://waf.example/"], ["HEAD", "RANGE"])
+        self.assertEqual([method for url, method in calls if url == "https://plain.example/"], ["HEAD", "RANGE", "GET"])
+        self.assertTrue(statuses["https://plain.example/"].success)
+
+    def test_status_api_client_shares_rate_limit_without_blocking_check_workers(self):
+        lock = threading.Lock()
+        calls = []
+        in_flight = [0, 0]
+
+        class FakeResponse:
+            status_code = 200
+
+            def json(self):
+                return {"code": 200, "data": 200}
+
+        class FakeSession:
+            def get(self, url, headers=None, timeout=None):
+                with lock:
+                    calls.append(time.monotonic())
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight[1], in_flight[0])
+                time.sleep(0.05)
+                with lock:
+                    in_flight[0] -= 1
+                return FakeResponse()
+
+        config = ApplicationConfig.from_dict({"link_check": {"status_api_rate": 20, "status_api_concurrency": 2}}).link_check
+        with StatusApiClient(FakeSession(), config) as client:
+            started = time.monotonic()
+            futures = [client.submit(f"https://site{index}.example.com/") for index in range(30)]
+            submitted = time.monotonic() - started
+            statuses = [future.result() for future in futures]
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(calls), 30)
+        self.assertTrue(all(status.success for status in statuses))
+        self.assertLessEqual(in_flight[1], 2)
+        # 提交不等待限速；桶容量 20，其余 10 次按每秒 20 个令牌补充，至少需要约 0.5 秒。
+        self.assertLess(submitted, 0.1)
+        self.assertGreaterEqual(elapsed, 0.4)
+
+        class Store:
+            def load_records(self, urls):
+                return {}
+
+            def save_records(self, records):
+                return True
+
+        class Fetcher:
+            def get(self, *args, **kwargs):
+                return FetchResult(response=None, error=requests.ConnectionError("refused"))
+
+        class SlowApi:
+            def __init__(self):
+                self.executor = ThreadPoolExecutor(max_workers=3)
+
+            def submit(self, url):
+                return self.executor.submit(lambda: (time.sleep(0.3), LinkMethodStatus(True, 200, 0.3))[1])
+
+        api = SlowApi()
+        with ThreadCrawlEngine(max_workers=1) as engine:
+            service = LinkReachabilityService(
+                config=ApplicationConfig.from_dict({"link_check": {"homepage_probe": False}}).link_check,
+                proxy_settings=ProxySettings(),
+                store=Store(),
+                feed_parser=type("Parser", (), {"parse": lambda self, *args, **kwargs: [], "last_latency": 0.01})(),
+                feed_discovery=type("Discovery", (), {"discover": lambda self, url: None})(),
+                fetcher=Fetcher(),
+                engine=engine,
+                status_api=api,
+                session=requests.Session(),
+            )
+            started = time.monotonic()
+            records = service.check_websites([Website(name=f"Site{index}", url=f"https://site{index}.example/") for index in range(3)])
+            elapsed = time.monotonic() - started
+        api.executor.shutdown()
+
+        # 单个检测线程没有被 API 等待占住，三个站点的 API 兜底并行进行。
+        self.assertLess(elapsed, 0.8)
+        self.assertTrue(all(record.reachable and record.api.success for record in records))
+
+    def test_link_check_expiry_is_jittered_and_rechecks_are_capped_per_run(self):
+        checked_at = (datetime.now() - timedelta(hours=18)).strftime("%Y-%m-%d %H:%M:%S")
+        websites = [Website(name=f"Site{index}", url=f"https://site{index}.example/") for index in range(40)]
+        windows = [
+            RetryBackoffPolicy.jittered_max_age_hours(website.url, checked_at, 24, 0.5) for website in websites
+        ]
+        self.assertTrue(all(12 <= hours <= 24 for hours in windows))
+        self.assertEqual(
+            windows[0], RetryBackoffPolicy.jittered_max_age_hours("https://SITE0.example", checked_at, 24, 0.5)
+        )
+        self.assertEqual(RetryBackoffPolicy.jittered_max_age_hours(websites[0].url, checked_at, 24, 0), 24)
+        # 每次复检后按新的检测时间重新取提前量，同一友链不会一直落在最短的有效期上。
+        rechecks = {
+            RetryBackoffPolicy.jittered_max_age_hours(websites[1].url, f"2026-01-{day:02d} 08:00:00", 24, 0.5)
+            for day in range(1, 11)
+        }
+        self.assertGreater(len(rechecks), 1)
+
+        records = {
+            website.url: LinkCheckRecord(
+                name=website.name,
+                url=website.url,
+                checked_at=checked_at if index else "2026-01-01 00:00:00",
+                reachable=True,
+                crawl_allowed=False,
+                best_method="homepage",
+                best_latency=0.2,
+            )
+            for index, website in enumerate(websites)
+        }
+
+        class Store:
+            def load_records(self, urls):
+                return dict(records)
+
+            def save_records(self, records):
+                return True
+
+            is_fresh = staticmethod(LinkCheckStore.is_fresh)
+
+        service = LinkReachabilityService(
+            config=ApplicationConfig.from_dict({"link_check": {"max_rechecks_per_run": 3}}).link_check,
+            proxy_settings=ProxySettings(),
+            store=Store(),
+        )
+        expired = [website for website, hours in zip(websites, windows) if hours <= 18 or website is websites[0]]
+        checked = []
+
+        def check_fresh(to_check, cached_records, on_record=None):
+            checked.extend(to_check)
+            for website in to_check:
+                on_record(website, cached_records[website.url])
+            return [cached_records[website.url] for website in to_check]
+
+        reported = []
+        with patch.object(service, "_check_fresh_websites", side_effect=check_fresh):
+            results = service.check_websites(websites, on_record=lambda website, record: reported.append(website.url))
+
+        # 18 小时前集中检测的友链只有一部分已经过期，而不是全部同时过期。
+        self.assertGreater(len(expired), 3)
+        self.assertLess(len(expired), len(websites))
+        self.assertEqual(len(checked), 3)
+        self.assertIn(websites[0], checked)
+        self.assertTrue(all(website in expired for website in checked))
+        self.assertEqual(len(results), len(websites))
+        self.assertEqual(sorted(reported), sorted(website.url for website in websites))
+
+    def test_link_check_store_normalizes_urls_once_and_loads_only_requested_rows(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "cache.sqlite3"
+            store = LinkCheckStore(db_path)
+            store.save_records([
+                LinkCheckRecord(name=f"Old{index}", url=f"https://old{index}.example/", checked_at="2026-06-01 12:00:00")
+                for index in range(50)
+            ])
+            with closing(sqlite3.connect(db_path)) as connection:
+                # 模拟迁移前的缓存文件：旧版本写入的地址尚未规范化，也没有迁移记录。
+                connection.execute("DELETE FROM storage_migrations WHERE name = ?", (LinkCheckStore.NORMALIZED_URLS_MIGRATION,))
+                connection.execute("PRAGMA user_version = 7")
+                connection.executemany(
+                    "INSERT INTO link_check_state(url, name, checked_at) VALUES (?, ?, ?)",
+                    [
+                        ("HTTPS://Legacy.example", "Legacy", "2026-06-02 12:00:00"),
+                        ("https://dup.example/", "DupOld", "2026-06-01 12:00:00"),
+                        ("https://DUP.example", "DupNew", "2026-06-03 12:00:00"),
+                    ],
+                )
+                connection.commit()
+
+            records = store.load_records(["https://legacy.example", "https://dup.example/", "https://old7.example", "https://missing.example/"])
+            with patch("friend_circle_lite.storage.sqlite_store.normalize_homepage_url", side_effect=lambda url: url) as normalize:
+                again = store.load_records(["https://dup.example/"])
+            with closing(sqlite3.connect(db_path)) as connection:
+                migrations = [row[0] for row in connection.execute("SELECT name FROM storage_migrations")]
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                stored = {row[0]: row[1] for row in connection.execute("SELECT url, name FROM link_check_state WHERE url NOT LIKE '%old%'")}
+
+        self.assertEqual(sorted(records), ["https://dup.example/", "https://legacy.example/", "https://old7.example/"])
+        self.assertEqual(records["https://legacy.example/"].name, "Legacy")
+        self.assertEqual(records["https://dup.example/"].name, "DupNew")
+        self.assertEqual(stored, {"https://legacy.example/": "Legacy", "https://dup.example/": "DupNew"})
+        self.assertEqual(migrations, [LinkCheckStore.NORMALIZED_URLS_MIGRATION])
+        # 迁移不读写 PRAGMA user_version，其他使用方设置的值保持不变。
+        self.assertEqual(version, 7)
+        # 迁移完成后只规范化请求的地址，不再逐行处理历史记录。
+        self.assertEqual(normalize.call_count, 1)
+        self.assertEqual(list(again), ["https://dup.example/"])
+
+    def test_homepage_probe_memory_expires_and_partial_content_needs_range(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "cache.sqlite3"
+            store = HomepageProbeStore(db_path)
+            store.save_methods({"fresh.example": "range", "stale.example": "get"})
+            with closing(sqlite3.connect(db_path)) as connection:
+                connection.execute("UPDATE homepage_probe SET updated_at = '2026-01-01 00:00:00' WHERE host = 'stale.example'")
+                connection.commit()
+            memory = HomepageProbeMemory(store)
+
+        self.assertEqual(memory.methods_for("https://fresh.example/"), ("range", "get"))
+        self.assertEqual(memory.methods_for("https://stale.example/"), ("head", "range", "get"))
+
+        partial = type("Response", (), {"status_code": 206})()
+        self.assertFalse(FetchResult(response=partial).success)
+        self.assertTrue(FetchResult(response=partial, range_requested=True).success)
+
+    def test_backlink_scan_stops_streaming_at_first_match_across_chunks(self):
+        link = b'<a href="https://blog.example.com/">Blog</a>'
+        pages = {
+            "/links": b"x" * (64 * 1024 - 20) + link + b"y" * (2 * 1024 * 1024),
+            "/plain": b"<html>" + b"z" * (200 * 1024) + b"</html>",
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                payload = pages[self.path]
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(payload), 64 * 1024):
+                        self.wfile.write(payload[start:start + 64 * 1024])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        scan = build_backlink_scan("blog.example.com")
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with requests.Session() as session:
+                fetcher = WebFetchClient(session)
+                found = fetcher.get(f"{base_url}/links", timeout=5, scan=scan)
+                missing = fetcher.get(f"{base_url}/plain", timeout=5, scan=scan)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(found.match, "https://blog.example.com")
+        self.assertLess(len(found.response.content), 256 * 1024)
+        self.assertEqual(missing.match, "")
+        self.assertEqual(missing.response.content, pages["/plain"])
+        self.assertEqual(scan.search(b"<a href='//blog.example.com'>"), "//blog.example.com")
+        self.assertEqual(scan.search(b"see http://blog.example.com/about"), "http://blog.example.com")
+        self.assertEqual(scan.search(b"blog.example.org"), "")
+
+    def test_link_check_stops_at_run_budget_and_keeps_cached_records(self):
+        websites = [Website(name=f"Site{index}", url=f"https://site{index}.example/") for index in range(3)]
+        cached = {
+            website.url: LinkCheckRecord(
+                name=website.name, url=website.url, checked_at="2026-01-01 00:00:00",
+                reachable=True, crawl_allowed=False, best_method="homepage", best_latency=0.2,
+            )
+            for website in websites[:2]
+        }
+        saved = []
+
+        class Store:
+            def load_records(self, urls):
+                return dict(cached)
+
+            def save_records(self, records):
+                saved.extend(records)
+                return True
+
+            is_fresh = staticmethod(LinkCheckStore.is_fresh)
+
+        class Fetcher:
+            def get(self, *args, **kwargs):
+                time.sleep(0.5)
+                return FetchResult(response=None, error=requests.ConnectionError("refused"))
+
+        with ThreadCrawlEngine(max_workers=1) as engine:
+            service = LinkReachabilityService(
+                config=ApplicationConfig.from_dict({"link_check": {"homepage_probe": False, "status_api_url": ""}}).link_check,
+                proxy_settings=ProxySettings(),
+                store=Store(),
+                feed_parser=type("Parser", (), {"parse": lambda self, *args, **kwargs: [], "last_latency": 0.01})(),
+                feed_discovery=type("Discovery", (), {"discover": lambda self, url: None})(),
+                fetcher=Fetcher(),
+                engine=engine,
+                session=requests.Session(),
+                budget=RunBudget(seconds=0.2),
+            )
+            emitted = []
+            records = service.check_websites(websites, on_record=lambda website, record: emitted.append(record.name))
+
+        # Site0 在截止时间前已开始检测，结束后照常保存；排队中的 Site1、Site2 被取消并沿用缓存。
+        self.assertEqual([record.name for record in records], ["Site0", "Site1", "Site2"])
+        self.assertFalse(records[0].reachable)
+        self.assertNotEqual(records[0].checked_at, "2026-01-01 00:00:00")
+        self.assertTrue(records[1].reachable)
+        self.assertEqual(records[1].checked_at, "2026-01-01 00:00:00")
+        self.assertFalse(records[2].reachable)
+        self.assertEqual([record.name for record in saved], ["Site0"])
+        self.assertEqual(sorted(emitted), ["Site0", "Site1", "Site2"])
+
+    def test_web_fetch_client_retries_transient_errors_within_run_budget(self):
+        def response(status, retry_after=None):
+            item = requests.Response()
+            item.status_code = status
+            item._content = b"ok"
+            if retry_after is not None:
+                item.headers["Retry-After"] = retry_after
+            return item
+
+        class Session:
+            def __init__(self, script):
+                self.script = script
+                self.calls = []
+
+            def get(self, url, headers=None, timeout=None):
+                self.calls.append(url)
+                outcome = self.script[url].pop(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+        session = Session({
+            "https://reset.example/": [requests.ConnectionError("Connection reset by peer"), response(200)],
+            "https://busy.example/": [response(503, retry_after="0"), response(200)],
+            "https://later.example/": [response(429, retry_after="3600"), response(200)],
+            "https://missing.example/": [response(404), response(200)],
+            "https://slow.example/": [requests.ReadTimeout("read timed out"), response(200)],
+            "https://flaky.example/": [response(502), response(502), response(200)],
+        })
+        policy = RetryPolicy(RequestSettings(max_retries=2, retry_backoff=0, retry_budget=3))
+        fetcher = WebFetchClient(session, retry_policy=policy)
+
+        self.assertTrue(fetcher.get("https://reset.example/").success)
+        self.assertTrue(fetcher.get("https://busy.example/").success)
+        self.assertEqual(fetcher.get("https://later.example/").response.status_code, 429)
+        self.assertEqual(fetcher.get("https://missing.example/").response.status_code, 404)
+        self.assertIsNone(fetcher.get("https://slow.example/").response)
+        self.assertEqual(fetcher.get("https://flaky.example/").response.status_code, 502)
+        self.assertEqual(
+            [session.calls.count(f"https://{name}.example/") for name in ("reset", "busy", "later", "missing", "slow", "flaky")],
+            [2, 2, 1, 1, 1, 2],
+        )
+        self.assertEqual((policy.retries, policy.denied), (3, 1))
+
+    def test_web_fetch_client_caps_streamed_response_body(self):
+        body = b"<rss>" + b"x" * (2 * 1024 * 1024)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                payload = body if self.path == "/large" else b"<rss></rss>"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(payload), 64 * 1024):
+                        self.wfile.write(payload[start:start + 64 * 1024])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with requests.Session() as session:
+                fetcher = WebFetchClient(session, max_response_bytes=100 * 1024)
+                large = fetcher.get(f"{base_url}/large", timeout=5)
+                peek = fetcher.get(f"{base_url}/large", timeout=5, max_bytes=1024)
+                small = fetcher.get(f"{base_url}/small", timeout=5, max_bytes=1024)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertTrue(large.success)
+        self.assertTrue(large.truncated)
+        self.assertEqual(len(large.response.content), 100 * 1024)
+        self.assertEqual(peek.response.content, body[:1024])
+        self.assertTrue(peek.response.text.startswith("<rss>"))
+        self.assertFalse(small.truncated)
+        self.assertEqual(small.response.content, b"<rss></rss>")
+
+    def test_truncated_feed_is_not_saved_and_small_remainders_keep_the_connection(self):
+        items = "".join(
+            f"<item><title>Post {index}</title><link>https://site.example/p{index}</link>"
+            f"<pubDate>Mon, 1{index} Mar 2024 14:08:32 +0000</pubDate></item>"
+            for index in range(3)
+        )
+        feed = ('<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>' + items).encode("utf-8")
+        payloads = {
+            "/feed": feed + b"<!--" + b"x" * (200 * 1024) + b"--></channel></rss>",
+            "/medium": b"<rss>" + b"y" * (16 * 1024) + b"</rss>",
+            "/large": b"<rss>" + b"z" * (1024 * 1024) + b"</rss>",
+        }
+        client_ports = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                client_ports.append((self.path, self.client_address[1]))
+                payload = payloads[self.path]
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir, requests.Session() as session:
+                state_store = FeedStateStore(Path(temp_dir) / "cache.sqlite3")
+                parser = FeedParserService(session, ProxySettings(), state_store=state_store, max_response_bytes=64 * 1024)
+                articles = parser.parse(f"{base_url}/feed", count=5)
+                stored_state = state_store.load(f"{base_url}/feed")
+
+                fetcher = WebFetchClient(session, max_response_bytes=64 * 1024)
+                for path in ("/medium", "/medium", "/large", "/medium"):
+                    fetcher.get(f"{base_url}{path}", timeout=5, max_bytes=1024)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(articles), 3)
+        self.assertIsNone(stored_state)
+        ports = [port for _, port in client_ports[1:]]
+        # 剩余 15KB 的响应读完后连接继续复用；剩余 1MB 的响应关闭连接，下一次请求新建连接。
+        self.assertEqual(ports[0], ports[1])
+        self.assertEqual(ports[1], ports[2])
+        self.assertNotEqual(ports[2], ports[3])
+
+    def test_feed_parser_reuses_stored_articles_on_not_modified(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>Post</title><link>/post</link><description>Body</description>'
+            '<pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+        sent_headers = []
+
+        class Response:
+            def __init__(self, status_code, text="", headers=None):
+                self.status_code = status_code
+                self.text = text
+                self.headers = headers or {}
+                self.encoding = None
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                sent_headers.append(dict(headers or {}))
+                if (headers or {}).get("If-None-Match") == '"v1"':
+                    return Response(304)
+                return Response(200, feed_xml, {"ETag": '"v1"'})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FeedStateStore(Path(temp_dir) / "cache.sqlite3")
+            parser = FeedParserService(Session(), ProxySettings(), state_store=store)
+
+            first = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+            second = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+
+        self.assertNotIn("If-None-Match", sent_headers[0])
+        self.assertEqual(sent_headers[1]["If-None-Match"], '"v1"')
+        self.assertEqual([article.title for article in second], ["Post"])
+        self.assertEqual(second[0].link, "https://site.example/post")
+        self.assertEqual(second[0].published, first[0].published)
+        # 复用的文章保留正文，文章追踪与推送不会拿到空内容。
+        self.assertEqual(second[0].content, "Body")
+        self.assertEqual(second[0].content, first[0].content)
+
+    def test_feed_parser_skips_parsing_identical_feed_body(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>Post</title><link>/post</link>'
+            '<pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+        parsed = []
+
+        class Response:
+            status_code = 200
+            headers = {}
+            encoding = None
+            content = feed_xml.encode("utf-8")
+            text = feed_xml
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                return Response()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FeedStateStore(Path(temp_dir) / "cache.sqlite3")
+            parser = FeedParserService(Session(), ProxySettings(), state_store=store)
+            original_parse = parser._parse_response
+
+            def tracking_parse(response, count):
+                parsed.append(count)
+                return original_parse(response, count)
+
+            parser._parse_response = tracking_parse
+            first = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+            first_state = store.load("https://site.example/rss.xml")
+            second = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+            second_state = store.load("https://site.example/rss.xml")
+
+        self.assertEqual(parsed, [5])
+        self.assertEqual([article.title for article in second], ["Post"])
+        self.assertEqual(second[0].published, first[0].published)
+        self.assertTrue(first_state.content_hash)
+        self.assertEqual(second_state.changed_at, first_state.changed_at)
+
+    def test_feed_parser_single_flight_shares_concurrent_fetch_of_same_feed(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>Post</title><link>/post</link><pubDate>Tue, 12 Mar 2024 10:00:00 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+        calls = []
+        release = threading.Event()
+
+        class Response:
+            status_code = 200
+            text = feed_xml
+            headers = {}
+            encoding = None
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                calls.append(url)
+                release.wait(timeout=5)
+                return Response()
+
+        parser = FeedParserService(Session(), ProxySettings(), memo=FeedParseMemo())
+        with ThreadCrawlEngine(max_workers=2) as engine:
+            first = engine.submit(parser.parse, "https://Shared.example/rss.xml", 5, "https://alice.example/")
+            time.sleep(0.05)
+            second = engine.submit(parser.parse, "https://shared.example:443/rss.xml#feed", 5, "https://bob.example/")
+            time.sleep(0.05)
+            release.set()
+            alice, bob = first.result(timeout=5), second.result(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(alice[0].link, "https://alice.example/post")
+        self.assertEqual(bob[0].link, "https://bob.example/post")
+
+    def test_feed_parser_memo_serves_crawl_phase_after_link_check(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>New</title><link>/new</link><pubDate>Tue, 12 Mar 2024 10:00:00 +0000</pubDate></item>'
+            '<item><title>Old</title><link>/old</link><pubDate>Mon, 11 Mar 2024 10:00:00 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+        calls = []
+
+        class Response:
+            status_code = 200
+            text = feed_xml
+            headers = {}
+            encoding = None
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                calls.append(url)
+                return Response()
+
+        parser = FeedParserService(Session(), ProxySettings(), memo=FeedParseMemo(), min_count=5)
+
+        checked = parser.parse("https://site.example/rss.xml", count=1, blog_url="https://site.example/")
+        crawled = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+
+        self.assertEqual(calls, ["https://site.example/rss.xml"])
+        self.assertEqual([article.title for article in checked], ["New"])
+        self.assertEqual([article.title for article in crawled], ["New", "Old"])
+        crawled[0].author = "Site"
+        self.assertEqual(parser.parse("https://site.example/rss.xml", count=1)[0].author, "")
+
+    def test_streaming_feed_parser_stops_after_newest_entries(self):
+        chunks = [
+            b'<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            b'<managingEditor>Owner</managingEditor>',
+            b'<item><title>Third</title><link>/third</link><pubDate>Wed, 13 Mar 2024 10:00:00 +0000</pubDate></item>',
+            b'<item><title>Second</title><link>/second</link><pubDate>Tue, 12 Mar 2024 10:00:00 +0000</pubDate></item>',
+            b'<item><title>First</title><link>/first</link><pubDate>Mon, 11 Mar 2024 10:00:00 +0000</pubDate></item>',
+            b'</channel></rss>',
+        ]
+        consumed = []
+
+        def feed_chunks():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        articles = StreamingFeedParser(2).parse(feed_chunks())
+
+        self.assertEqual([article.title for article in articles], ["Third", "Second"])
+        self.assertEqual(articles[0].link, "/third")
+        self.assertEqual(articles[0].author, "Owner")
+        self.assertEqual(len(consumed), 3)
+
+    def test_feed_parser_stream_mode_falls_back_for_malformed_feed(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site&nbsp;Name</title>'
+            '<item><title>Post</title><link>/post</link>'
+            '<pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+
+        class Response:
+            status_code = 200
+            headers = {}
+            encoding = None
+            text = feed_xml
+            content = feed_xml.encode("utf-8")
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                return Response()
+
+        parser = FeedParserService(Session(), ProxySettings(), stream_parse=True)
+        articles = parser.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+
+        self.assertEqual([article.title for article in articles], ["Post"])
+        self.assertEqual(articles[0].link, "https://site.example/post")
+
+    def test_stream_parse_is_opt_in_because_it_drops_summaries(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>Post</title><link>https://site.example/post</link><description>Intro</description>'
+            '<pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item>'
+            '</channel></rss>'
+        ).encode("utf-8")
+        settings = ApplicationConfig.from_dict({"spider_settings": {}}).spider_settings
+
+        default_rows = parse_feed_rows(feed_xml, 5, settings.stream_parse)
+        stream_rows = parse_feed_rows(feed_xml, 5, stream_parse=True)
+
+        # 默认使用 feedparser，邮件推送需要的文章简介不会丢失；显式开启流式解析时只保留元数据。
+        self.assertFalse(settings.stream_parse)
+        self.assertEqual(default_rows[0][4], "Intro")
+        self.assertEqual(stream_rows[0][4], "")
+
+    def test_feed_parser_process_pool_returns_same_articles(self):
+        feed_xml = (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+            '<item><title>Old</title><link>/old</link><pubDate>Mon, 11 Mar 2024 10:00:00 +0000</pubDate></item>'
+            '<item><title>New</title><link>/new</link><pubDate>Tue, 12 Mar 2024 10:00:00 +0000</pubDate></item>'
+            '</channel></rss>'
+        )
+
+        class Response:
+            status_code = 200
+            headers = {}
+            encoding = None
+            text = feed_xml
+            content = feed_xml.encode("utf-8")
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                return Response()
+
+        inline = FeedParserService(Session(), ProxySettings())
+        pooled = FeedParserService(Session(), ProxySettings(), parse_workers=1)
+        try:
+            pooled_articles = pooled.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+        finally:
+            pooled.close()
+        inline_articles = inline.parse("https://site.example/rss.xml", count=5, blog_url="https://site.example/")
+
+        self.assertEqual(pooled_articles, inline_articles)
+        self.assertEqual([article.title for article in pooled_articles], ["New", "Old"])
+        self.assertIsInstance(parse_feed_rows(feed_xml.encode("utf-8"), 1)[0], tuple)
+
+    def test_published_time_fast_paths_skip_dateutil(self):
+        format_published_time.cache_clear()
+        with patch("friend_circle_lite.utils.time.parser.parse", side_effect=AssertionError("dateutil used")):
+            self.assertEqual(format_published_time("Mon, 11 Mar 2024 14:08:32 +0000"), "2024-03-11 22:08")
+            self.assertEqual(format_published_time("2024-03-11T14:08:32Z"), "2024-03-11 22:08")
+        self.assertEqual(format_struct_time(time.strptime("2024-03-11 14:08:32", "%Y-%m-%d %H:%M:%S")), "2024-03-11 22:08")
+
+        with patch("friend_circle_lite.utils.time.parser.parse", wraps=dateutil_parser.parse) as fallback:
+            self.assertEqual(format_published_time("Mon, 11 Mar 2024 14:08:32 CST"), "2024-03-11 22:08")
+            self.assertEqual(format_published_time("Mon, 11 Mar 2024 14:08:32 CST"), "2024-03-11 22:08")
+        self.assertEqual(fallback.call_count, 1)
+        self.assertEqual(format_published_time(None), "")
+        self.assertEqual(format_published_time(""), "")
+
+        feed = feedparser.parse(
+            '<rss version="2.0"><channel>'
+            '<item><title>Zoned</title><pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item>'
+            '<item><title>Ambiguous</title><pubDate>Tue, 12 Mar 2024 14:08:32 CST</pubDate></item>'
+            '</channel></rss>'
+        )
+        with patch("friend_circle_lite.crawler.feed_service.format_published_time", wraps=format_published_time) as text_parse:
+            published = [FeedParserService._extract_published_time(entry) for entry in feed.entries]
+        # feedparser 已解析的时间直接格式化；CST 这类含义不唯一的缩写仍按原字符串解析。
+        self.assertEqual(published, ["2024-03-11 22:08", "2024-03-12 22:08"])
+        self.assertEqual([call.args[0] for call in text_parse.call_args_list], ["Tue, 12 Mar 2024 14:08:32 CST"])
+
+    def test_crawl_pipeline_starts_crawl_before_slow_link_check_finishes(self):
+        class Store:
+            def load_records(self, urls):
+                return {}
+
+            def save_records(self, records):
+                return True
+
+        fast_crawled = threading.Event()
+        crawled_before_slow_check = []
+
+        class Parser:
+            last_latency = 0.1
+
+            def parse(self, feed_url, count=1, blog_url=""):
+                if "slow" in feed_url:
+                    crawled_before_slow_check.append(fast_crawled.wait(timeout=5))
+                return [Article(title="Post", author="Site", link=f"{blog_url}/post", published="2026-06-07 10:00")]
+
+        class Crawler:
+            def crawl(self, website, count):
+                if website.name == "Fast":
+                    fast_crawled.set()
+                return CrawlResult(website=website, status="active")
+
+        feed_records = [
+            CacheRecord(name="Fast", url="https://fast.example/rss.xml", source="cache"),
+            CacheRecord(name="Slow", url="https://slow.example/rss.xml", source="cache"),
+        ]
+        websites = [
+            Website(name="Slow", url="https://slow.example", avatar="slow.png"),
+            Website(name="Fast", url="https://fast.example", avatar="fast.png"),
+        ]
+
+        with ThreadCrawlEngine(max_workers=4) as engine:
+            resolver = FeedResolver(discovery_service=None, configured_feeds=feed_records)
+            pipeline = CrawlPipeline(engine, Crawler(), resolver, count=1, manual_names=set())
+            service = LinkReachabilityService(
+                config=ApplicationConfig.from_dict({"link_check": {"enable": True}}).link_check,
+                proxy_settings=ProxySettings(),
+                store=Store(),
+                feed_records=feed_records,
+                feed_parser=Parser(),
+                engine=engine,
+            )
+            service.check_websites(websites, on_record=lambda website, record: pipeline.on_link_record(website, record))
+            results = pipeline.collect()
+
+        self.assertEqual(crawled_before_slow_check, [True])
+        self.assertEqual(sorted(result.website.name for result in results), ["Fast", "Slow"])
+
+    def test_crawl_checkpoint_resumes_sites_finished_by_interrupted_run(self):
+        crawled = []
+
+        class Crawler(SingleSiteCrawler):
+            def __init__(self):
+                pass
+
+            def crawl(self, website, count):
+                crawled.append(website.name)
+                return CrawlResult(
+                    website=website,
+                    status="active",
+                    articles=[Article(title="Post", author=website.name, link="https://site.example/post", published="2026-06-07 10:00", content="Body", avatar=website.avatar)],
+                    feed_url="https://site.example/rss.xml",
+                    feed_type="specific",
+                    source_used="cache",
+                    cache_update=CacheUpdate(action="set", name=website.name, url="https://site.example/rss.xml", reason="auto_discovered"),
+                )
+
+        class Engine:
+            def submit(self, *args, **kwargs):
+                raise AssertionError("finished site must not be crawled again")
+
+        website = Website(name="Site", url="https://site.example", avatar="site.png")
+        resolver = FeedResolver(discovery_service=None, configured_feeds=[])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CrawlCheckpointStore(Path(temp_dir) / "cache.sqlite3")
+            with ThreadCrawlEngine(max_workers=1) as engine:
+                first_run = CrawlPipeline(engine, Crawler(), resolver, count=1, manual_names=set(), checkpoint=store)
+                first_run.dispatch(website)
+                first_run.collect()
+
+            since = (datetime.now() - timedelta(minutes=60)).strftime("%Y-%m-%d %H:%M:%S")
+            resumed = store.load_results(since)
+            retry = CrawlPipeline(Engine(), Crawler(), resolver, count=1, manual_names=set(), checkpoint=store, resumed=resumed)
+            retry.dispatch(website)
+            results = retry.collect()
+            later = store.load_results((datetime.now() + timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S"))
+            store.clear()
+            after_finished_run = store.load_results(since)
+
+        self.assertEqual(crawled, ["Site"])
+        self.assertEqual([result.status for result in results], ["active"])
+        self.assertIs(results[0].website, website)
+        self.assertEqual(results[0].articles[0].link, "https://site.example/post")
+        self.assertEqual(results[0].articles[0].avatar, "site.png")
+        self.assertEqual(results[0].articles[0].content, "Body")
+        self.assertEqual(later, {})
+        self.assertEqual(results[0].cache_update.reason, "auto_discovered")
+        self.assertEqual(results[0].cache_update.url, "https://site.example/rss.xml")
+        self.assertEqual(after_finished_run, {})
+
+    def test_crawl_pipeline_orders_queue_by_priority_and_defers_over_budget(self):
+        crawled = []
+        release = threading.Event()
+
+        class Crawler(SingleSiteCrawler):
+            def __init__(self):
+                pass
+
+            def crawl(self, website, count):
+                crawled.append(website.name)
+                if website.name == "First":
+                    release.wait(5)
+                return CrawlResult(website=website, status="active")
+
+        def record(name, days_ago=None, latency=-1.0, published=""):
+            return LinkCheckRecord(
+                name=name, url=f"https://{name.lower()}.example", reachable=True, crawl_allowed=True,
+                best_latency=latency, last_post_days_ago=days_ago, last_post_published=published,
+            )
+
+        records = [
+            record("First"),
+            record("Dormant", days_ago=400, latency=0.1, published="2025-01-01 10:00"),
+            record("Slow", days_ago=2, latency=3.0, published="2026-06-05 10:00"),
+            record("Fast", days_ago=5, latency=0.2, published="2026-06-02 10:00"),
+            record("Unknown"),
+        ]
+        resolver = FeedResolver(discovery_service=None, configured_feeds=[
+            CacheRecord(name=item.name, url=f"{item.url}/rss.xml", source="cache") for item in records
+        ])
+        with ThreadCrawlEngine(max_workers=1) as engine:
+            pipeline = CrawlPipeline(engine, Crawler(), resolver, count=1, manual_names=set(), budget=RunBudget(max_requests=4))
+            for item in records:
+                pipeline.dispatch(Website(name=item.name, url=item.url), item)
+            release.set()
+            results = pipeline.collect()
+
+        self.assertEqual(crawled, ["First", "Fast", "Slow", "Dormant"])
+        self.assertEqual([result.website.name for result in pipeline.deferred_results], ["Unknown"])
+        self.assertEqual(sorted(result.status for result in results), ["active"] * 4 + ["deferred"])
+
+        expired = RunBudget(seconds=0.05)
+        time.sleep(0.06)
+        self.assertFalse(expired.try_acquire())
+        self.assertIsNone(expired.remaining())
+
+    def test_sharded_runs_split_friends_and_merge_outputs(self):
+        websites = [Website(name=f"Site {index}", url=f"https://site{index}.example", avatar="") for index in range(40)]
+        shards = [select_shard(websites, index, 3) for index in range(3)]
+
+        self.assertEqual(sorted(website.name for shard in shards for website in shard), sorted(website.name for website in websites))
+        self.assertTrue(all(shards))
+        self.assertEqual(shard_of("HTTPS://Site7.example:443/", 3), shard_of("https://site7.example/", 3))
+        self.assertEqual(select_shard(list(reversed(websites)), 1, 3), list(reversed(shards[1])))
+
+        def link(url, reachable, method=""):
+            return {"name": url, "link": url, "reachable": reachable, "crawlable": reachable, "latency": 0.5 if reachable else -1, "best_method": method}
+
+        outputs = [
+            (
+                {"statistical_data": {"friends_num": 2, "active_num": 1, "error_num": 1, "last_updated_time": "2026-06-07 10:00:00"},
+                 "article_data": [{"title": "A", "link": "https://a.example/1", "created": "2026-06-07 09:00"}]},
+                [["B", "https://b.example/", ""]],
+                {"statistical_data": {"link_last_checked_time": "2026-06-07 09:30:00"},
+                 "link_data": [link("https://a.example/", True, "direct"), link("https://b.example/", False)]},
+            ),
+            (
+                {"statistical_data": {"friends_num": 1, "active_num": 1, "error_num": 0, "last_updated_time": "2026-06-07 10:05:00"},
+                 "article_data": [{"title": "C", "link": "https://c.example/1", "created": "2026-06-07 08:00"}]},
+                [],
+                {"statistical_data": {"link_last_checked_time": "2026-06-07 09:45:00"},
+                 "link_data": [link("https://c.example/", True, "proxy"), link("https://b.example/", True, "proxy")]},
+            ),
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = []
+            for index, (result, errors, links) in enumerate(outputs):
+                shard_dir = Path(temp_dir) / f"shard-{index}"
+                write_json(shard_dir / "all.json", result)
+                write_json(shard_dir / "errors.json", errors)
+                write_json(shard_dir / "link.json", links)
+                sources.append(str(shard_dir))
+            missing = str(Path(temp_dir) / "missing")
+            # 默认任一分片缺失即放弃合并，只有显式允许时才跳过缺失分片。
+            self.assertIsNone(merge_shard_outputs(sources + [missing]))
+            self.assertEqual(merge_shard_outputs(sources), merge_shard_outputs(sources + [missing], allow_partial=True))
+            merged = merge_shard_outputs(sources)
+
+        result, errors, link_payload = merged
+        self.assertEqual(result["statistical_data"]["friends_num"], 3)
+        self.assertEqual(result["statistical_data"]["active_num"], 2)
+        self.assertEqual(result["statistical_data"]["article_num"], 2)
+        self.assertEqual(result["statistical_data"]["last_updated_time"], "2026-06-07 10:05:00")
+        self.assertEqual(errors, [["B", "https://b.example/", ""]])
+        self.assertEqual(link_payload["statistical_data"]["link_total_num"], 3)
+        self.assertEqual(link_payload["statistical_data"]["link_reachable_num"], 3)
+        self.assertEqual(link_payload["statistical_data"]["link_last_checked_time"], "2026-06-07 09:45:00")
+
+    def test_crawl_scheduler_reuses_stored_articles_until_feed_is_due(self):
+        now = datetime.now(ZoneInfo("Asia/Shanghai")).replace(tzinfo=None)
+
+        def articles(*days_ago):
+            return [
+                Article(title=f"Post {day}", author="Feed", link=f"/p{day}", published=(now - timedelta(days=day)).strftime("%Y-%m-%d %H:%M"))
+                for day in days_ago
+            ]
+
+        class Crawler(SingleSiteCrawler):
+            def __init__(self):
+                pass
+
+            def crawl(self, website, count):
+                raise AssertionError("feed is not due and must not be crawled")
+
+        class Engine:
+            def submit(self, *args, **kwargs):
+                raise AssertionError("feed is not due and must not be submitted")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "cache.sqlite3"
+            state_store = FeedStateStore(cache_path)
+            state_store.save(FeedState(feed_url="https://daily.example/rss.xml", article_count=5, articles=articles(1, 2, 3), content_hash="a"))
+            state_store.save(FeedState(feed_url="https://idle.example/rss.xml", article_count=5, articles=articles(400, 500), content_hash="b"))
+            settings = SpiderSettings(min_interval_hours=2, max_interval_hours=48)
+
+            planner = CrawlScheduler(settings, CrawlScheduleStore(cache_path), state_store)
+            daily_hours = planner.interval_hours(state_store.load("https://daily.example/rss.xml"))
+            idle_hours = planner.interval_hours(state_store.load("https://idle.example/rss.xml"))
+            planner.plan("https://daily.example/rss.xml")
+            planner.flush()
+
+            scheduler = CrawlScheduler(settings, CrawlScheduleStore(cache_path), state_store)
+            resolver = FeedResolver(
+                discovery_service=None,
+                configured_feeds=[CacheRecord(name="Daily", url="https://daily.example/rss.xml", source="cache")],
+            )
+            pipeline = CrawlPipeline(Engine(), Crawler(), resolver, count=5, manual_names=set(), scheduler=scheduler)
+            pipeline.dispatch(Website(name="Daily", url="https://daily.example", avatar="daily.png"))
+            results = pipeline.collect()
+            idle_due = scheduler.stored_articles("https://idle.example/rss.xml", 5)
+
+        self.assertAlmostEqual(daily_hours, 6, delta=0.1)
+        self.assertEqual(idle_hours, 48)
+        self.assertEqual([result.status for result in results], ["active"])
+        self.assertEqual(results[0].articles[0].link, "https://daily.example/p1")
+        self.assertEqual({article.author for article in results[0].articles}, {"Daily"})
+        self.assertIsNone(idle_due)
+
+    def test_adaptive_timeout_uses_latency_history_within_bounds(self):
+        settings = ApplicationConfig.from_dict({
+            "request_settings": {"timeout_multiplier": 3, "min_timeout": 2, "max_timeout": 12, "min_samples": 3},
+        }).request_settings
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = RequestLatencyStore(Path(temp_dir) / "cache.sqlite3", max_samples=settings.latency_samples)
+            policy = AdaptiveTimeoutPolicy(settings, store)
+            for latency in (0.2, 0.3, 0.5):
+                policy.record("https://fast.example/rss.xml", latency)
+            for latency in (6.0, 8.0, 9.0):
+                policy.record("https://slow.example/", latency)
+            policy.flush()
+
+            reloaded = AdaptiveTimeoutPolicy(settings, store)
+            fast_timeout = reloaded.timeout_for("https://fast.example/feed", (10, 15))
+            slow_timeout = reloaded.timeout_for("https://slow.example/", (10, 15))
+            unknown_timeout = reloaded.timeout_for("https://new.example/", (10, 15))
+
+        self.assertEqual(fast_timeout, (2.0, 2.0))
+        self.assertEqual(slow_timeout, (10.0, 12.0))
+        self.assertEqual(unknown_timeout, (10, 15))
+
+    def test_adaptive_timeout_grows_back_after_requests_time_out(self):
+        settings = ApplicationConfig.from_dict({
+            "request_settings": {"timeout_multiplier": 3, "min_timeout": 2, "max_timeout": 12, "min_samples": 3, "latency_samples": 10},
+        }).request_settings
+        policy = AdaptiveTimeoutPolicy(settings)
+        for _ in range(10):
+            policy.record("https://slowing.example/", 0.2)
+        timeouts_used = []
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                timeouts_used.append(timeout)
+                raise requests.ReadTimeout("read timed out")
+
+        fetcher = WebFetchClient(Session(), timeout_policy=policy)
+        for _ in range(3):
+            result = fetcher.get("https://slowing.example/", timeout=(10, 15))
+            self.assertIsInstance(result.error, requests.Timeout)
+
+        self.assertEqual(timeouts_used[0], (2.0, 2.0))
+        self.assertEqual(policy.timeout_for("https://slowing.example/", (10, 15)), (10.0, 12.0))
+
+    def test_adaptive_timeout_only_learns_from_full_body_requests(self):
+        settings = ApplicationConfig.from_dict({
+            "request_settings": {"timeout_multiplier": 3, "min_timeout": 2, "max_timeout": 12, "min_samples": 1},
+        }).request_settings
+        policy = AdaptiveTimeoutPolicy(settings)
+        policy.record("https://site.example/", 3.0)
+        timeouts_used = []
+
+        class Response:
+            status_code = 200
+            request = type("Request", (), {"method": "HEAD"})()
+            content = b""
+
+            def iter_content(self, chunk_size):
+                yield b"<rss>"
+
+            def close(self):
+                pass
+
+        class Session:
+            def request(self, method, url, headers=None, timeout=None, stream=False):
+                timeouts_used.append(timeout)
+                return Response()
+
+            def get(self, url, headers=None, timeout=None, stream=False):
+                timeouts_used.append(timeout)
+                return Response()
+
+        fetcher = WebFetchClient(Session(), timeout_policy=policy, max_response_bytes=1024)
+        fetcher.get("https://site.example/", timeout=(10, 15), probe_method="HEAD")
+        fetcher.get("https://site.example/", headers={"Range": "bytes=0-0"}, timeout=(10, 15), probe_method="GET")
+        fetcher.get("https://site.example/feed.xml", timeout=(10, 15), max_bytes=64)
+        fetcher.get("https://site.example/feed.xml", timeout=(10, 15))
+
+        # 探测与嗅探使用调用方的超时且不记录样本，只有完整下载使用并更新按主机的历史。
+        self.assertEqual(timeouts_used, [(10, 15), (10, 15), (10, 15), (9.0, 9.0)])
+        self.assertEqual(len(policy._samples["site.example"]), 2)
+
+    def test_link_check_uses_the_session_passed_by_the_crawler(self):
+        calls = []
+
+        class Store:
+            def load_records(self, urls):
+                return {}
+
+            def save_records(self, records):
+                return True
+
+        class Discovery:
+            def discover(self, website_url):
+                return None
+
+        class Response:
+            status_code = 200
+            content = b""
+            request = type("Request", (), {"method": "HEAD"})()
+
+            def close(self):
+                pass
+
+        class Session:
+            def request(self, method, url, **kwargs):
+                calls.append((method, url))
+                return Response()
+
+            def close(self):
+                raise AssertionError("shared session must stay open")
+
+        service = LinkReachabilityService(
+            config=ApplicationConfig.from_dict({"link_check": {"enable": True}}).link_check,
+            proxy_settings=ProxySettings(),
+            store=Store(),
+            feed_parser=type("Parser", (), {"parse": lambda self, *args, **kwargs: [], "last_latency": 0.01})(),
+            feed_discovery=Discovery(),
+            session=Session(),
+        )
+        records = service.check_websites([Website(name="Site", url="https://site.example/")])
+
+        self.assertEqual(calls, [("HEAD", "https://site.example/")])
+        self.assertTrue(records[0].reachable)
+
+    def test_link_check_does_not_record_latency_for_shared_feed_parse(self):
+        class Parser:
+            def parse_feed(self, feed_url, count=1, blog_url=""):
+                article = Article(title="Post", author="Site", link="https://site.example/post", published="2026-06-07 10:00")
+                return FeedParseResult(articles=[article], timing=RequestTiming(url=feed_url, from_memo=True))
+
+        service = LinkReachabilityService(
+            config=ApplicationConfig.from_dict({"link_check": {"enable": True}}).link_check,
+            proxy_settings=ProxySettings(),
+            store=None,
+            feed_records=[CacheRecord(name="Site", url="https://site.example/rss.xml", source="cache")],
+            feed_parser=Parser(),
+        )
+        website = Website(name="Site", url="https://site.example/")
+        cached = LinkCheckRecord(name="Site", url=website.url, reachable=True, crawl_allowed=True, best_latency=0.8)
+
+        with_history = service._check_rss_first(website, cached)
+        without_history = service._check_rss_first(website, None)
+
+        self.assertEqual(with_history.best_latency, 0.8)
+        self.assertEqual(without_history.best_latency, -1)
+        self.assertTrue(without_history.crawl_allowed)
+
+    def test_link_check_uses_each_feed_requests_own_latency(self):
+        class Store:
+            def load_records(self, urls):
+                return {}
+
+            def save_records(self, records):
+                return True
+
+        delays = {"https://slow.example/rss.xml": 0.3, "https://fast.example/rss.xml": 0.0}
+
+        class Response:
+            status_code = 200
+            headers = {}
+            encoding = None
+
+            def __init__(self, url):
+                host = url.split("/")[2]
+                self.text = (
+                    '<?xml version="1.0"?><rss version="2.0"><channel><title>Site</title>'
+                    f'<item><title>{host}</title><link>/post</link>'
+                    '<pubDate>Mon, 11 Mar 2024 14:08:32 +0000</pubDate></item></channel></rss>'
+                )
+                self.content = self.text.encode("utf-8")
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                time.sleep(delays[url])
+                return Response(url)
+
+        instrumentation = RunInstrumentation()
+        parser = FeedParserService(Session(), ProxySettings(), instrumentation=instrumentation)
+        with ThreadCrawlEngine(max_workers=2) as engine:
+            service = LinkReachabilityService(
+                config=ApplicationConfig.from_dict({"link_check": {"enable": True}}).link_check,
+                proxy_settings=ProxySettings(),
+                store=Store(),
+                feed_records=[
+                    CacheRecord(name="Slow", url="https://slow.example/rss.xml", source="cache"),
+                    CacheRecord(name="Fast", url="https://fast.example/rss.xml", source="cache"),
+                ],
+                feed_parser=parser,
+                engine=engine,
+            )
+            records = service.check_websites([
+                Website(name="Slow", url="https://slow.example", avatar="slow.png"),
+                Website(name="Fast", url="https://fast.example", avatar="fast.png"),
+            ])
+
+        latency = {record.name: record.best_latency for record in records}
+        self.assertGreaterEqual(latency["Slow"], 0.3)
+        self.assertLess(latency["Fast"], 0.3)
+        self.assertEqual(len(instrumentation.timings(STAGE_PARSE)), 2)
+        self.assertTrue(all(timing.parse >= 0 and timing.bytes > 0 for timing in instrumentation.timings(STAGE_PARSE)))
+
+    def test_thread_engine_queues_tasks_over_the_per_host_limit(self):
+        lock = threading.Lock()
+        running: dict[str, int] = {}
+        peaks: dict[str, int] = {}
+        release = threading.Event()
+
+        def task(host, value):
+            with lock:
+                running[host] = running.get(host, 0) + 1
+                peaks[host] = max(peaks.get(host, 0), running[host])
+            if host == "slow.example":
+                release.wait(timeout=5)
+            else:
+                time.sleep(0.01)
+            with lock:
+                running[host] -= 1
+            return value
+
+        with ThreadCrawlEngine(max_workers=4, per_host_limit=2) as engine:
+            slow = [engine.submit(task, "slow.example", value, host="slow.example") for value in range(5)]
+            # 排队中的同主机任务不占用线程，其他主机的任务仍能使用剩余线程执行。
+            fast = [engine.submit(task, "fast.example", value, host="fast.example") for value in range(6)]
+            self.assertEqual(sorted(future.result(timeout=5) for future in fast), list(range(6)))
+            self.assertTrue(slow[4].cancel())
+            release.set()
+            self.assertEqual([future.result(timeout=5) for future in slow[:4]], list(range(4)))
+
+        self.assertEqual(peaks, {"slow.example": 2, "fast.example": 2})
+        self.assertTrue(slow[4].cancelled())
+
+    def test_legacy_asyncio_engine_config_maps_to_thread_count(self):
+        legacy = ApplicationConfig.from_dict({"spider_settings": {"engine": "asyncio", "max_concurrency": 50, "per_host_limit": 0}})
+        default = ApplicationConfig.from_dict({"spider_settings": {"max_workers": 12}})
+
+        self.assertEqual(legacy.spider_settings.max_workers, 50)
+        self.assertEqual(legacy.spider_settings.per_host_limit, 0)
+        self.assertEqual(default.spider_settings.max_workers, 12)
+        service = FriendCircleCrawlService(json_url="https://example.com/friends.json", count=1, spider_settings=legacy.spider_settings)
+        with service._build_engine(legacy.spider_settings.max_workers) as engine:
+            self.assertIsInstance(engine, ThreadCrawlEngine)
+            self.assertEqual(engine.capacity, 50)
+            self.assertEqual(engine.per_host_limit, 0)
+
+    def test_feed_discovery_prefers_homepage_alternate_link(self):
+        calls = []
+
+        class Response:
+            def __init__(self, status_code, text="", content_type="text/html"):
+                self.status_code = status_code
+                self.text = text
+                self.headers = {"Content-Type": content_type}
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                calls.append(url)
+                if url == "https://site.example/":
+                    return Response(200, '<html><head><link rel="alternate" type="application/rss+xml" href="/posts/index.xml"></head><body></body></html>')
+                if url == "https://site.example/posts/index.xml":
+                    return Response(200, "<rss></rss>", "application/rss+xml")
+                return Response(404)
+
+        endpoint = FeedDiscoveryService(Session(), ProxySettings()).discover("https://site.example/")
+
+        self.assertEqual(endpoint.url, "https://site.example/posts/index.xml")
+        self.assertEqual(calls, ["https://site.example/", "https://site.example/posts/index.xml"])
+
+    def test_feed_discovery_keeps_path_priority_and_shares_the_probe_pool(self):
+        probe_threads = set()
+
+        class Response:
+            def __init__(self, status_code, text="", content_type="text/html"):
+                self.status_code = status_code
+                self.text = text
+                self.headers = {"Content-Type": content_type}
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                if url.endswith(".example/"):
+                    return Response(200, "<html><head></head></html>")
+                probe_threads.add(threading.current_thread().name)
+                if url.endswith("/feed"):
+                    # 优先级最高的路径响应最慢，仍应被选中。
+                    time.sleep(0.1)
+                    return Response(200, "<rss></rss>", "application/rss+xml")
+                if url.endswith("/atom.xml"):
+                    return Response(200, "<feed></feed>", "application/atom+xml")
+                return Response(404)
+
+        with FeedDiscoveryService(Session(), ProxySettings(), max_probe_workers=3) as discovery:
+            with ThreadPoolExecutor(max_workers=4) as sites:
+                endpoints = list(sites.map(discovery.discover, [f"https://site{index}.example/" for index in range(4)]))
+
+        self.assertEqual([endpoint.url for endpoint in endpoints], [f"https://site{index}.example/feed" for index in range(4)])
+        self.assertTrue(all(endpoint.feed_type == "rss1" for endpoint in endpoints))
+        # 多个站点同时探测时共用同一个有界线程池。
+        self.assertLessEqual(len(probe_threads), 3)
+        self.assertIsNone(discovery._probe_pool)
+
+    def test_feed_discovery_skips_paths_remembered_as_missing(self):
+        calls = []
+
+        class Response:
+            def __init__(self, status_code, text="", content_type="text/html"):
+                self.status_code = status_code
+                self.text = text
+                self.headers = {"Content-Type": content_type}
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                calls.append(url)
+                if url == "https://site.example/":
+                    return Response(200, "<html><head></head></html>")
+                return Response(404)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FeedProbeStore(Path(temp_dir) / "cache.sqlite3")
+            discovery = FeedDiscoveryService(Session(), ProxySettings(), probe_store=store)
+
+            self.assertIsNone(discovery.discover("https://site.example/"))
+            first_run_calls = len(calls)
+            calls.clear()
+            self.assertIsNone(discovery.discover("https://site.example/"))
+
+        self.assertEqual(first_run_calls, 1 + len(FeedDiscoveryService.POSSIBLE_FEEDS))
+        self.assertEqual(calls, ["https://site.example/"])
+
     def test_startup_config_does_not_log_proxy_service_url(self):
         config = ApplicationConfig.from_dict({
             "proxy_settings": {"proxy_url": "https://proxy.example/"},
@@ -1171,6 +2673,77 @@ class RefactorContractsTest(unittest.TestCase):
         self.assertNotIn("stats", link_payload)
         self.assertNotIn("links", link_payload)
 
+    def test_crawl_run_flushes_state_when_a_phase_raises(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = FriendCircleCrawlService(
+                json_url="https://example.com/friends.json",
+                count=1,
+                cache_file=str(Path(temp_dir) / "cache.sqlite3"),
+                proxy_settings=ProxySettings(proxy_url="https://proxy.example/", hedge_delay=0.5),
+            )
+            service._load_websites = lambda _session: [Website(name="Site", url="https://site.example")]
+
+            def check_links(_websites, _feed_records, _manual_names):
+                service.timeout_policy.record("https://site.example/feed.xml", 0.3)
+                raise RuntimeError("link check failed")
+
+            service._check_links = check_links
+            with patch.object(FeedParserService, "close") as close_parser:
+                with self.assertRaises(RuntimeError):
+                    service.run()
+
+            # 出错的运行同样关闭线程池与解析器，并写回已积累的延迟样本。
+            self.assertIsNone(service.hedge_executor)
+            self.assertIsNone(service.pipeline)
+            close_parser.assert_called_once()
+            self.assertTrue(service.latency_store.load_samples())
+
+    def test_link_check_feed_updates_keep_the_resolver_lookup_in_place(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = FriendCircleCrawlService(
+                json_url="https://example.com/friends.json",
+                count=1,
+                cache_file=str(Path(temp_dir) / "cache.sqlite3"),
+            )
+            service.cache_store.save_records([CacheRecord(name="Gone", url="https://gone.example/rss.xml")])
+            websites = [
+                Website(name="Found", url="https://found.example"),
+                Website(name="Gone", url="https://gone.example"),
+            ]
+            service._load_websites = lambda _session: websites
+            lookups = []
+
+            def check_links(_websites, _feed_records, manual_names):
+                lookups.append(service.pipeline.resolver.feed_lookup)
+                updates = {"Found": CacheRecord(name="Found", url="https://found.example/atom.xml"), "Gone": None}
+                for website in websites:
+                    record = LinkCheckRecord(
+                        name=website.name, url=website.url, avatar="", checked_at="2026-06-07 12:00:00",
+                        reachable=True, crawl_allowed=True,
+                    )
+                    service._apply_feed_updates_from_link_check({website.name: updates[website.name]}, manual_names)
+                    service.pipeline.on_link_record(website, record, updates)
+                return []
+
+            crawled = []
+
+            def crawl(_crawler, website, _count):
+                lookups.append(service.pipeline.resolver.feed_lookup)
+                crawled.append(website.name)
+                return CrawlResult(website=website, status="error")
+
+            service._check_links = check_links
+            with patch("friend_circle_lite.crawler.service.SingleSiteCrawler.crawl", crawl), \
+                    patch.object(service.cache_store, "load_records", wraps=service.cache_store.load_records) as load_records:
+                service.run()
+            saved = {record.name: record.url for record in service.cache_store.load_records()}
+
+        # 检测阶段的 RSS 变化直接更新同一份映射，运行中只在开始时读取一次缓存。
+        self.assertEqual(crawled, ["Found"])
+        self.assertTrue(all(lookup is lookups[0] for lookup in lookups))
+        load_records.assert_called_once()
+        self.assertEqual(saved, {"Found": "https://found.example/atom.xml"})
+
     def test_crawl_filter_uses_crawl_allowed_and_feed_cache_not_best_method(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             service = FriendCircleCrawlService(